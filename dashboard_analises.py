@@ -0,0 +1,644 @@
+"""
+Análises de alunos para o Dashboard de Frequência de Alunos
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from dashboard_dados import limpar_nomes
+
+# Semanas acompanhadas após a primeira visita nas curvas de retenção
+SEMANAS_RETENCAO = 12
+
+# Rótulo para alunos sem canal de aquisição informado
+CANAL_NAO_INFORMADO = 'Não informado'
+
+# Coluna opcional com quem convidou o aluno
+COLUNA_CONVIDOU = 'NOME DA PESSOA QUE CONVIDOU (SEMENTE/AMIGO)'
+
+# Aulas seguidas sem presença a partir das quais o aluno é considerado em risco
+AULAS_AUSENCIA_RISCO = 3
+
+# Horário padrão de início das aulas (horas decimais), configurável por ambiente;
+# check-ins depois dele contam como atraso
+HORA_INICIO_AULA = float(os.environ.get('DASHBOARD_HORA_INICIO', 19.0))
+
+# Faixas de frequência (%) da visão geral e seus limites superiores (inclusivos)
+FAIXAS_FREQUENCIA = ['0-25%', '26-50%', '51-75%', '76-100%']
+LIMITES_FAIXAS_FREQUENCIA = [25, 50, 75]
+
+
+def _retencao_por_grupo(grupo, semana, horizonte, id_aluno, max_semanas):
+    """
+    Fração de alunos de cada grupo presentes em cada semana após a entrada
+
+    O denominador de cada semana conta só os alunos cuja entrada foi há
+    tempo suficiente para observá-la, evitando subestimar coortes recentes.
+    """
+    semanas = list(range(max_semanas + 1))
+
+    visitas = pd.DataFrame({'grupo': grupo, 'semana': semana, 'id': id_aluno})
+    visitas = visitas[visitas['semana'] <= max_semanas].drop_duplicates(['id', 'semana'])
+    ativos = (
+        visitas.groupby(['grupo', 'semana']).size()
+        .unstack(fill_value=0)
+        .reindex(columns=semanas, fill_value=0)
+    )
+
+    # Alunos observáveis por semana: contagem acumulada "de trás para frente" dos horizontes
+    alunos = pd.DataFrame({'grupo': grupo, 'horizonte': horizonte, 'id': id_aluno}).drop_duplicates('id')
+    alunos['horizonte'] = alunos['horizonte'].clip(upper=max_semanas)
+    por_horizonte = (
+        alunos.groupby(['grupo', 'horizonte']).size()
+        .unstack(fill_value=0)
+        .reindex(columns=semanas, fill_value=0)
+    )
+    elegiveis = por_horizonte.iloc[:, ::-1].cumsum(axis=1).iloc[:, ::-1]
+    elegiveis = elegiveis.reindex(ativos.index)
+
+    retencao = ativos / elegiveis.where(elegiveis > 0)
+    retencao.columns.name = 'Semana'
+    return retencao, elegiveis[0]
+
+
+def entradas_alunos(df):
+    """
+    Visita de entrada de cada aluno no dataset completo
+
+    Args:
+        df (pd.DataFrame): Todos os check-ins (sem filtros), com 'ID_Aluno',
+            'Data/hora', 'COMO CONHECEU O GRUPO?' e 'PRIMEIRA VEZ NO GRUPO?'
+
+    Returns:
+        pd.DataFrame: Indexado por 'ID_Aluno', com 'Primeira Visita' e as
+            primeiras respostas informadas de 'COMO CONHECEU O GRUPO?' e
+            'PRIMEIRA VEZ NO GRUPO?'
+    """
+    base = df.loc[
+        df['ID_Aluno'] >= 0,
+        ['ID_Aluno', 'Data/hora', 'COMO CONHECEU O GRUPO?', 'PRIMEIRA VEZ NO GRUPO?']
+    ].sort_values('Data/hora', kind='mergesort')
+    por_aluno = base.groupby('ID_Aluno')
+    return pd.DataFrame({
+        'Primeira Visita': por_aluno['Data/hora'].min(),
+        'COMO CONHECEU O GRUPO?': por_aluno['COMO CONHECEU O GRUPO?'].first(),
+        'PRIMEIRA VEZ NO GRUPO?': por_aluno['PRIMEIRA VEZ NO GRUPO?'].first(),
+    })
+
+
+def calcular_coortes(df, periodo_coorte='M', max_semanas=SEMANAS_RETENCAO, apenas_primeira_vez=False,
+                     entradas=None):
+    """
+    Calcula a retenção por coorte de entrada e por canal de aquisição
+
+    Cada aluno entra na coorte (semana ou mês) da sua primeira visita e no
+    canal informado em 'COMO CONHECEU O GRUPO?'. A retenção da semana k é a
+    fração dos alunos que voltaram k semanas após a primeira visita. Tudo é
+    calculado em uma passada vetorizada sobre as visitas.
+
+    A entrada vem do dataset completo (`entradas`): com filtros ativos,
+    entram nas coortes só os alunos cuja primeira visita está no recorte,
+    e quem já frequentava antes dele não é tratado como novo.
+
+    Args:
+        df (pd.DataFrame): Dados (filtrados) com 'ID_Aluno', 'Data/hora',
+            'COMO CONHECEU O GRUPO?' e 'PRIMEIRA VEZ NO GRUPO?'
+        periodo_coorte (str): 'W' para coortes semanais ou 'M' para mensais
+        max_semanas (int): Semanas acompanhadas após a primeira visita
+        apenas_primeira_vez (bool): Considerar apenas alunos que marcaram
+            primeira vez no grupo na visita de entrada
+        entradas (pd.DataFrame): Resultado de entradas_alunos sobre o
+            dataset completo (padrão: calculado sobre `df`)
+
+    Returns:
+        dict: 'retencao' e 'tamanhos' por coorte, 'retencao_canal' e
+            'tamanhos_canal' por canal; None se não houver alunos
+    """
+    base = df.loc[df['ID_Aluno'] >= 0, ['ID_Aluno', 'Data/hora']].sort_values('Data/hora', kind='mergesort')
+    if base.empty:
+        return None
+    entradas = entradas_alunos(df) if entradas is None else entradas
+
+    ultima_semana = base['Data/hora'].iloc[-1].to_period('W').start_time
+    entrada = entradas.reindex(base['ID_Aluno'].to_numpy())
+    primeira_visita = pd.Series(entrada['Primeira Visita'].to_numpy(), index=base.index)
+
+    # Só alunos cuja visita de entrada está no recorte
+    no_recorte = base.groupby('ID_Aluno')['Data/hora'].transform('min').eq(primeira_visita).to_numpy()
+
+    # Canal e resposta de "primeira vez" declarados por aluno (primeiro valor informado)
+    canal = pd.Series(entrada['COMO CONHECEU O GRUPO?'].to_numpy(), index=base.index)
+    canal = canal.astype('string').str.strip().str.capitalize().fillna(CANAL_NAO_INFORMADO)
+    canal = canal.replace('', CANAL_NAO_INFORMADO)
+
+    if apenas_primeira_vez:
+        resposta_entrada = pd.Series(entrada['PRIMEIRA VEZ NO GRUPO?'].to_numpy(), index=base.index)
+        no_recorte &= resposta_entrada.astype('string').str.strip().str.upper().isin(['SIM', 'S']).to_numpy(
+            dtype=bool, na_value=False
+        )
+
+    base, primeira_visita, canal = base[no_recorte], primeira_visita[no_recorte], canal[no_recorte]
+    if base.empty:
+        return None
+
+    semana_visita = base['Data/hora'].dt.to_period('W').dt.start_time
+    semana_entrada = primeira_visita.dt.to_period('W').dt.start_time
+    semana = ((semana_visita - semana_entrada).dt.days // 7).to_numpy()
+    horizonte = ((ultima_semana - semana_entrada).dt.days // 7).to_numpy()
+    coorte = primeira_visita.dt.to_period(periodo_coorte).dt.start_time.to_numpy()
+    id_aluno = base['ID_Aluno'].to_numpy()
+
+    retencao, tamanhos = _retencao_por_grupo(coorte, semana, horizonte, id_aluno, max_semanas)
+    retencao_canal, tamanhos_canal = _retencao_por_grupo(
+        canal.to_numpy(), semana, horizonte, id_aluno, max_semanas
+    )
+    retencao.index.name = tamanhos.index.name = 'Coorte'
+    retencao_canal.index.name = tamanhos_canal.index.name = 'Canal'
+
+    ordem_canais = tamanhos_canal.sort_values(ascending=False).index
+    return {
+        'retencao': retencao,
+        'tamanhos': tamanhos.astype(np.int64).rename('Alunos'),
+        'retencao_canal': retencao_canal.loc[ordem_canais],
+        'tamanhos_canal': tamanhos_canal.loc[ordem_canais].astype(np.int64).rename('Alunos'),
+    }
+
+
+def construir_grafo_indicacoes(df):
+    """
+    Constrói o grafo de indicações de um dataset
+
+    Os nós são os IDs dos alunos ('ID_Aluno'); os nomes servem só de
+    rótulo. Cada aluno guarda o primeiro convidante informado, resolvido
+    para o ID do aluno cujo nome (qualquer variação ou o nome de exibição)
+    coincide com ele pela normalização de limpar_nomes, sem diferenciar
+    maiúsculas. Convidantes que não são alunos, ou cujo nome é de mais de
+    um aluno, ficam como nós identificados pelo nome normalizado.
+
+    Args:
+        df (pd.DataFrame): Check-ins com 'ID_Aluno', 'Nome', 'Nome_Aluno',
+            'Data/hora' e 'NOME DA PESSOA QUE CONVIDOU (SEMENTE/AMIGO)'
+
+    Returns:
+        dict: 'pai' (convidado -> quem convidou), 'filhos' (índice de
+            adjacência quem convidou -> convidados), 'presencas' por aluno
+            e 'nomes' (nó -> nome de exibição)
+    """
+    grafo = {'pai': {}, 'filhos': {}, 'presencas': {}, 'nomes': {}}
+    base = df.loc[df['ID_Aluno'] >= 0, ['ID_Aluno', 'Nome', 'Nome_Aluno', 'Data/hora', COLUNA_CONVIDOU]]
+    if base.empty:
+        return grafo
+
+    base = base.sort_values('Data/hora', kind='mergesort')
+    pai, filhos, nomes = grafo['pai'], grafo['filhos'], grafo['nomes']
+    nomes.update(base.drop_duplicates('ID_Aluno').set_index('ID_Aluno')['Nome_Aluno'].to_dict())
+    grafo['presencas'] = base['ID_Aluno'].value_counts().to_dict()
+
+    # Nome normalizado -> ID, só para nomes de um único aluno
+    apelidos = pd.concat([
+        base[['ID_Aluno', 'Nome']].set_axis(['ID_Aluno', 'nome'], axis=1),
+        base[['ID_Aluno', 'Nome_Aluno']].set_axis(['ID_Aluno', 'nome'], axis=1),
+    ], ignore_index=True).drop_duplicates()
+    apelidos['chave'] = limpar_nomes(apelidos['nome']).str.casefold()
+    apelidos = apelidos.drop_duplicates(['chave', 'ID_Aluno'])
+    apelidos = apelidos[~apelidos['chave'].duplicated(keep=False)]
+    apelidos = dict(zip(apelidos['chave'].tolist(), apelidos['ID_Aluno'].tolist()))
+
+    # Primeiro convidante informado por aluno
+    convites = base.dropna(subset=[COLUNA_CONVIDOU]).drop_duplicates('ID_Aluno')
+    convidantes = limpar_nomes(convites[COLUNA_CONVIDOU])
+    for id_aluno, convidante in zip(convites['ID_Aluno'].tolist(), convidantes):
+        if not isinstance(convidante, str) or not convidante:
+            continue
+        chave = convidante.casefold()
+        no = apelidos.get(chave, chave)
+        if no == id_aluno:
+            continue
+        nomes.setdefault(no, convidante)
+        pai[id_aluno] = no
+        filhos.setdefault(no, []).append(id_aluno)
+
+    return grafo
+
+
+def resumo_indicacoes(grafo):
+    """
+    Resume o grafo por convidante em tempo linear
+
+    O tamanho da rede (todos os descendentes) é acumulado das folhas para a
+    raiz em ordem topológica; nós presos em ciclos (dados inconsistentes)
+    ficam só com os descendentes fora do ciclo.
+
+    Args:
+        grafo (dict): Grafo de indicações
+
+    Returns:
+        pd.DataFrame: Por convidante: convidados diretos, tamanho da rede,
+            convidados que voltaram (2+ presenças) e retenção (%), ordenado
+            pelos convidados diretos
+    """
+    pai, filhos, presencas = grafo['pai'], grafo['filhos'], grafo['presencas']
+    if not filhos:
+        return pd.DataFrame(columns=['Convidante', 'Convidados Diretos', 'Tamanho da Rede',
+                                     'Convidados que Voltaram', 'Retenção (%)'])
+
+    restantes = {no: len(lista) for no, lista in filhos.items()}
+    rede = dict.fromkeys(set(pai) | set(filhos), 0)
+    fila = [no for no in rede if restantes.get(no, 0) == 0]
+    while fila:
+        no = fila.pop()
+        acima = pai.get(no)
+        if acima is None:
+            continue
+        rede[acima] += rede[no] + 1
+        restantes[acima] -= 1
+        if restantes[acima] == 0:
+            fila.append(acima)
+
+    linhas = []
+    for convidante, convidados in filhos.items():
+        voltaram = sum(1 for convidado in convidados if presencas.get(convidado, 0) >= 2)
+        linhas.append({
+            'Convidante': grafo['nomes'].get(convidante, convidante),
+            'Convidados Diretos': len(convidados),
+            'Tamanho da Rede': rede[convidante],
+            'Convidados que Voltaram': voltaram,
+            'Retenção (%)': round(voltaram / len(convidados) * 100, 1),
+        })
+
+    return (
+        pd.DataFrame(linhas)
+        .sort_values(['Convidados Diretos', 'Tamanho da Rede'], ascending=False, kind='mergesort')
+        .reset_index(drop=True)
+    )
+
+
+def construir_presencas_bits(df, dias=None):
+    """
+    Monta o vetor de presenças de cada aluno como bits compactados
+
+    Cada aluno ocupa uma linha de palavras de 64 bits; o bit i (do mais
+    para o menos significativo, palavra a palavra) indica presença no
+    i-ésimo dia de aula do período. Sequências, última presença e
+    ausências recentes saem de operações bit a bit sobre essas linhas.
+
+    O calendário deve vir do período e dos arquivos filtrados, antes do
+    filtro de alunos: um dia de aula em que nenhum aluno selecionado veio
+    continua contando como ausência.
+
+    Args:
+        df (pd.DataFrame): Check-ins com 'ID_Aluno', 'Nome_Aluno' e 'Data'
+        dias (array-like): Dias de aula do período (opcional; padrão: as
+            datas de df)
+
+    Returns:
+        dict: 'ids' e 'nomes' dos alunos, 'dias' de aula ordenados e
+            'bits' (matriz uint64 alunos x palavras)
+    """
+    dias = np.sort(pd.Series(df['Data'] if dias is None else dias, dtype=object).dropna().unique())
+    base = df.loc[df['ID_Aluno'] >= 0, ['ID_Aluno', 'Nome_Aluno', 'Data']]
+    base = base[base['Data'].isin(dias)]
+
+    codigos, ids = pd.factorize(base['ID_Aluno'], sort=True)
+    nomes = base.groupby('ID_Aluno')['Nome_Aluno'].first().reindex(ids).to_numpy()
+    dia = np.searchsorted(dias, base['Data'].to_numpy())
+
+    bits = np.zeros((len(ids), max(1, -(-len(dias) // 64))), dtype=np.uint64)
+    np.bitwise_or.at(
+        bits,
+        (codigos, dia >> 6),
+        np.left_shift(np.uint64(1), (63 - (dia & 63)).astype(np.uint64))
+    )
+
+    return {'ids': np.asarray(ids), 'nomes': nomes, 'dias': dias, 'bits': bits}
+
+
+# Bits ligados por valor de byte, para contar presenças
+_BITS_POR_BYTE = np.array([bin(valor).count('1') for valor in range(256)], dtype=np.int64)
+
+
+def _mascara_dias(total_palavras, inicio, fim):
+    """Linha de bits com os dias de aula [inicio, fim) ligados"""
+    dia = np.arange(inicio, fim)
+    mascara = np.zeros(total_palavras, dtype=np.uint64)
+    np.bitwise_or.at(mascara, dia >> 6, np.left_shift(np.uint64(1), (63 - (dia & 63)).astype(np.uint64)))
+    return mascara
+
+
+def _deslocar_para_tras(bits):
+    """Desloca cada linha um dia para trás (bit i recebe o bit i + 1)"""
+    deslocado = bits << np.uint64(1)
+    deslocado[:, :-1] |= bits[:, 1:] >> np.uint64(63)
+    return deslocado
+
+
+def _ultimo_dia(bits):
+    """Índice do último bit ligado de cada linha (-1 se a linha estiver vazia)"""
+    ocupadas = bits != 0
+    tem_bit = ocupadas.any(axis=1)
+    palavra = bits.shape[1] - 1 - np.argmax(ocupadas[:, ::-1], axis=1)
+    valor = bits[np.arange(len(bits)), palavra]
+    # Bit menos significativo ligado: potência de 2 exata em float64
+    menor_bit = np.log2((valor & (~valor + np.uint64(1))).astype(np.float64), where=tem_bit, out=np.zeros(len(bits)))
+    return np.where(tem_bit, palavra * 64 + 63 - menor_bit.astype(np.int64), -1)
+
+
+def ausentes_ultimas_aulas(presencas, aulas):
+    """
+    Alunos sem nenhuma presença nas últimas aulas do período
+
+    Args:
+        presencas (dict): Resultado de construir_presencas_bits
+        aulas (int): Quantidade de aulas mais recentes consideradas
+
+    Returns:
+        np.ndarray: Máscara booleana por aluno
+    """
+    total_dias = len(presencas['dias'])
+    bits = presencas['bits']
+    recentes = _mascara_dias(bits.shape[1], max(0, total_dias - aulas), total_dias)
+    return ~(bits & recentes).any(axis=1)
+
+
+def resumo_presencas_bits(presencas):
+    """
+    Resume os vetores de presença por aluno
+
+    A maior sequência é obtida por "erosão": a cada rodada cada linha é
+    combinada (AND) com ela mesma deslocada um dia, e uma linha sobrevive
+    tantas rodadas quanto o tamanho da sua maior sequência de presenças.
+
+    Args:
+        presencas (dict): Resultado de construir_presencas_bits
+
+    Returns:
+        pd.DataFrame: Por aluno: 'ID_Aluno', 'Nome', 'Presenças',
+            'Frequência (%)', 'Sequência Atual', 'Maior Sequência',
+            'Última Presença' e 'Aulas Desde a Última'
+    """
+    bits, dias = presencas['bits'], presencas['dias']
+    total_dias = len(dias)
+
+    contagem = _BITS_POR_BYTE[bits.view(np.uint8)].reshape(len(bits), bits.shape[1] * 8).sum(axis=1)
+    ultimo = _ultimo_dia(bits)
+
+    # Sequência atual: dias desde a última falta (bits desligados dentro do período)
+    validos = _mascara_dias(bits.shape[1], 0, total_dias)
+    ultima_falta = _ultimo_dia(~bits & validos)
+    sequencia_atual = total_dias - 1 - ultima_falta
+
+    maior_sequencia = np.zeros(len(bits), dtype=np.int64)
+    restante = bits.copy()
+    vivas = restante.any(axis=1)
+    while vivas.any():
+        maior_sequencia += vivas
+        restante = restante & _deslocar_para_tras(restante)
+        vivas = restante.any(axis=1)
+
+    return pd.DataFrame({
+        'ID_Aluno': presencas['ids'],
+        'Nome': presencas['nomes'],
+        'Presenças': contagem,
+        'Frequência (%)': (contagem / total_dias * 100).round(1) if total_dias else 0.0,
+        'Sequência Atual': sequencia_atual,
+        'Maior Sequência': maior_sequencia,
+        'Última Presença': [dias[dia] if dia >= 0 else None for dia in ultimo],
+        'Aulas Desde a Última': np.where(ultimo >= 0, total_dias - 1 - ultimo, total_dias),
+    })
+
+
+def _assinatura_ids(ids):
+    """Hash da sequência de IDs das linhas já incorporadas aos perfis"""
+    return hashlib.sha1(np.ascontiguousarray(ids, dtype=np.int64).tobytes()).hexdigest()
+
+
+def criar_perfis(base=None):
+    """
+    Cria um repositório de perfis de alunos vazio
+
+    Args:
+        base: Identificação do conjunto de dados (arquivos e correções);
+            só perfis com a mesma base são atualizados incrementalmente
+
+    Returns:
+        dict: 'perfis' (ID -> perfil), 'ids_por_nome' (nome -> IDs),
+            'dias' de aula, 'meses' do período, 'linhas' incorporadas e sua
+            'assinatura'
+    """
+    return {
+        'base': base,
+        'perfis': {},
+        'ids_por_nome': {},
+        'dias': frozenset(),
+        'meses': (),
+        'linhas': 0,
+        'assinatura': _assinatura_ids([]),
+    }
+
+
+def atualizar_perfis(repositorio, df, hora_inicio=HORA_INICIO_AULA):
+    """
+    Incorpora novas linhas de check-in aos perfis dos alunos
+
+    As linhas são agregadas por aluno em uma passada vetorizada e somadas
+    aos perfis existentes. O repositório recebido não é alterado: os perfis
+    tocados são copiados, e os demais, compartilhados.
+
+    Args:
+        repositorio (dict): Repositório criado por criar_perfis
+        df (pd.DataFrame): Novas linhas com 'ID_Aluno', 'Nome_Aluno',
+            'Data/hora', 'Data', 'Hora_decimal' e telefone
+        hora_inicio (float): Início da aula em horas decimais
+
+    Returns:
+        dict: Novo repositório com os perfis atualizados
+    """
+    novo = dict(repositorio)
+    novo['linhas'] = repositorio['linhas'] + len(df)
+    novo['assinatura'] = None
+
+    base = df.loc[df['ID_Aluno'] >= 0]
+    if base.empty:
+        return novo
+
+    minutos_atraso = ((base['Hora_decimal'] - hora_inicio) * 60).clip(lower=0)
+    agregado = pd.DataFrame({
+        'ID_Aluno': base['ID_Aluno'],
+        'Nome_Aluno': base['Nome_Aluno'],
+        'Data/hora': base['Data/hora'],
+        'Atrasado': minutos_atraso > 0,
+        'Minutos': minutos_atraso,
+        'Telefone': base['DDD+TELEFONE (SEM ESPAÇO)'],
+    }).groupby('ID_Aluno').agg(
+        nome=('Nome_Aluno', 'last'),
+        presencas=('Data/hora', 'size'),
+        primeira=('Data/hora', 'min'),
+        ultima=('Data/hora', 'max'),
+        atrasos=('Atrasado', 'sum'),
+        minutos_atraso=('Minutos', 'sum'),
+        telefone=('Telefone', 'first'),
+    )
+    mes = base['Data/hora'].dt.to_period('M')
+    por_mes = base.groupby([base['ID_Aluno'], mes]).size()
+
+    meses_aluno = {}
+    for (id_aluno, periodo), quantidade in por_mes.items():
+        meses_aluno.setdefault(id_aluno, {})[periodo] = int(quantidade)
+
+    perfis = dict(repositorio['perfis'])
+    ids_por_nome = dict(repositorio['ids_por_nome'])
+    for id_aluno, linha in agregado.iterrows():
+        anterior = perfis.get(id_aluno)
+        meses = dict(anterior['meses']) if anterior else {}
+        for periodo, quantidade in meses_aluno[id_aluno].items():
+            meses[periodo] = meses.get(periodo, 0) + quantidade
+
+        perfis[id_aluno] = {
+            'nome': linha['nome'],
+            'presencas': (anterior['presencas'] if anterior else 0) + int(linha['presencas']),
+            'primeira': min(anterior['primeira'], linha['primeira']) if anterior else linha['primeira'],
+            'ultima': max(anterior['ultima'], linha['ultima']) if anterior else linha['ultima'],
+            'atrasos': (anterior['atrasos'] if anterior else 0) + int(linha['atrasos']),
+            'minutos_atraso': (anterior['minutos_atraso'] if anterior else 0.0) + float(linha['minutos_atraso']),
+            'telefone': anterior['telefone'] if anterior and pd.notna(anterior['telefone']) else linha['telefone'],
+            'meses': meses,
+        }
+        # Homônimos são alunos distintos: o nome leva a todos os IDs
+        ids_por_nome[linha['nome']] = ids_por_nome.get(linha['nome'], frozenset()) | {id_aluno}
+
+    novo['perfis'] = perfis
+    novo['ids_por_nome'] = ids_por_nome
+    novo['dias'] = repositorio['dias'] | frozenset(df['Data'].unique())
+    novo['meses'] = tuple(sorted(set(repositorio['meses']) | set(mes.unique())))
+    return novo
+
+
+def sincronizar_perfis(repositorio, df, base=None, dias=None, hora_inicio=HORA_INICIO_AULA):
+    """
+    Leva o repositório de perfis ao estado de um dataset
+
+    Se o dataset apenas acrescentou linhas às já incorporadas (mesma base
+    e mesmos IDs nas linhas antigas, como no modo ao vivo), só as linhas
+    novas são agregadas; caso contrário os perfis são reconstruídos.
+
+    Args:
+        repositorio (dict): Repositório anterior (ou None)
+        df (pd.DataFrame): Dataset completo
+        base: Identificação do conjunto de dados (arquivos, correções e filtros)
+        dias (array-like): Dias de aula do período, se df estiver restrito a
+            alguns alunos (opcional; padrão: as datas de df)
+        hora_inicio (float): Início da aula em horas decimais (deve fazer
+            parte de base, para não somar atrasos medidos com outro horário)
+
+    Returns:
+        dict: Repositório correspondente ao dataset
+    """
+    ids = df['ID_Aluno'].to_numpy()
+    incremental = (
+        repositorio is not None
+        and repositorio['base'] == base
+        and repositorio['linhas'] <= len(ids)
+        and repositorio['assinatura'] == _assinatura_ids(ids[:repositorio['linhas']])
+    )
+    if not incremental:
+        repositorio = criar_perfis(base)
+
+    repositorio = atualizar_perfis(repositorio, df.iloc[repositorio['linhas']:], hora_inicio)
+    repositorio['assinatura'] = _assinatura_ids(ids)
+    if dias is not None:
+        repositorio['dias'] = repositorio['dias'] | frozenset(pd.Series(dias, dtype=object).dropna().unique())
+    return repositorio
+
+
+def consultar_perfis(repositorio, ids):
+    """
+    Monta a tabela de perfis dos alunos pedidos por consulta direta
+
+    Args:
+        repositorio (dict): Repositório de perfis
+        ids (iterable): IDs dos alunos
+
+    Returns:
+        pd.DataFrame: Por aluno: nome, presenças, frequência, primeira e
+            última visita, atrasos, atraso médio, telefone e presenças por
+            mês (sparkline)
+    """
+    total_dias = len(repositorio['dias'])
+    meses = repositorio['meses']
+    linhas = []
+    for id_aluno in ids:
+        perfil = repositorio['perfis'].get(id_aluno)
+        if perfil is None:
+            continue
+        linhas.append({
+            'ID_Aluno': id_aluno,
+            'Nome': perfil['nome'],
+            'Presenças': perfil['presencas'],
+            'Frequência (%)': round(perfil['presencas'] / total_dias * 100, 1) if total_dias else 0.0,
+            'Primeira Visita': perfil['primeira'].date(),
+            'Última Visita': perfil['ultima'].date(),
+            'Atrasos (%)': round(perfil['atrasos'] / perfil['presencas'] * 100, 1),
+            'Atraso Médio (min)': round(perfil['minutos_atraso'] / perfil['atrasos'], 1) if perfil['atrasos'] else 0.0,
+            'Telefone': perfil['telefone'],
+            'Presenças por Mês': [perfil['meses'].get(mes, 0) for mes in meses],
+        })
+
+    return pd.DataFrame(linhas, columns=[
+        'ID_Aluno', 'Nome', 'Presenças', 'Frequência (%)', 'Primeira Visita', 'Última Visita',
+        'Atrasos (%)', 'Atraso Médio (min)', 'Telefone', 'Presenças por Mês'
+    ])
+
+
+def comparar_grupos(df, coluna_grupo='Arquivo'):
+    """
+    Calcula as métricas da visão geral de vários grupos lado a lado
+
+    Todos os grupos saem de duas contagens agrupadas, uma por (grupo, dia)
+    e outra por (grupo, aluno), sem laço por grupo. A frequência de cada
+    aluno é medida sobre os dias de aula do próprio grupo.
+
+    Args:
+        df (pd.DataFrame): Check-ins com 'Data', 'ID_Aluno' e a coluna do grupo,
+            no máximo um por aluno, dia e grupo (ver preparar_grupos)
+        coluna_grupo (str): Coluna que identifica o grupo (padrão: arquivo de origem)
+
+    Returns:
+        pd.DataFrame: Uma linha por grupo com 'Grupo', 'Presenças', 'Alunos',
+            'Dias', 'Média/Dia' e a quantidade de alunos em cada faixa de
+            FAIXAS_FREQUENCIA
+    """
+    colunas = ['Grupo', 'Presenças', 'Alunos', 'Dias', 'Média/Dia'] + FAIXAS_FREQUENCIA
+    if df.empty:
+        return pd.DataFrame(columns=colunas)
+
+    por_dia = df.groupby([coluna_grupo, 'Data']).size()
+    presencas = por_dia.groupby(level=0).sum()
+    dias = por_dia.groupby(level=0).size()
+
+    identificados = df[df['ID_Aluno'] >= 0]
+    por_aluno = identificados.groupby([coluna_grupo, 'ID_Aluno']).size()
+    grupo_aluno = por_aluno.index.get_level_values(0)
+    alunos = por_aluno.groupby(level=0).size()
+
+    # Mesmo arredondamento da visão geral antes de enquadrar nas faixas
+    frequencia = (por_aluno.to_numpy() / dias.reindex(grupo_aluno).to_numpy() * 100).round(1)
+    faixa = np.searchsorted(LIMITES_FAIXAS_FREQUENCIA, frequencia, side='left')
+
+    codigos = dias.index.get_indexer(grupo_aluno)
+    distribuicao = np.bincount(
+        codigos * len(FAIXAS_FREQUENCIA) + faixa,
+        minlength=len(dias) * len(FAIXAS_FREQUENCIA)
+    ).reshape(len(dias), len(FAIXAS_FREQUENCIA))
+
+    resumo = pd.DataFrame({
+        'Grupo': dias.index,
+        'Presenças': presencas.to_numpy(),
+        'Alunos': alunos.reindex(dias.index, fill_value=0).to_numpy(),
+        'Dias': dias.to_numpy(),
+        'Média/Dia': (presencas.to_numpy() / dias.to_numpy()).round(1),
+    })
+    resumo[FAIXAS_FREQUENCIA] = distribuicao
+    return resumo[colunas]
@@ -0,0 +1,546 @@
+"""
+Armazenamento opcional em SQLite para o Dashboard de Frequência de Alunos
+
+Guarda os check-ins ingeridos, os nomes normalizados e o log de correções
+em um arquivo local, com índices por aluno, data e 'Data/hora', para que o
+histórico sobreviva ao fechamento do navegador e os filtros rodem como
+consultas indexadas.
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from dashboard_dados import adicionar_colunas_tempo, limpar_nomes, resolver_identidades
+
+# Caminho do banco, definido só no servidor (variável de ambiente), nunca pela tela
+CAMINHO_BANCO_PADRAO = os.environ.get('DASHBOARD_DB', os.path.join('dados', 'frequencia.db'))
+
+# Coluna do DataFrame -> coluna da tabela checkins
+COLUNAS_BANCO = {
+    'Arquivo': 'arquivo',
+    'Data/hora': 'data_hora',
+    'Data': 'data',
+    'Nome': 'nome',
+    'Nome_Original': 'nome_original',
+    'ID_Aluno': 'id_aluno',
+    'Nome_Aluno': 'nome_aluno',
+    'DDD+TELEFONE (SEM ESPAÇO)': 'telefone',
+    'Telefone_Normalizado': 'telefone_normalizado',
+    'COMO CONHECEU O GRUPO?': 'como_conheceu',
+    'PRIMEIRA VEZ NO GRUPO?': 'primeira_vez',
+    'NOME DA PESSOA QUE CONVIDOU (SEMENTE/AMIGO)': 'convidou',
+}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    nome TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    importado_em TEXT NOT NULL,
+    PRIMARY KEY (nome, hash)
+);
+
+CREATE TABLE IF NOT EXISTS checkins (
+    id INTEGER PRIMARY KEY,
+    arquivo TEXT,
+    data_hora TEXT NOT NULL,
+    data TEXT NOT NULL,
+    nome TEXT,
+    nome_original TEXT,
+    id_aluno INTEGER NOT NULL DEFAULT -1,
+    nome_aluno TEXT,
+    telefone TEXT,
+    telefone_normalizado TEXT,
+    como_conheceu TEXT,
+    primeira_vez TEXT,
+    convidou TEXT,
+    outro_grupo INTEGER NOT NULL DEFAULT 0,
+    repetido INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_checkins_aluno ON checkins (id_aluno, data);
+CREATE INDEX IF NOT EXISTS idx_checkins_nome ON checkins (nome);
+CREATE INDEX IF NOT EXISTS idx_checkins_data ON checkins (data);
+CREATE INDEX IF NOT EXISTS idx_checkins_data_hora ON checkins (data_hora);
+
+CREATE TABLE IF NOT EXISTS correcoes (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    de TEXT NOT NULL,
+    para TEXT NOT NULL,
+    registros INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+"""
+
+# Marcas acrescentadas à tabela checkins depois das primeiras versões do banco
+COLUNAS_MARCAS = ['outro_grupo', 'repetido']
+
+
+def conectar(caminho=CAMINHO_BANCO_PADRAO):
+    """
+    Abre (e cria, se preciso) o banco de frequência
+
+    Args:
+        caminho (str): Caminho do arquivo SQLite
+
+    Returns:
+        sqlite3.Connection: Conexão pronta para uso
+    """
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    conn = sqlite3.connect(caminho, check_same_thread=False)
+    conn.executescript(ESQUEMA)
+    # Bancos criados antes das marcas de check-in repetido
+    colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(checkins)")}
+    for coluna in COLUNAS_MARCAS:
+        if coluna not in colunas:
+            conn.execute(f"ALTER TABLE checkins ADD COLUMN {coluna} INTEGER NOT NULL DEFAULT 0")
+    conn.commit()
+    return conn
+
+
+def _ler_meta(conn, chave):
+    linha = conn.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+    return linha[0] if linha else 0
+
+
+def _somar_meta(conn, chave, incremento):
+    conn.execute(
+        "INSERT INTO meta (chave, valor) VALUES (?, ?) "
+        "ON CONFLICT(chave) DO UPDATE SET valor = valor + excluded.valor",
+        (chave, incremento)
+    )
+
+
+def versao_banco(conn):
+    """
+    Versão dos dados, incrementada a cada importação ou correção
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+
+    Returns:
+        int: Versão atual
+    """
+    return _ler_meta(conn, 'versao')
+
+
+def duplicatas_removidas_banco(conn):
+    """
+    Total de check-ins duplicados fora das consultas
+
+    Conta as linhas marcadas como repetidas (no mesmo arquivo ou em outro
+    grupo) e as apagadas por versões antigas do banco.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+
+    Returns:
+        int: Quantidade de linhas descartadas
+    """
+    marcadas = conn.execute("SELECT COUNT(*) FROM checkins WHERE repetido = 1 OR outro_grupo = 1").fetchone()[0]
+    return _ler_meta(conn, 'duplicatas_removidas') + marcadas
+
+
+def _atualizar_identidades(conn):
+    """Recalcula ID_Aluno e Nome_Aluno de todo o histórico"""
+    df = pd.read_sql_query(
+        "SELECT nome AS Nome, telefone AS 'DDD+TELEFONE (SEM ESPAÇO)', data_hora AS 'Data/hora' "
+        "FROM checkins WHERE nome IS NOT NULL",
+        conn
+    )
+    if df.empty:
+        return
+    df['Data/hora'] = pd.to_datetime(df['Data/hora'])
+    df = resolver_identidades(df)
+
+    # O ID depende apenas do nome, então uma atualização por nome distinto basta
+    por_nome = df.drop_duplicates('Nome')[['ID_Aluno', 'Nome_Aluno', 'Nome']]
+    conn.executemany(
+        "UPDATE checkins SET id_aluno = ?, nome_aluno = ? WHERE nome = ?",
+        [(int(id_aluno), nome_aluno, nome) for id_aluno, nome_aluno, nome in por_nome.itertuples(index=False)]
+    )
+
+
+def _marcar_duplicatas(conn):
+    """
+    Marca os check-ins repetidos no mesmo dia em todo o histórico
+
+    Fica um check-in por aluno, dia e arquivo (o mais cedo); os demais são
+    marcados como 'repetido'. Entre arquivos, só o mais cedo do dia entra
+    nas consultas, e os outros ficam marcados como 'outro_grupo' para a
+    comparação entre grupos. Nada é apagado: as marcas são recalculadas a
+    cada importação ou correção, e uma correção desfeita devolve as linhas.
+    """
+    conn.execute("""
+        UPDATE checkins SET repetido = id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY id_aluno, data, arquivo ORDER BY data_hora, id
+                ) AS ordem
+                FROM checkins WHERE id_aluno >= 0
+            ) WHERE ordem > 1
+        )
+    """)
+    conn.execute("""
+        UPDATE checkins SET outro_grupo = id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY id_aluno, data ORDER BY data_hora, id
+                ) AS ordem
+                FROM checkins WHERE id_aluno >= 0 AND repetido = 0
+            ) WHERE ordem > 1
+        )
+    """)
+
+
+def importar_checkins(conn, df, chave_dataset, df_duplicatas=None):
+    """
+    Grava no banco os arquivos do dataset que ainda não foram importados
+
+    Depois da importação, as identidades são recalculadas sobre todo o
+    histórico e os check-ins repetidos no mesmo dia são marcados (ver
+    _marcar_duplicatas).
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+        df (pd.DataFrame): Dados processados (com a coluna 'Arquivo')
+        chave_dataset (tuple): Pares (nome do arquivo, hash do conteúdo)
+        df_duplicatas (pd.DataFrame): Check-ins repetidos removidos na
+            ingestão (opcional); gravados também, com a marca de repetido
+
+    Returns:
+        int: Quantidade de arquivos importados
+    """
+    importados = 0
+    agora = datetime.now().isoformat(timespec='seconds')
+
+    for nome_arquivo, hash_arquivo in chave_dataset:
+        ja_importado = conn.execute(
+            "SELECT 1 FROM arquivos WHERE nome = ? AND hash = ?", (nome_arquivo, hash_arquivo)
+        ).fetchone()
+        if ja_importado:
+            continue
+
+        parte = df[df['Arquivo'] == nome_arquivo]
+        if df_duplicatas is not None and not df_duplicatas.empty:
+            parte = pd.concat(
+                [parte, df_duplicatas[df_duplicatas['Arquivo'] == nome_arquivo]], sort=False
+            ).sort_index()
+        colunas = [col for col in COLUNAS_BANCO if col in parte.columns]
+        linhas = parte[colunas].copy()
+        linhas['Data/hora'] = linhas['Data/hora'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        linhas['Data'] = linhas['Data'].astype(str)
+        linhas = linhas.astype(object).where(linhas.notna(), None)
+
+        nomes_banco = ', '.join(COLUNAS_BANCO[col] for col in colunas)
+        marcadores = ', '.join('?' for _ in colunas)
+        conn.executemany(
+            f"INSERT INTO checkins ({nomes_banco}) VALUES ({marcadores})",
+            linhas.itertuples(index=False, name=None)
+        )
+        conn.execute(
+            "INSERT INTO arquivos (nome, hash, importado_em) VALUES (?, ?, ?)",
+            (nome_arquivo, hash_arquivo, agora)
+        )
+        importados += 1
+
+    if importados:
+        _atualizar_identidades(conn)
+        _marcar_duplicatas(conn)
+        _somar_meta(conn, 'versao', 1)
+    conn.commit()
+    return importados
+
+
+def _condicoes(inicio=None, fim=None, arquivos=None, alunos=None, grupos=False):
+    """Monta a cláusula WHERE (e parâmetros) dos filtros do dashboard"""
+    condicoes, parametros = ["repetido = 0"], []
+    if not grupos:
+        condicoes.append("outro_grupo = 0")
+    if inicio is not None:
+        condicoes.append("data >= ?")
+        parametros.append(str(inicio))
+    if fim is not None:
+        condicoes.append("data <= ?")
+        parametros.append(str(fim))
+    if arquivos:
+        condicoes.append(f"arquivo IN ({', '.join('?' for _ in arquivos)})")
+        parametros.extend(arquivos)
+    if alunos:
+        condicoes.append(f"id_aluno IN ({', '.join('?' for _ in alunos)})")
+        parametros.extend(int(id_aluno) for id_aluno in alunos)
+    return f"WHERE {' AND '.join(condicoes)}", parametros
+
+
+def consultar_checkins(conn, inicio=None, fim=None, arquivos=None, alunos=None, grupos=False):
+    """
+    Consulta check-ins usando os índices do banco
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+        inicio (date): Data inicial (inclusiva)
+        fim (date): Data final (inclusiva)
+        arquivos (list): Arquivos de origem aceitos (opcional)
+        alunos (list): IDs de aluno ('ID_Aluno') aceitos (opcional)
+        grupos (bool): Inclui o check-in do mesmo dia em outro grupo (um
+            por aluno, dia e arquivo), para a comparação entre grupos
+
+    Returns:
+        pd.DataFrame: Check-ins com as mesmas colunas dos dados em memória
+    """
+    where, parametros = _condicoes(inicio, fim, arquivos, alunos, grupos)
+    selecao = ', '.join(
+        f"{coluna_banco} AS '{coluna}'" for coluna, coluna_banco in COLUNAS_BANCO.items() if coluna != 'Data'
+    )
+    df = pd.read_sql_query(
+        f"SELECT {selecao} FROM checkins {where} ORDER BY data_hora, id",
+        conn,
+        params=parametros
+    )
+    df['Data/hora'] = pd.to_datetime(df['Data/hora'])
+    df['ID_Aluno'] = df['ID_Aluno'].astype('int64')
+    return adicionar_colunas_tempo(df)
+
+
+def periodo_banco(conn, arquivos=None):
+    """
+    Primeira e última data de aula no banco
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+        arquivos (list): Restringe a estes arquivos (opcional)
+
+    Returns:
+        tuple: (date inicial, date final) ou (None, None) se vazio
+    """
+    where, parametros = _condicoes(arquivos=arquivos)
+    minimo, maximo = conn.execute(f"SELECT MIN(data), MAX(data) FROM checkins {where}", parametros).fetchone()
+    if minimo is None:
+        return None, None
+    return datetime.strptime(minimo, '%Y-%m-%d').date(), datetime.strptime(maximo, '%Y-%m-%d').date()
+
+
+def dias_aula_banco(conn, inicio=None, fim=None, arquivos=None):
+    """
+    Dias com check-in no período, sem filtro de alunos
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+        inicio (date): Data inicial (inclusiva)
+        fim (date): Data final (inclusiva)
+        arquivos (list): Arquivos de origem aceitos (opcional)
+
+    Returns:
+        list: Datas (date) em ordem crescente
+    """
+    where, parametros = _condicoes(inicio, fim, arquivos)
+    return [
+        datetime.strptime(linha[0], '%Y-%m-%d').date()
+        for linha in conn.execute(f"SELECT DISTINCT data FROM checkins {where} ORDER BY data", parametros)
+    ]
+
+
+def listar_arquivos_banco(conn):
+    """
+    Arquivos de origem presentes no banco
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+
+    Returns:
+        list: Nomes dos arquivos, em ordem alfabética
+    """
+    return [linha[0] for linha in conn.execute("SELECT DISTINCT arquivo FROM checkins ORDER BY arquivo")]
+
+
+def listar_alunos_banco(conn, inicio=None, fim=None, arquivos=None):
+    """
+    Alunos identificados com presença no período
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+        inicio (date): Data inicial (inclusiva)
+        fim (date): Data final (inclusiva)
+        arquivos (list): Arquivos de origem aceitos (opcional)
+
+    Returns:
+        pd.DataFrame: 'ID_Aluno' e 'Nome_Aluno', em ordem de nome
+    """
+    where, parametros = _condicoes(inicio, fim, arquivos)
+    where = f"{where} AND id_aluno >= 0"
+    return pd.read_sql_query(
+        f"SELECT id_aluno AS ID_Aluno, MIN(nome_aluno) AS Nome_Aluno FROM checkins {where} "
+        "GROUP BY id_aluno ORDER BY Nome_Aluno, id_aluno",
+        conn,
+        params=parametros
+    )
+
+
+def buscar_alunos_banco(conn, trecho, inicio=None, fim=None, arquivos=None, alunos=None):
+    """
+    Alunos cujo nome contém um trecho, com presença no recorte dos filtros
+
+    O trecho é procurado nos nomes distintos, lidos do índice de nomes, com
+    a mesma regra do modo em memória (literal, sem diferenciar maiúsculas);
+    os check-ins dos nomes encontrados vêm do mesmo índice.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+        trecho (str): Parte do nome procurada
+        inicio (date): Data inicial (inclusiva)
+        fim (date): Data final (inclusiva)
+        arquivos (list): Arquivos de origem aceitos (opcional)
+        alunos (list): IDs de aluno ('ID_Aluno') aceitos (opcional)
+
+    Returns:
+        set: IDs dos alunos encontrados
+    """
+    nomes = pd.Series(
+        [linha[0] for linha in conn.execute("SELECT DISTINCT nome FROM checkins WHERE nome IS NOT NULL")],
+        dtype=object
+    )
+    encontrados = list(nomes[nomes.str.contains(trecho, case=False, regex=False)])
+    if not encontrados:
+        return set()
+
+    where, parametros = _condicoes(inicio, fim, arquivos, alunos)
+    return {
+        linha[0] for linha in conn.execute(
+            f"SELECT DISTINCT id_aluno FROM checkins {where} AND id_aluno >= 0 "
+            f"AND nome IN ({', '.join('?' for _ in encontrados)})",
+            parametros + encontrados
+        )
+    }
+
+
+def contar_nomes_banco(conn):
+    """
+    Presenças por nome em todo o histórico, sem carregar os check-ins
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+
+    Returns:
+        pd.Series: Contagem por 'Nome', da maior para a menor (como
+            value_counts)
+    """
+    contagem = pd.read_sql_query(
+        "SELECT nome, COUNT(*) AS n FROM checkins "
+        "WHERE nome IS NOT NULL AND repetido = 0 AND outro_grupo = 0 GROUP BY nome",
+        conn
+    )
+    return (
+        contagem.set_index('nome')['n']
+        .sort_values(ascending=False, kind='mergesort')
+        .rename_axis(None)
+        .rename('Nome')
+    )
+
+
+def entradas_banco(conn):
+    """
+    Visita de entrada de cada aluno em todo o histórico, agregada por SQL
+
+    Mesmo resultado de entradas_alunos, sem carregar os check-ins: as
+    primeiras respostas informadas vêm de subconsultas pelo índice de aluno.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+
+    Returns:
+        pd.DataFrame: Indexado por 'ID_Aluno', com 'Primeira Visita',
+            'COMO CONHECEU O GRUPO?' e 'PRIMEIRA VEZ NO GRUPO?'
+    """
+    primeira_resposta = (
+        "(SELECT {coluna} FROM checkins c2 WHERE c2.id_aluno = c.id_aluno "
+        "AND c2.repetido = 0 AND c2.outro_grupo = 0 "
+        "AND {coluna} IS NOT NULL "
+        "ORDER BY data_hora, id LIMIT 1)"
+    )
+    entradas = pd.read_sql_query(
+        "SELECT id_aluno AS ID_Aluno, MIN(data_hora) AS 'Primeira Visita', "
+        f"{primeira_resposta.format(coluna='como_conheceu')} AS 'COMO CONHECEU O GRUPO?', "
+        f"{primeira_resposta.format(coluna='primeira_vez')} AS 'PRIMEIRA VEZ NO GRUPO?' "
+        "FROM checkins c WHERE id_aluno >= 0 AND repetido = 0 AND outro_grupo = 0 GROUP BY id_aluno",
+        conn
+    )
+    entradas['Primeira Visita'] = pd.to_datetime(entradas['Primeira Visita'])
+    return entradas.set_index('ID_Aluno')
+
+
+def aplicar_correcao_banco(conn, nome_errado, nome_correto):
+    """
+    Renomeia um aluno no histórico e registra a correção
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+        nome_errado (str): Nome atual
+        nome_correto (str): Novo nome
+
+    Returns:
+        int: Quantidade de registros alterados
+    """
+    registros = conn.execute(
+        "UPDATE checkins SET nome = ? WHERE nome = ?", (nome_correto, nome_errado)
+    ).rowcount
+    if registros:
+        conn.execute(
+            "INSERT INTO correcoes (timestamp, tipo, de, para, registros) VALUES (?, ?, ?, ?, ?)",
+            (datetime.now().strftime('%H:%M:%S'), 'Correção Manual', nome_errado, nome_correto, registros)
+        )
+        # A correção pode unir dois alunos com check-in no mesmo dia
+        _atualizar_identidades(conn)
+        _marcar_duplicatas(conn)
+        _somar_meta(conn, 'versao', 1)
+    conn.commit()
+    return registros
+
+
+def resetar_correcoes_banco(conn):
+    """
+    Desfaz as correções manuais, voltando aos nomes padronizados
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+    """
+    originais = [
+        linha[0] for linha in
+        conn.execute("SELECT DISTINCT nome_original FROM checkins WHERE nome_original IS NOT NULL")
+    ]
+    conn.executemany(
+        "UPDATE checkins SET nome = ? WHERE nome_original = ?",
+        zip(limpar_nomes(pd.Series(originais, dtype=object)), originais)
+    )
+    conn.execute("DELETE FROM correcoes")
+    _atualizar_identidades(conn)
+    # Alunos separados de novo voltam a ter seus check-ins do dia nas consultas
+    _marcar_duplicatas(conn)
+    _somar_meta(conn, 'versao', 1)
+    conn.commit()
+
+
+def log_correcoes_banco(conn):
+    """
+    Correções registradas no banco, da mais antiga para a mais recente
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco
+
+    Returns:
+        list: Dicionários com timestamp, tipo, de, para e registros
+    """
+    cursor = conn.execute("SELECT timestamp, tipo, de, para, registros FROM correcoes ORDER BY id")
+    return [
+        dict(zip(['timestamp', 'tipo', 'de', 'para', 'registros'], linha))
+        for linha in cursor
+    ]
@@ -0,0 +1,257 @@
+"""
+Cache de processo compartilhado entre as sessões do Dashboard de Frequência
+
+Guarda frames processados, matrizes de presença, índices de busca e
+resultados de similaridade sob um orçamento de memória, descartando
+primeiro as entradas usadas há mais tempo (LRU) e expirando as ociosas.
+"""
+
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Orçamento de memória (MB) e tempo de ociosidade (segundos), configuráveis por ambiente
+CACHE_LIMITE_MB = float(os.environ.get('DASHBOARD_CACHE_MB', 512))
+CACHE_TTL_SEGUNDOS = float(os.environ.get('DASHBOARD_CACHE_TTL', 3600))
+
+# Token que libera a lista de entradas e a limpeza do cache (vazio: ninguém administra)
+TOKEN_ADMIN_CACHE = os.environ.get('DASHBOARD_ADMIN_TOKEN', '')
+
+# chave -> {'valor', 'tamanho', 'criado', 'acesso', 'acessos'}, da menos para a mais recente
+_entradas = OrderedDict()
+_lock = threading.RLock()
+_config = {
+    'limite_bytes': int(CACHE_LIMITE_MB * 1024 * 1024),
+    'ttl': CACHE_TTL_SEGUNDOS,
+}
+_contadores = {'hits': 0, 'misses': 0, 'evictions': 0, 'expiracoes': 0}
+
+
+def tamanho_objeto(valor):
+    """
+    Estima a memória ocupada por um valor guardado no cache
+
+    Args:
+        valor: DataFrame, Series, array, bytes ou coleções desses tipos
+
+    Returns:
+        int: Tamanho aproximado em bytes
+    """
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, np.ndarray):
+        return int(valor.nbytes)
+    if isinstance(valor, (bytes, bytearray, str)):
+        return len(valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(
+            tamanho_objeto(k) + tamanho_objeto(v) for k, v in valor.items()
+        )
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valor) + sum(tamanho_objeto(item) for item in valor)
+    return sys.getsizeof(valor)
+
+
+def autorizar_admin(token, token_admin=None):
+    """
+    Confere o token de administração do servidor
+
+    As chaves guardadas identificam arquivos e filtros de todas as sessões,
+    e o histórico em SQLite é um só para o servidor, então a lista de
+    entradas, a limpeza do cache e o histórico ficam restritos a quem
+    conhece o token configurado no servidor.
+
+    Args:
+        token (str): Token informado na tela
+        token_admin (str): Token esperado (padrão: TOKEN_ADMIN_CACHE)
+
+    Returns:
+        bool: True se o token confere com um token configurado
+    """
+    token_admin = TOKEN_ADMIN_CACHE if token_admin is None else token_admin
+    if not token_admin or not token:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), token_admin.encode('utf-8'))
+
+
+def configurar_cache(limite_mb=None, ttl_segundos=None):
+    """
+    Ajusta o orçamento de memória e o TTL do cache
+
+    Args:
+        limite_mb (float): Novo orçamento em MB (opcional)
+        ttl_segundos (float): Novo tempo máximo de ociosidade (opcional)
+    """
+    with _lock:
+        if limite_mb is not None:
+            _config['limite_bytes'] = int(limite_mb * 1024 * 1024)
+        if ttl_segundos is not None:
+            _config['ttl'] = ttl_segundos
+        _remover_expiradas(time.time())
+        _liberar_espaco(0)
+
+
+def _remover_expiradas(agora):
+    """Remove entradas sem acesso há mais que o TTL (chamar com o lock)"""
+    expiradas = [
+        chave for chave, entrada in _entradas.items()
+        if agora - entrada['acesso'] > _config['ttl']
+    ]
+    for chave in expiradas:
+        del _entradas[chave]
+    _contadores['expiracoes'] += len(expiradas)
+
+
+def _liberar_espaco(necessario):
+    """Descarta entradas LRU até caber `necessario` bytes (chamar com o lock)"""
+    total = sum(entrada['tamanho'] for entrada in _entradas.values())
+    while _entradas and total + necessario > _config['limite_bytes']:
+        _, entrada = _entradas.popitem(last=False)
+        total -= entrada['tamanho']
+        _contadores['evictions'] += 1
+
+
+def obter(chave, padrao=None):
+    """
+    Busca um valor no cache, marcando-o como usado recentemente
+
+    Args:
+        chave (tuple): Chave da entrada; o primeiro item é a categoria
+        padrao: Valor retornado se a chave não existir ou tiver expirado
+
+    Returns:
+        Valor guardado ou `padrao`
+    """
+    with _lock:
+        entrada = _entradas.get(chave)
+        agora = time.time()
+        if entrada is not None and agora - entrada['acesso'] > _config['ttl']:
+            del _entradas[chave]
+            _contadores['expiracoes'] += 1
+            entrada = None
+
+        if entrada is None:
+            _contadores['misses'] += 1
+            return padrao
+
+        _contadores['hits'] += 1
+        entrada['acesso'] = agora
+        entrada['acessos'] += 1
+        _entradas.move_to_end(chave)
+        return entrada['valor']
+
+
+def guardar(chave, valor):
+    """
+    Guarda um valor no cache respeitando o orçamento de memória
+
+    Valores maiores que o orçamento inteiro não são guardados.
+
+    Args:
+        chave (tuple): Chave da entrada; o primeiro item é a categoria
+        valor: Valor a guardar
+
+    Returns:
+        O próprio valor
+    """
+    tamanho = tamanho_objeto(valor)
+    with _lock:
+        agora = time.time()
+        _entradas.pop(chave, None)
+        _remover_expiradas(agora)
+        if tamanho > _config['limite_bytes']:
+            return valor
+        _liberar_espaco(tamanho)
+        _entradas[chave] = {
+            'valor': valor,
+            'tamanho': tamanho,
+            'criado': agora,
+            'acesso': agora,
+            'acessos': 0,
+        }
+    return valor
+
+
+def obter_ou_calcular(chave, funcao, *args, **kwargs):
+    """
+    Busca um valor no cache ou o calcula e guarda
+
+    O cálculo roda fora do lock, para não bloquear outras sessões.
+
+    Args:
+        chave (tuple): Chave da entrada; o primeiro item é a categoria
+        funcao (callable): Função que produz o valor em caso de miss
+        *args, **kwargs: Argumentos repassados a `funcao`
+
+    Returns:
+        Valor guardado ou recém-calculado
+    """
+    sentinela = object()
+    valor = obter(chave, sentinela)
+    if valor is sentinela:
+        valor = guardar(chave, funcao(*args, **kwargs))
+    return valor
+
+
+def limpar_cache(categoria=None):
+    """
+    Remove entradas do cache
+
+    Args:
+        categoria (str): Remove apenas as chaves desta categoria (opcional)
+    """
+    with _lock:
+        if categoria is None:
+            _entradas.clear()
+        else:
+            for chave in [c for c in _entradas if c[0] == categoria]:
+                del _entradas[chave]
+
+
+def estatisticas_cache():
+    """
+    Resume o uso do cache
+
+    Returns:
+        dict: Contadores de hits, misses, evictions e expirações, além de
+            entradas, bytes usados e orçamento
+    """
+    with _lock:
+        return {
+            **_contadores,
+            'entradas': len(_entradas),
+            'bytes_usados': sum(entrada['tamanho'] for entrada in _entradas.values()),
+            'limite_bytes': _config['limite_bytes'],
+            'ttl': _config['ttl'],
+        }
+
+
+def entradas_cache():
+    """
+    Lista as entradas do cache, da mais para a menos recente
+
+    Returns:
+        pd.DataFrame: Categoria, chave, tamanho, idade, ociosidade e acessos
+    """
+    agora = time.time()
+    with _lock:
+        linhas = [
+            {
+                'Categoria': chave[0],
+                'Chave': ' · '.join(str(parte)[:40] for parte in chave[1:]),
+                'Tamanho (KB)': round(entrada['tamanho'] / 1024, 1),
+                'Idade (s)': int(agora - entrada['criado']),
+                'Ociosa (s)': int(agora - entrada['acesso']),
+                'Acessos': entrada['acessos'],
+            }
+            for chave, entrada in reversed(_entradas.items())
+        ]
+    return pd.DataFrame(linhas, columns=['Categoria', 'Chave', 'Tamanho (KB)', 'Idade (s)', 'Ociosa (s)', 'Acessos'])
@@ -0,0 +1,513 @@
+"""
+Processamento de dados para o Dashboard de Frequência de Alunos
+"""
+
+import hashlib
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+import dashboard_cache
+
+try:
+    from dashboard_utils import REQUIRED_COLUMNS
+except ImportError:
+    # Mesmo fallback do script principal
+    REQUIRED_COLUMNS = ['Data/hora', 'Nome', 'COMO CONHECEU O GRUPO?', 'PRIMEIRA VEZ NO GRUPO?', 'DDD+TELEFONE (SEM ESPAÇO)']
+
+# Encodings tentados, em ordem, na leitura dos CSVs
+ENCODINGS_CSV = ['utf-8', 'latin-1', 'cp1252']
+
+# Formato de 'Data/hora' exportado pelo formulário (dia/mês/ano)
+FORMATO_DATA_HORA = '%d/%m/%Y %H:%M:%S'
+
+# Partículas mantidas em minúsculas no meio dos nomes (mesmas regras de limpar_nome)
+PARTICULAS_NOME = ['da', 'de', 'do', 'das', 'dos']
+
+
+def chave_arquivo(nome_arquivo, conteudo):
+    """
+    Gera a chave de cache de um arquivo enviado
+
+    Args:
+        nome_arquivo (str): Nome do arquivo
+        conteudo (bytes): Conteúdo bruto do arquivo
+
+    Returns:
+        tuple: (nome do arquivo, hash SHA-1 do conteúdo)
+    """
+    return nome_arquivo, hashlib.sha1(conteudo).hexdigest()
+
+
+def ler_csv(conteudo):
+    """
+    Lê um CSV tentando diferentes encodings
+
+    Todas as colunas são lidas como texto: 'Data/hora' é convertida depois,
+    e o telefone e as respostas livres não mudam de tipo de um arquivo para
+    outro (um export com telefones só numéricos e outro com "(11) 9...").
+
+    Args:
+        conteudo (bytes): Conteúdo bruto do arquivo
+
+    Returns:
+        tuple: (DataFrame lido, encoding utilizado)
+
+    Raises:
+        ValueError: Se o arquivo estiver vazio, mal formatado ou com
+            encoding não suportado
+    """
+    for encoding in ENCODINGS_CSV:
+        try:
+            return pd.read_csv(BytesIO(conteudo), encoding=encoding, dtype=str), encoding
+        except UnicodeDecodeError:
+            continue
+        except pd.errors.EmptyDataError:
+            raise ValueError("O arquivo CSV está vazio ou mal formatado.")
+        except pd.errors.ParserError as e:
+            raise ValueError(f"Erro ao analisar o arquivo CSV: {str(e)}")
+    raise ValueError("Erro de encoding. Tente salvar o arquivo como CSV UTF-8.")
+
+
+def reconciliar_colunas(df):
+    """
+    Alinha os cabeçalhos de um export às colunas obrigatórias
+
+    Remove espaços extras dos cabeçalhos e renomeia variações de
+    maiúsculas/minúsculas para o nome esperado em REQUIRED_COLUMNS.
+
+    Args:
+        df (pd.DataFrame): Dados recém-lidos
+
+    Returns:
+        pd.DataFrame: Dados com cabeçalhos reconciliados
+
+    Raises:
+        ValueError: Se alguma coluna obrigatória estiver ausente
+    """
+    esperadas = {col.casefold(): col for col in REQUIRED_COLUMNS}
+    renomear = {}
+    for col in df.columns:
+        limpa = str(col).strip()
+        renomear[col] = esperadas.get(limpa.casefold(), limpa)
+    df = df.rename(columns=renomear)
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Colunas obrigatórias ausentes: {missing_columns}")
+    return df
+
+
+def limpar_nomes(nomes):
+    """
+    Limpa e padroniza uma coluna de nomes de forma vetorizada
+
+    Aplica as regras de limpar_nome (espaços, capitalização e partículas
+    em minúsculas) uma única vez por nome distinto, com os métodos de
+    texto do pandas em vez de uma chamada Python por linha.
+
+    Args:
+        nomes (pd.Series): Nomes como vieram do CSV
+
+    Returns:
+        pd.Series: Nomes limpos (nulos continuam nulos), com o mesmo índice
+    """
+    codigos, distintos = pd.factorize(nomes)
+    limpos = pd.Series(distintos, dtype=object).astype(str).str.split().str.join(' ').str.title()
+    for particula in PARTICULAS_NOME:
+        limpos = limpos.str.replace(f' {particula.title()} ', f' {particula} ', regex=False)
+
+    valores = np.append(limpos.to_numpy(dtype=object), np.nan)
+    return pd.Series(valores[codigos], index=nomes.index, dtype=object)
+
+
+def converter_datas(valores):
+    """
+    Converte a coluna 'Data/hora' para datetime
+
+    O formato do formulário é lido pelo caminho rápido do pandas; só os
+    valores em outro formato passam pela inferência (linha a linha), com
+    o dia antes do mês.
+
+    Args:
+        valores (pd.Series): 'Data/hora' como veio do CSV
+
+    Returns:
+        pd.Series: Datas convertidas (NaT onde não foi possível converter)
+    """
+    datas = pd.to_datetime(valores, format=FORMATO_DATA_HORA, errors='coerce')
+    restantes = datas.isna() & valores.notna()
+    if restantes.any():
+        datas[restantes] = pd.to_datetime(valores[restantes], errors='coerce', dayfirst=True)
+    return datas
+
+
+def adicionar_colunas_tempo(df):
+    """
+    Deriva as colunas 'Data', 'Hora' e 'Hora_decimal' de 'Data/hora'
+
+    Args:
+        df (pd.DataFrame): Dados com 'Data/hora' já convertido para datetime
+
+    Returns:
+        pd.DataFrame: Os mesmos dados com as colunas derivadas
+    """
+    df['Data'] = df['Data/hora'].dt.date
+    df['Hora'] = df['Data/hora'].dt.time
+    df['Hora_decimal'] = df['Data/hora'].dt.hour + df['Data/hora'].dt.minute/60
+    return df
+
+
+def processar_arquivo(nome_arquivo, conteudo):
+    """
+    Lê, valida e limpa um único arquivo de frequência
+
+    Args:
+        nome_arquivo (str): Nome do arquivo (gravado na coluna 'Arquivo')
+        conteudo (bytes): Conteúdo bruto do arquivo
+
+    Returns:
+        tuple: (DataFrame processado, encoding utilizado, linhas
+            descartadas por 'Data/hora' inválida, com o valor original)
+
+    Raises:
+        ValueError: Se o arquivo não puder ser lido ou validado
+    """
+    df, encoding = ler_csv(conteudo)
+
+    if df is None or df.empty:
+        raise ValueError("O arquivo não contém dados válidos.")
+
+    df = reconciliar_colunas(df)
+
+    datas = converter_datas(df['Data/hora'])
+    descartadas = df[datas.isna()].assign(Arquivo=nome_arquivo)
+
+    df['Data/hora'] = datas
+    df = adicionar_colunas_tempo(df)
+    df = df.dropna(subset=['Data/hora'])
+
+    df['Nome_Original'] = df['Nome'].copy()
+    df['Nome'] = limpar_nomes(df['Nome'])
+    df['Arquivo'] = nome_arquivo
+
+    return df, encoding, descartadas
+
+
+def carregar_arquivos(arquivos):
+    """
+    Processa vários arquivos e junta os resultados
+
+    Cada arquivo é processado uma única vez por conteúdo: arquivos já
+    vistos vêm do cache de processo (categoria 'arquivo'), e apenas os
+    novos são lidos. A leitura é sequencial: a conversão de datas e a
+    limpeza de nomes seguram o GIL, e threads não encurtam a ingestão.
+
+    Args:
+        arquivos (list): Pares (nome do arquivo, conteúdo em bytes)
+
+    Returns:
+        tuple: (DataFrame combinado ou None, chave do dataset,
+            avisos por arquivo, erros por arquivo, linhas descartadas
+            por data inválida)
+    """
+    chaves = [chave_arquivo(nome, conteudo) for nome, conteudo in arquivos]
+
+    resultados = {}
+    erros = {}
+    for chave, (_, conteudo) in zip(chaves, arquivos):
+        resultado = dashboard_cache.obter(('arquivo',) + chave)
+        if resultado is None:
+            try:
+                resultado = dashboard_cache.guardar(('arquivo',) + chave, processar_arquivo(chave[0], conteudo))
+            except ValueError as e:
+                erros[chave[0]] = str(e)
+                continue
+        resultados[chave] = resultado
+
+    frames = []
+    descartadas = []
+    avisos = {}
+    for chave in chaves:
+        if chave not in resultados:
+            continue
+        df_arquivo, encoding, descartadas_arquivo = resultados[chave]
+        frames.append(df_arquivo)
+        if not descartadas_arquivo.empty:
+            descartadas.append(descartadas_arquivo)
+        if encoding != 'utf-8':
+            avisos[chave[0]] = f"Arquivo lido com encoding {encoding}"
+
+    chave_dataset = tuple(chave for chave in chaves if chave[0] not in erros)
+    descartadas = pd.concat(descartadas, ignore_index=True, sort=False) if descartadas else pd.DataFrame()
+
+    if not frames:
+        return None, chave_dataset, avisos, erros, descartadas
+
+    df = pd.concat(frames, ignore_index=True, sort=False)
+    return df, chave_dataset, avisos, erros, descartadas
+
+
+def normalizar_telefones(telefones):
+    """
+    Normaliza números de telefone de forma vetorizada
+
+    Mantém apenas os dígitos, remove o código do país (55) e o zero de
+    discagem à esquerda, e aceita somente DDD + 8 ou 9 dígitos. Números
+    inválidos ou de preenchimento (todos os dígitos iguais) viram nulos.
+
+    Args:
+        telefones (pd.Series): Coluna de telefones como veio do CSV
+
+    Returns:
+        pd.Series: Telefones com 10 ou 11 dígitos, ou nulos
+    """
+    digitos = (
+        telefones.astype(str)
+        .str.replace(r'\.0$', '', regex=True)
+        .str.replace(r'\D', '', regex=True)
+    )
+    digitos = digitos.str.replace(r'^55(?=\d{10,11}$)', '', regex=True)
+    digitos = digitos.str.replace(r'^0(?=\d{10,11}$)', '', regex=True)
+
+    validos = digitos.str.fullmatch(r'\d{10,11}') & ~digitos.str.fullmatch('|'.join(f'{d}+' for d in range(10)))
+    return digitos.where(validos)
+
+
+def _encontrar(pais, no):
+    """Raiz de um nó no union-find, com compressão de caminho"""
+    raiz = no
+    while pais[raiz] != raiz:
+        raiz = pais[raiz]
+    while pais[no] != raiz:
+        pais[no], no = raiz, pais[no]
+    return raiz
+
+
+def resolver_identidades(df):
+    """
+    Atribui um identificador estável a cada aluno
+
+    Variações de nome que compartilham o mesmo telefone normalizado e o
+    mesmo primeiro nome (ex.: "Lucas Dias" e "Lucas Dias Silva") são unidas
+    com union-find. Exigir o primeiro nome evita juntar familiares que usam
+    o mesmo telefone. O ID é o hash da chave de identidade do aluno (a menor
+    chave telefone|primeiro nome ou, sem telefone, o nome sem diferenciar
+    maiúsculas), então não muda quando outros alunos entram ou saem do
+    dataset. Cada aluno recebe como nome de exibição a variação mais
+    frequente.
+
+    Args:
+        df (pd.DataFrame): Dados com as colunas 'Nome', 'Data/hora' e
+            'DDD+TELEFONE (SEM ESPAÇO)'
+
+    Returns:
+        pd.DataFrame: Cópia dos dados com as colunas 'Telefone_Normalizado',
+            'ID_Aluno' (-1 para registros sem nome) e 'Nome_Aluno'
+    """
+    df = df.copy()
+    df['Telefone_Normalizado'] = normalizar_telefones(df['DDD+TELEFONE (SEM ESPAÇO)'])
+
+    codigos_nome, nomes = pd.factorize(df['Nome'])
+    pais = np.arange(len(nomes))
+
+    # Arestas: cada nome ligado ao primeiro nome visto com a mesma chave
+    primeiro_nome = df['Nome'].str.split(n=1).str[0].str.casefold()
+    arestas = pd.DataFrame({
+        'nome': codigos_nome,
+        'chave': df['Telefone_Normalizado'] + '|' + primeiro_nome
+    })
+    arestas = arestas[(arestas['nome'] >= 0) & arestas['chave'].notna()].drop_duplicates()
+    chaves_telefone = arestas.copy()
+    arestas['raiz'] = arestas.groupby('chave')['nome'].transform('first')
+    arestas = arestas[arestas['nome'] != arestas['raiz']]
+
+    for a, b in zip(arestas['nome'].to_numpy(), arestas['raiz'].to_numpy()):
+        raiz_a, raiz_b = _encontrar(pais, a), _encontrar(pais, b)
+        if raiz_a != raiz_b:
+            pais[max(raiz_a, raiz_b)] = min(raiz_a, raiz_b)
+
+    componentes = np.array([_encontrar(pais, no) for no in range(len(nomes))], dtype=np.int64)
+
+    validos = codigos_nome >= 0
+    componente_linha = np.full(len(df), -1, dtype=np.int64)
+    componente_linha[validos] = componentes[codigos_nome[validos]]
+
+    # IDs estáveis: hash da chave de identidade de cada componente
+    # (chaves de telefone têm prioridade sobre o nome)
+    candidatas = pd.concat([
+        pd.DataFrame({
+            'componente': componentes[chaves_telefone['nome'].to_numpy()],
+            'prioridade': 0,
+            'chave': 'telefone:' + chaves_telefone['chave'].to_numpy().astype(object)
+        }),
+        pd.DataFrame({
+            'componente': componentes,
+            'prioridade': 1,
+            'chave': 'nome:' + pd.Series(nomes, dtype=object).astype(str).str.casefold().to_numpy()
+        }),
+    ], ignore_index=True)
+    chave_componente = (
+        candidatas.sort_values(['componente', 'prioridade', 'chave'])
+        .drop_duplicates('componente')
+        .set_index('componente')['chave']
+    )
+    # Os 63 bits mais altos do hash de 64 bits (sem o bit mais baixo), para caber em int64 não negativo
+    id_componente = pd.Series(
+        (pd.util.hash_pandas_object(chave_componente, index=False).to_numpy() >> np.uint64(1)).astype(np.int64),
+        index=chave_componente.index
+    )
+    df['ID_Aluno'] = pd.Series(componente_linha).map(id_componente).fillna(-1).astype(np.int64).to_numpy()
+
+    # Nome de exibição: variação mais frequente (empate: a mais longa)
+    variacoes = df.loc[validos, ['ID_Aluno', 'Nome']].value_counts().reset_index(name='n')
+    variacoes['tamanho'] = variacoes['Nome'].str.len()
+    variacoes = variacoes.sort_values(['ID_Aluno', 'n', 'tamanho'], ascending=[True, False, False])
+    nome_exibicao = variacoes.drop_duplicates('ID_Aluno').set_index('ID_Aluno')['Nome']
+    df['Nome_Aluno'] = df['ID_Aluno'].map(nome_exibicao)
+
+    return df
+
+
+def deduplicar_checkins(df, coluna_aluno='Nome', por_arquivo=False):
+    """
+    Remove check-ins repetidos do mesmo aluno no mesmo dia de aula
+
+    As chaves (aluno, data da aula) são geradas com hash vetorizado e,
+    para cada chave, apenas o registro com o 'Data/hora' mais cedo é
+    mantido, preservando o horário usado na análise de atrasos.
+    Registros sem nome não são agrupados.
+
+    Args:
+        df (pd.DataFrame): Dados com as colunas 'Nome' e 'Data/hora'
+        coluna_aluno (str): Coluna que identifica o aluno ('Nome' é
+            comparado sem diferenciar maiúsculas; use 'ID_Aluno' após
+            resolver_identidades)
+        por_arquivo (bool): Repetições só contam dentro do mesmo 'Arquivo'
+            (o aluno que foi a dois grupos no mesmo dia fica nos dois)
+
+    Returns:
+        tuple: (DataFrame sem duplicatas, quantidade de linhas removidas)
+    """
+    if df.empty:
+        return df, 0
+
+    df_ordenado = df.sort_values('Data/hora', kind='mergesort')
+    nomes = df_ordenado['Nome']
+
+    aluno = df_ordenado[coluna_aluno]
+    if coluna_aluno == 'Nome':
+        aluno = nomes.fillna('').astype(str).str.casefold()
+
+    partes = {
+        'aluno': aluno,
+        'data': df_ordenado['Data/hora'].dt.normalize()
+    }
+    if por_arquivo:
+        partes['arquivo'] = df_ordenado['Arquivo']
+    chaves = pd.util.hash_pandas_object(pd.DataFrame(partes), index=False)
+
+    manter = ~chaves.duplicated().to_numpy() | nomes.isna().to_numpy()
+    removidos = int(len(df_ordenado) - np.count_nonzero(manter))
+
+    return df_ordenado[manter].sort_index(), removidos
+
+
+def preparar_dataset(df):
+    """
+    Resolve identidades e remove check-ins repetidos de um dataset ingerido
+
+    Etapa única e serializável, para rodar em um processo separado.
+
+    Args:
+        df (pd.DataFrame): Dados processados de todos os arquivos
+
+    Returns:
+        tuple: (dados sem duplicatas, check-ins duplicados removidos,
+            quantidade de duplicatas)
+    """
+    df = resolver_identidades(df)
+    df_sem_duplicatas, removidos = deduplicar_checkins(df, 'ID_Aluno')
+    return df_sem_duplicatas, df.loc[df.index.difference(df_sem_duplicatas.index)], removidos
+
+
+def aplicar_correcoes(df, log_correcoes):
+    """
+    Reaplica correções de nome registradas a um novo conjunto de dados
+
+    Usado quando o dataset cresce (ex.: novas linhas no modo ao vivo) sem
+    que as correções já feitas na sessão se percam, e ao aplicar uma nova
+    correção. Como uma correção pode unir dois alunos, os check-ins
+    repetidos no mesmo dia são removidos novamente.
+
+    Args:
+        df (pd.DataFrame): Dados com identidades resolvidas
+        log_correcoes (list): Correções com as chaves 'de' e 'para', na
+            ordem em que foram aplicadas
+
+    Returns:
+        pd.DataFrame: Cópia dos dados com as correções, as identidades
+            recalculadas e sem check-ins repetidos
+    """
+    df = df.copy()
+    if not log_correcoes:
+        return df
+
+    for correcao in log_correcoes:
+        df.loc[df['Nome'] == correcao['de'], 'Nome'] = correcao['para']
+    df, _ = deduplicar_checkins(resolver_identidades(df), 'ID_Aluno')
+    return df
+
+
+def preparar_grupos(df, df_duplicatas, log_correcoes):
+    """
+    Check-ins de cada grupo (arquivo) para a comparação entre grupos
+
+    Parte de todas as linhas ingeridas, inclusive as descartadas como
+    repetidas, reaplica as correções e remove repetições só dentro de cada
+    arquivo, como se cada grupo tivesse sido carregado sozinho.
+
+    Args:
+        df (pd.DataFrame): Dados sem duplicatas (resultado de preparar_dataset)
+        df_duplicatas (pd.DataFrame): Check-ins removidos por preparar_dataset
+        log_correcoes (list): Correções com as chaves 'de' e 'para'
+
+    Returns:
+        pd.DataFrame: Check-ins com no máximo um por aluno, dia e arquivo
+    """
+    if not df_duplicatas.empty:
+        df = pd.concat([df, df_duplicatas], sort=False)
+    df = df.copy()
+    for correcao in log_correcoes:
+        df.loc[df['Nome'] == correcao['de'], 'Nome'] = correcao['para']
+    if log_correcoes:
+        df = resolver_identidades(df)
+    df, _ = deduplicar_checkins(df, 'ID_Aluno', por_arquivo=True)
+    return df
+
+
+def filtrar_checkins(df, inicio=None, fim=None, arquivos=None, alunos=None):
+    """
+    Aplica aos dados em memória os mesmos filtros de consultar_checkins
+
+    Args:
+        df (pd.DataFrame): Check-ins com 'Data', 'Arquivo' e 'ID_Aluno'
+        inicio (date): Data inicial (inclusiva)
+        fim (date): Data final (inclusiva)
+        arquivos (list): Arquivos de origem aceitos (opcional)
+        alunos (list): IDs de aluno ('ID_Aluno') aceitos (opcional)
+
+    Returns:
+        pd.DataFrame: Linhas que passam em todos os filtros
+    """
+    mascara = np.ones(len(df), dtype=bool)
+    if inicio is not None:
+        mascara &= (df['Data'] >= inicio).to_numpy()
+    if fim is not None:
+        mascara &= (df['Data'] <= fim).to_numpy()
+    if arquivos:
+        mascara &= df['Arquivo'].isin(arquivos).to_numpy()
+    if alunos:
+        mascara &= df['ID_Aluno'].isin(alunos).to_numpy()
+    return df[mascara]
@@ -0,0 +1,147 @@
+"""
+Exportação dos dados corrigidos para o Dashboard de Frequência de Alunos
+"""
+
+import gzip
+import importlib.util
+from io import BytesIO, TextIOWrapper
+
+import dashboard_cache
+from dashboard_banco import conectar, consultar_checkins
+from dashboard_tarefas import executar_em_processo
+
+# Formatos oferecidos: rótulo -> (extensão, MIME, pacote opcional necessário)
+FORMATOS_EXPORTACAO = {
+    'CSV': ('csv', 'text/csv', None),
+    'CSV compactado (gzip)': ('csv.gz', 'application/gzip', None),
+    'Parquet': ('parquet', 'application/octet-stream', 'pyarrow'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'openpyxl'),
+}
+
+# Colunas recalculáveis a partir de 'Data/hora' e do telefone, fora da exportação
+COLUNAS_DERIVADAS = ['Data', 'Hora', 'Hora_decimal', 'Telefone_Normalizado']
+
+# Linhas escritas por bloco na exportação CSV
+TAMANHO_BLOCO_CSV = 50_000
+
+
+def formatos_disponiveis():
+    """
+    Lista os formatos de exportação cujas dependências estão instaladas
+
+    Returns:
+        list: Rótulos dos formatos disponíveis
+    """
+    return [
+        rotulo for rotulo, (_, _, pacote) in FORMATOS_EXPORTACAO.items()
+        if pacote is None or importlib.util.find_spec(pacote) is not None
+    ]
+
+
+def _escrever_csv(df, destino):
+    """Escreve o CSV em blocos de linhas, sem montar a string inteira"""
+    texto = TextIOWrapper(destino, encoding='utf-8', newline='')
+    if df.empty:
+        df.to_csv(texto, index=False)
+    for inicio in range(0, len(df), TAMANHO_BLOCO_CSV):
+        df.iloc[inicio:inicio + TAMANHO_BLOCO_CSV].to_csv(texto, index=False, header=inicio == 0)
+    texto.flush()
+    texto.detach()
+
+
+def exportar_dados(df, formato):
+    """
+    Serializa os dados no formato escolhido
+
+    Exporta o DataFrame compacto, sem as colunas derivadas.
+
+    Args:
+        df (pd.DataFrame): Dados corrigidos
+        formato (str): Rótulo de FORMATOS_EXPORTACAO
+
+    Returns:
+        tuple: (conteúdo em bytes, extensão do arquivo, MIME)
+    """
+    extensao, mime, _ = FORMATOS_EXPORTACAO[formato]
+    compacto = df.drop(columns=[col for col in COLUNAS_DERIVADAS if col in df.columns])
+
+    buffer = BytesIO()
+    if extensao == 'csv':
+        _escrever_csv(compacto, buffer)
+    elif extensao == 'csv.gz':
+        with gzip.GzipFile(fileobj=buffer, mode='wb') as arquivo_gzip:
+            _escrever_csv(compacto, arquivo_gzip)
+    elif extensao == 'parquet':
+        compacto.to_parquet(buffer, index=False)
+    else:
+        compacto.to_excel(buffer, index=False)
+
+    return buffer.getvalue(), extensao, mime
+
+
+def exportar_dados_cache(df, formato, chave_dataset, versao_correcoes, sessao=None):
+    """
+    Versão em cache de exportar_dados
+
+    O DataFrame não é hasheado: a entrada do cache de processo (categoria
+    'exportacao') é identificada pela versão do dataset e pela sequência
+    de correções aplicadas, então downloads repetidos não serializam os
+    dados novamente.
+
+    Args:
+        df (pd.DataFrame): Dados corrigidos
+        formato (str): Rótulo de FORMATOS_EXPORTACAO
+        chave_dataset (tuple): Chave dos arquivos carregados
+        versao_correcoes (tuple): Pares (de, para) das correções aplicadas
+        sessao (str): Sessão que pediu a exportação; quando informada, a
+            serialização roda no pool de processos
+
+    Returns:
+        tuple: (conteúdo em bytes, extensão do arquivo, MIME)
+    """
+    chave = ('exportacao', formato, chave_dataset, versao_correcoes)
+    if sessao is None:
+        return dashboard_cache.obter_ou_calcular(chave, exportar_dados, df, formato)
+    return dashboard_cache.obter_ou_calcular(chave, executar_em_processo, sessao, exportar_dados, df, formato)
+
+
+def exportar_banco(caminho, formato):
+    """
+    Lê todo o histórico do banco e o serializa no formato escolhido
+
+    Abre a própria conexão, para rodar em um processo do pool sem que o
+    histórico passe pelo servidor.
+
+    Args:
+        caminho (str): Caminho do arquivo SQLite
+        formato (str): Rótulo de FORMATOS_EXPORTACAO
+
+    Returns:
+        tuple: (conteúdo em bytes, extensão do arquivo, MIME)
+    """
+    conn = conectar(caminho)
+    try:
+        return exportar_dados(consultar_checkins(conn), formato)
+    finally:
+        conn.close()
+
+
+def exportar_banco_cache(caminho, formato, chave_dataset, versao_correcoes, sessao=None):
+    """
+    Versão em cache de exportar_banco, com a mesma chave de exportar_dados_cache
+
+    Args:
+        caminho (str): Caminho do arquivo SQLite
+        formato (str): Rótulo de FORMATOS_EXPORTACAO
+        chave_dataset (tuple): Chave do banco (inclui a versão dos dados)
+        versao_correcoes (tuple): Pares (de, para) das correções aplicadas
+        sessao (str): Sessão que pediu a exportação; quando informada, a
+            leitura e a serialização rodam no pool de processos
+
+    Returns:
+        tuple: (conteúdo em bytes, extensão do arquivo, MIME)
+    """
+    chave = ('exportacao', formato, chave_dataset, versao_correcoes)
+    if sessao is None:
+        return dashboard_cache.obter_ou_calcular(chave, exportar_banco, caminho, formato)
+    return dashboard_cache.obter_ou_calcular(chave, executar_em_processo, sessao, exportar_banco, caminho, formato)
@@ -7,6 +7,9 @@ import numpy as np
 import base64
 from io import BytesIO
 import plotly.io as pio
+import uuid
+import os
+import hashlib
 
 # Importar utilitários (se arquivo existir)
 try:
@@ -70,9 +73,82 @@ except ImportError:
     REQUIRED_COLUMNS = ['Data/hora', 'Nome', 'COMO CONHECEU O GRUPO?', 'PRIMEIRA VEZ NO GRUPO?', 'DDD+TELEFONE (SEM ESPAÇO)']
     CHART_COLORS = {'gradient_colors': ['#FF6B6B', '#FFE66D', '#4ECDC4', '#45B7D1']}
 
+import dashboard_cache
+from dashboard_banco import (
+    CAMINHO_BANCO_PADRAO,
+    aplicar_correcao_banco,
+    buscar_alunos_banco,
+    conectar,
+    consultar_checkins,
+    contar_nomes_banco,
+    dias_aula_banco,
+    duplicatas_removidas_banco,
+    entradas_banco,
+    importar_checkins,
+    listar_alunos_banco,
+    listar_arquivos_banco,
+    log_correcoes_banco,
+    periodo_banco,
+    resetar_correcoes_banco,
+    versao_banco
+)
+from dashboard_analises import (
+    AULAS_AUSENCIA_RISCO,
+    COLUNA_CONVIDOU,
+    FAIXAS_FREQUENCIA,
+    HORA_INICIO_AULA,
+    SEMANAS_RETENCAO,
+    ausentes_ultimas_aulas,
+    calcular_coortes,
+    comparar_grupos,
+    construir_grafo_indicacoes,
+    construir_presencas_bits,
+    consultar_perfis,
+    entradas_alunos,
+    resumo_indicacoes,
+    resumo_presencas_bits,
+    sincronizar_perfis
+)
+from dashboard_dados import aplicar_correcoes, carregar_arquivos, filtrar_checkins, preparar_dataset, preparar_grupos
+from dashboard_graficos import agrupar_contagem_diaria, exibir_grafico
+from dashboard_monitor import (
+    ARQUIVO_MONITOR_PADRAO,
+    INTERVALO_MONITOR_SEGUNDOS,
+    PASTA_MONITOR,
+    atualizar_monitor,
+    chave_monitor,
+    contar_chegadas,
+    criar_monitor,
+    descartadas_monitor,
+    encerrar_contagem,
+    frame_monitor,
+    iniciar_contagem,
+    listar_arquivos_monitor,
+    presencas_por_dia_ao_vivo,
+    resolver_caminho_monitor,
+    resumir_base
+)
+from dashboard_exportacao import exportar_banco_cache, exportar_dados, exportar_dados_cache, formatos_disponiveis
+from dashboard_qualidade import (
+    MAX_PARES_CONFIRMACAO,
+    PROBLEMAS_QUALIDADE,
+    SIMILARIDADE_MINIMA_PARES,
+    pares_acima,
+    pares_similares,
+    perfilar_qualidade,
+)
+from dashboard_relatorio import gerar_relatorio_html
+from dashboard_tabelas import exibir_tabela_paginada
+from dashboard_tarefas import TarefaInterrompida, calcular_em_processo, estado_tarefas, executar_em_processo
+
 # Configuração da página
 st.set_page_config(**DASHBOARD_CONFIG)
 
+# Identificador da sessão, usado no limite de tarefas simultâneas do pool de processos
+if 'id_sessao' not in st.session_state:
+    st.session_state.id_sessao = uuid.uuid4().hex
+id_sessao = st.session_state.id_sessao
+
 # Carregar CSS externo
 load_css("styles.css")
 
@@ -83,12 +159,16 @@ st.markdown(create_header(
 ), unsafe_allow_html=True)
 
 # Tabs principais para navegação
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
     "📊 Visão Geral", 
     "🔍 Análise Detalhada", 
     "👥 Busca por Alunos", 
     "📈 Relatórios",
-    "🧹 Qualidade dos Dados"
+    "🧹 Qualidade dos Dados",
+    "🔁 Retenção",
+    "🌱 Indicações",
+    "🚨 Em Risco",
+    "⚖️ Comparar Grupos"
 ])
 
 # Sidebar interativa
@@ -100,82 +180,302 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
     
-    uploaded_file = st.file_uploader(
-        "📁 Escolha o arquivo CSV",
+    uploaded_files = st.file_uploader(
+        "📁 Escolha os arquivos CSV",
         type=['csv'],
-        help="Faça upload do arquivo CSV com os dados de frequência"
+        accept_multiple_files=True,
+        help="Faça upload de um ou mais arquivos CSV com os dados de frequência (ex.: um por semestre ou grupo)"
+    )
+    
+    # O histórico em SQLite é um só no servidor (todas as sessões o leem e corrigem),
+    # então só aparece com o token de administrador configurado e informado
+    usar_banco = False
+    if dashboard_cache.TOKEN_ADMIN_CACHE:
+        usar_banco = st.checkbox(
+            "💾 Guardar histórico em SQLite",
+            value=False,
+            help="Grava os check-ins e as correções em um banco no servidor, compartilhado entre as sessões, "
+                 "e consulta os filtros por índices. Exige o token de administrador."
+        )
+        if usar_banco:
+            token_banco = st.text_input("🔑 Token de administrador:", type="password", key="token_admin_banco")
+            if not dashboard_cache.autorizar_admin(token_banco):
+                if token_banco:
+                    st.error("❌ Token inválido.")
+                usar_banco = False
+    
+    monitor_ativo = st.checkbox(
+        "📡 Modo ao vivo",
+        value=False,
+        help="Acompanha um CSV local que recebe check-ins durante a aula, lendo só as linhas novas"
     )
+    if monitor_ativo:
+        # Só os CSV da pasta configurada no servidor podem ser escolhidos
+        arquivos_monitor = listar_arquivos_monitor()
+        arquivo_monitor = None
+        if arquivos_monitor:
+            arquivo_monitor = st.selectbox(
+                "📄 Arquivo monitorado:",
+                arquivos_monitor,
+                index=arquivos_monitor.index(ARQUIVO_MONITOR_PADRAO) if ARQUIVO_MONITOR_PADRAO in arquivos_monitor else 0,
+                help=f"CSV da pasta {PASTA_MONITOR} no servidor"
+            )
+        else:
+            st.warning(f"⚠️ Nenhum CSV na pasta monitorada ({PASTA_MONITOR}).")
+        intervalo_monitor = st.slider(
+            "⏱️ Atualizar a cada (s):",
+            min_value=2,
+            max_value=60,
+            value=INTERVALO_MONITOR_SEGUNDOS
+        )
+    
+    inicio_aula = st.time_input(
+        "🕖 Início da aula:",
+        value=time(int(HORA_INICIO_AULA), round(HORA_INICIO_AULA % 1 * 60)),
+        step=300,
+        help="Check-ins depois deste horário contam como atraso nos perfis dos alunos"
+    )
+    hora_inicio_aula = inicio_aula.hour + inicio_aula.minute / 60
 
-if uploaded_file is not None:
+# Modo ao vivo: o estado de leitura fica na sessão e só os bytes novos são lidos
+estado_monitor = None
+if monitor_ativo and arquivo_monitor is not None:
     try:
-        # Verificar se o arquivo não está vazio
-        if uploaded_file.size == 0:
-            st.error("❌ O arquivo está vazio. Por favor, faça upload de um arquivo CSV válido.")
-            st.stop()
+        caminho_monitor = resolver_caminho_monitor(arquivo_monitor)
+    except ValueError as e:
+        st.sidebar.error(f"❌ {e}")
+    else:
+        if st.session_state.get('monitor', {}).get('caminho') != caminho_monitor:
+            st.session_state.monitor = criar_monitor(caminho_monitor)
+        estado_monitor = st.session_state.monitor
+        atualizar_monitor(estado_monitor)
+
+
+def acompanhar_monitor():
+    """
+    Lê as linhas novas do arquivo monitorado e mostra o status da leitura
+    
+    Roda como fragmento na barra lateral: a cada intervalo só o status é
+    refeito. A página só é recarregada quando chegam os primeiros check-ins
+    (antes deles não há dados para exibir); depois, os cards e a linha do
+    tempo somam as chegadas nos próprios fragmentos e as demais abas passam
+    a incluí-las na próxima execução completa.
+    """
+    if atualizar_monitor(estado_monitor) and st.session_state.get('aguardando_ao_vivo'):
+        st.rerun()
+    
+    if estado_monitor['erro']:
+        st.warning(f"⚠️ {estado_monitor['erro']}")
+    
+    chegada = ""
+    if estado_monitor['recebido_em'] is not None:
+        chegada = (
+            f" · última chegada: +{estado_monitor['linhas_novas']} check-ins às "
+            f"{datetime.fromtimestamp(estado_monitor['recebido_em']).strftime('%H:%M:%S')}"
+        )
+    st.caption(
+        f"📡 Ao vivo: {os.path.basename(estado_monitor['caminho'])} · lido às "
+        f"{datetime.fromtimestamp(estado_monitor['lido_em']).strftime('%H:%M:%S')}{chegada}"
+    )
+
+
+def exibir_cards(total_presencas, total_alunos, total_dias):
+    """Cards de métricas principais da visão geral"""
+    media_presencas = total_presencas / total_dias if total_dias > 0 else 0
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(create_metric_card(total_presencas, "Total de Presenças"), unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(create_metric_card(total_alunos, "Total de Alunos"), unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(create_metric_card(total_dias, "Dias de Aula"), unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(create_metric_card(f"{media_presencas:.1f}", "Média Presenças/Dia"), unsafe_allow_html=True)
+
+
+def exibir_evolucao(presencas_por_dia):
+    """Linha do tempo das presenças, agrupada por dia, semana ou mês conforme o período"""
+    presencas_por_data, granularidade, serie_reduzida = agrupar_contagem_diaria(presencas_por_dia)
+    
+    fig_timeline = px.area(
+        presencas_por_data,
+        x='Data',
+        y='Presenças',
+        title=f"Tendência de Presenças (por {granularidade}{', amostrada' if serie_reduzida else ''})",
+        color_discrete_sequence=['#667eea']
+    )
+    fig_timeline.update_layout(
+        height=400,
+        showlegend=False,
+        title_font_size=16
+    )
+    exibir_grafico(fig_timeline, "evolucao_temporal")
+
+
+def contar_ao_vivo():
+    """Lê o arquivo monitorado e soma as chegadas às contagens da última execução completa"""
+    atualizar_monitor(estado_monitor)
+    if estado_monitor['contagem'] is None:
+        # O arquivo foi substituído: as contagens da base não valem mais
+        st.rerun()
+    return contar_chegadas(estado_monitor)
+
+
+def cards_ao_vivo(total_alunos):
+    """Cards da visão geral com os check-ins que chegaram desde a última execução completa"""
+    contagem = contar_ao_vivo()
+    presencas_por_dia = presencas_por_dia_ao_vivo(contagem)
+    exibir_cards(int(presencas_por_dia.sum()), total_alunos + len(contagem['novos_alunos']), len(presencas_por_dia))
+
+
+def evolucao_ao_vivo():
+    """Linha do tempo com os check-ins que chegaram desde a última execução completa"""
+    exibir_evolucao(presencas_por_dia_ao_vivo(contar_ao_vivo()))
+
+
+if estado_monitor is not None:
+    with st.sidebar:
+        st.fragment(run_every=intervalo_monitor)(acompanhar_monitor)()
+
+# Banco local opcional: o histórico gravado vira o dataset do dashboard
+# (caminho fixo no servidor; uma conexão por sessão, fechada ao desmarcar)
+if usar_banco:
+    if st.session_state.get('conn_banco') is None:
+        st.session_state.conn_banco = conectar(CAMINHO_BANCO_PADRAO)
+    conn_banco = st.session_state.conn_banco
+else:
+    if st.session_state.get('conn_banco') is not None:
+        st.session_state.conn_banco.close()
+        st.session_state.conn_banco = None
+    conn_banco = None
+tem_historico = conn_banco is not None and versao_banco(conn_banco) > 0
+
+if uploaded_files or tem_historico or estado_monitor is not None:
+    try:
+        df, chave_dataset, duplicatas_removidas = None, (), 0
+        df_descartadas, df_duplicatas = pd.DataFrame(), pd.DataFrame()
         
-        # Ler o arquivo com diferentes encodings
-        try:
-            uploaded_file.seek(0)
-            df = pd.read_csv(uploaded_file, encoding='utf-8')
-        except UnicodeDecodeError:
-            try:
-                uploaded_file.seek(0)
-                df = pd.read_csv(uploaded_file, encoding='latin-1')
-                st.info("ℹ️ Arquivo lido com encoding latin-1")
-            except UnicodeDecodeError:
-                try:
-                    uploaded_file.seek(0)
-                    df = pd.read_csv(uploaded_file, encoding='cp1252')
-                    st.info("ℹ️ Arquivo lido com encoding cp1252")
-                except:
-                    st.error("❌ Erro de encoding. Tente salvar o arquivo como CSV UTF-8.")
-                    st.stop()
-        except pd.errors.EmptyDataError:
-            st.error("❌ O arquivo CSV está vazio ou mal formatado.")
-            st.stop()
-        except pd.errors.ParserError as e:
-            st.error(f"❌ Erro ao analisar o arquivo CSV: {str(e)}")
-            st.stop()
+        if uploaded_files:
+            # Ignorar arquivos vazios
+            arquivos_validos = []
+            for uploaded_file in uploaded_files:
+                if uploaded_file.size == 0:
+                    st.error(f"❌ {uploaded_file.name}: o arquivo está vazio.")
+                else:
+                    arquivos_validos.append((uploaded_file.name, uploaded_file.getvalue()))
+            
+            # Ler, validar e limpar os arquivos (com cache por arquivo)
+            df, chave_dataset, avisos_arquivos, erros_arquivos, df_descartadas = carregar_arquivos(arquivos_validos)
+            
+            for nome_arquivo, aviso in avisos_arquivos.items():
+                st.info(f"ℹ️ {nome_arquivo}: {aviso}")
+            
+            for nome_arquivo, erro in erros_arquivos.items():
+                st.error(f"❌ {nome_arquivo}: {erro}")
         
-        # Verificar se o DataFrame foi criado e não está vazio
-        if df is None or df.empty:
-            st.error("❌ O arquivo não contém dados válidos.")
-            st.stop()
+        chave_base = chave_dataset
         
-        # Verificando colunas obrigatórias
-        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        # Linhas já lidas do arquivo monitorado entram como mais um arquivo (só em memória)
+        if estado_monitor is not None and conn_banco is None:
+            df_ao_vivo = frame_monitor(estado_monitor)
+            if not df_ao_vivo.empty:
+                df = df_ao_vivo if df is None else pd.concat([df, df_ao_vivo], ignore_index=True, sort=False)
+                chave_dataset = chave_dataset + (chave_monitor(estado_monitor),)
+            
+            descartadas_ao_vivo = descartadas_monitor(estado_monitor)
+            if not descartadas_ao_vivo.empty:
+                df_descartadas = pd.concat(
+                    [frame for frame in (df_descartadas, descartadas_ao_vivo) if not frame.empty],
+                    ignore_index=True, sort=False
+                )
         
-        if missing_columns:
-            st.error(f"❌ Colunas obrigatórias ausentes: {missing_columns}")
+        # Verificar se algum arquivo gerou dados válidos
+        if (df is None or df.empty) and not tem_historico:
+            if estado_monitor is None:
+                st.error("❌ Nenhum arquivo contém dados válidos.")
+            else:
+                # O fragmento da barra lateral recarrega a página quando chegarem linhas
+                st.session_state.aguardando_ao_vivo = True
+                st.info(f"📡 Aguardando check-ins em {os.path.basename(estado_monitor['caminho'])}...")
             st.stop()
+        st.session_state.aguardando_ao_vivo = False
+        
+        # Arquivos desta sessão (com o monitor); define as linhas descartadas e duplicadas
+        chave_sessao = chave_dataset
+        
+        if df is not None and not df.empty:
+            # Unir variações de nome pelo telefone, atribuir ID a cada aluno e remover
+            # check-ins repetidos no mesmo dia (em um processo do pool, uma vez por dataset)
+            df, df_duplicatas, duplicatas_removidas = calcular_em_processo(
+                ('dataset', chave_dataset), id_sessao, "🧩 Identificando alunos...",
+                preparar_dataset, df
+            )
+            
+            if conn_banco is not None:
+                importar_checkins(conn_banco, df, chave_dataset, df_duplicatas)
         
-        # Processamento dos dados
-        df['Data/hora'] = pd.to_datetime(df['Data/hora'], errors='coerce')
-        df['Data'] = df['Data/hora'].dt.date
-        df['Hora'] = df['Data/hora'].dt.time
-        df['Hora_decimal'] = df['Data/hora'].dt.hour + df['Data/hora'].dt.minute/60
-        df = df.dropna(subset=['Data/hora'])
+        if conn_banco is not None:
+            # O histórico fica no banco: só o recorte dos filtros é consultado e carregado
+            chave_dataset = ('sqlite', CAMINHO_BANCO_PADRAO, versao_banco(conn_banco))
+            df = None
+            duplicatas_removidas = duplicatas_removidas_banco(conn_banco)
+            chave_base = chave_dataset
         
-        # Limpeza de nomes
-        df['Nome_Original'] = df['Nome'].copy()
-        df['Nome'] = df['Nome'].apply(limpar_nome)
+        # Inicializar session state (reinicia ao mudar o conjunto de arquivos;
+        # linhas novas do arquivo monitorado mantêm as correções da sessão)
+        if st.session_state.get('chave_dataset') != chave_dataset:
+            if st.session_state.get('chave_base') != chave_base:
+                st.session_state.log_correcoes = []
+            st.session_state.chave_dataset = chave_dataset
+            st.session_state.chave_base = chave_base
+            st.session_state.df_corrigido = None if df is None else aplicar_correcoes(df, st.session_state.log_correcoes)
         
-        # Inicializar session state
-        if 'df_corrigido' not in st.session_state:
-            st.session_state.df_corrigido = df.copy()
+        if conn_banco is not None:
+            st.session_state.log_correcoes = log_correcoes_banco(conn_banco)
         
-        # Usar dados corrigidos
-        df_working = st.session_state.df_corrigido.copy()
+        # Versão dos dados (arquivos + correções aplicadas), usada nas chaves de cache
+        versao_dados = (chave_dataset, tuple((c['de'], c['para']) for c in st.session_state.log_correcoes))
+        
+        # Usar dados corrigidos (no banco, os dados em uso são o recorte filtrado, definido abaixo)
+        df_working = st.session_state.df_corrigido.copy() if conn_banco is None else None
         
         # Sidebar - Filtros interativos
         with st.sidebar:
             st.markdown("### 🔍 Filtros Avançados")
             
+            # Filtro por arquivo de origem
+            if conn_banco is not None:
+                arquivos_carregados = listar_arquivos_banco(conn_banco)
+            else:
+                # Todos os arquivos da sessão, mesmo os que só repetem check-ins de outro
+                arquivos_carregados = sorted({nome_arquivo for nome_arquivo, _ in chave_dataset})
+            
+            arquivos_selecionados = None
+            if len(arquivos_carregados) > 1:
+                arquivos_escolhidos = st.multiselect(
+                    "📂 Arquivos:",
+                    options=arquivos_carregados,
+                    default=arquivos_carregados
+                )
+                if arquivos_escolhidos and len(arquivos_escolhidos) < len(arquivos_carregados):
+                    arquivos_selecionados = arquivos_escolhidos
+            
             # Filtro de período
-            if not df_working.empty:
-                min_date = df_working['Data'].min()
-                max_date = df_working['Data'].max()
-                
+            if conn_banco is not None:
+                min_date, max_date = periodo_banco(conn_banco, arquivos_selecionados)
+            else:
+                df_arquivos = df_working
+                if arquivos_selecionados:
+                    df_arquivos = df_working[df_working['Arquivo'].isin(arquivos_selecionados)]
+                min_date = df_arquivos['Data'].min() if not df_arquivos.empty else None
+                max_date = df_arquivos['Data'].max() if not df_arquivos.empty else None
+            
+            start_date, end_date = None, None
+            if min_date is not None:
                 date_range = st.date_input(
                     "📅 Período:",
                     value=(min_date, max_date),
@@ -185,26 +485,69 @@ if uploaded_file is not None:
                 
                 if len(date_range) == 2:
                     start_date, end_date = date_range
-                    df_filtered = df_working[(df_working['Data'] >= start_date) & (df_working['Data'] <= end_date)]
-                else:
-                    df_filtered = df_working
+            
+            # Filtro por aluno (por ID; nomes de exibição repetidos recebem o final do ID)
+            if conn_banco is not None:
+                alunos = listar_alunos_banco(conn_banco, start_date, end_date, arquivos_selecionados)
             else:
-                df_filtered = df_working
+                df_filtered = df_arquivos
+                if start_date is not None:
+                    df_filtered = df_arquivos[(df_arquivos['Data'] >= start_date) & (df_arquivos['Data'] <= end_date)]
+                # Período e arquivos, antes do filtro de alunos (define o calendário de aulas)
+                df_periodo = df_filtered
+                alunos = (
+                    df_filtered.loc[df_filtered['ID_Aluno'] >= 0, ['ID_Aluno', 'Nome_Aluno']]
+                    .drop_duplicates('ID_Aluno')
+                    .sort_values(['Nome_Aluno', 'ID_Aluno'])
+                )
             
-            # Filtro por aluno
-            alunos = sorted(df_filtered['Nome'].unique())
+            nomes_alunos = dict(zip(alunos['ID_Aluno'], alunos['Nome_Aluno']))
+            nomes_repetidos = set(alunos.loc[alunos['Nome_Aluno'].duplicated(), 'Nome_Aluno'])
             selected_alunos = st.multiselect(
                 "👥 Selecionar Alunos:",
-                options=alunos,
-                default=alunos
+                options=list(nomes_alunos),
+                default=list(nomes_alunos),
+                format_func=lambda id_aluno: (
+                    f"{nomes_alunos[id_aluno]} (#{id_aluno % 10000:04d})"
+                    if nomes_alunos[id_aluno] in nomes_repetidos else nomes_alunos[id_aluno]
+                )
             )
+            alunos_filtro = selected_alunos if selected_alunos and len(selected_alunos) < len(nomes_alunos) else None
             
-            if selected_alunos:
-                df_filtered = df_filtered[df_filtered['Nome'].isin(selected_alunos)]
+            filtros_ativos = (start_date, end_date, arquivos_selecionados, alunos_filtro)
+            
+            if conn_banco is not None:
+                # Consulta indexada por data, arquivo e ID do aluno
+                df_filtered = dashboard_cache.obter_ou_calcular(
+                    ('consulta', chave_dataset, repr(filtros_ativos)),
+                    consultar_checkins, conn_banco, *filtros_ativos
+                )
+                df_working = df_filtered
+            elif alunos_filtro:
+                df_filtered = df_filtered[df_filtered['ID_Aluno'].isin(alunos_filtro)]
+            
+            # Calendário de aulas do período e dos arquivos; o filtro de alunos não remove dias
+            if conn_banco is not None:
+                dias_aula = dashboard_cache.obter_ou_calcular(
+                    ('dias_aula', chave_dataset, repr(filtros_ativos[:3])),
+                    dias_aula_banco, conn_banco, *filtros_ativos[:3]
+                )
+            else:
+                dias_aula = df_periodo['Data']
+            
+            # Presenças por nome em todo o dataset (no banco, agregadas por SQL)
+            if conn_banco is not None:
+                contagem_nomes = dashboard_cache.obter_ou_calcular(
+                    ('nomes', versao_dados), contar_nomes_banco, conn_banco
+                )
+            else:
+                contagem_nomes = dashboard_cache.obter_ou_calcular(
+                    ('nomes', versao_dados), df_working['Nome'].value_counts
+                )
             
             # Métricas em tempo real
             total_presencas = len(df_filtered)
-            total_alunos = df_filtered['Nome'].nunique()
+            total_alunos = df_filtered.loc[df_filtered['ID_Aluno'] >= 0, 'ID_Aluno'].nunique()
             total_dias = df_filtered['Data'].nunique()
             media_presencas = total_presencas / total_dias if total_dias > 0 else 0
             
@@ -213,32 +556,48 @@ if uploaded_file is not None:
             st.metric("👥 Alunos", total_alunos)
             st.metric("📅 Dias", total_dias)
             st.metric("⚡ Média/Dia", f"{media_presencas:.1f}")
+        
+        # Modo ao vivo em memória: até a próxima execução completa, as chegadas são
+        # somadas às contagens desta (o dataset e as análises não são recalculados)
+        contagem_ao_vivo = False
+        if estado_monitor is not None:
+            arquivo_ao_vivo = os.path.basename(estado_monitor['caminho'])
+            if conn_banco is None and (arquivos_selecionados is None or arquivo_ao_vivo in arquivos_selecionados):
+                base_ao_vivo = dashboard_cache.obter_ou_calcular(
+                    ('base_ao_vivo', versao_dados, repr(filtros_ativos)), resumir_base, df_filtered
+                )
+                # No fim do período exibido, os dias seguintes também são contados
+                iniciar_contagem(
+                    estado_monitor, base_ao_vivo, versao_dados[1],
+                    inicio=start_date,
+                    fim=None if end_date == max_date else end_date,
+                    so_alunos_da_base=alunos_filtro is not None
+                )
+                contagem_ao_vivo = True
+            else:
+                encerrar_contagem(estado_monitor)
 
         # TAB 1: VISÃO GERAL
         with tab1:
             st.markdown('<div class="animated-content">', unsafe_allow_html=True)
             
-            # Cards de métricas principais
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.markdown(create_metric_card(total_presencas, "Total de Presenças"), unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(create_metric_card(total_alunos, "Total de Alunos"), unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(create_metric_card(total_dias, "Dias de Aula"), unsafe_allow_html=True)
-            
-            with col4:
-                st.markdown(create_metric_card(f"{media_presencas:.1f}", "Média Presenças/Dia"), unsafe_allow_html=True)
+            # Cards de métricas principais (no modo ao vivo, refeitos a cada leitura do arquivo)
+            if contagem_ao_vivo:
+                st.fragment(run_every=intervalo_monitor)(cards_ao_vivo)(total_alunos)
+            else:
+                exibir_cards(total_presencas, total_alunos, total_dias)
             
             # Gráficos interativos lado a lado
             col1, col2 = st.columns(2)
             
             with col1:
                 # Top 15 alunos
-                presencas_por_aluno = df_filtered.groupby('Nome').size().reset_index(name='Presenças')
+                presencas_por_aluno = (
+                    df_filtered[df_filtered['ID_Aluno'] >= 0]
+                    .groupby('ID_Aluno')
+                    .agg(Nome=('Nome_Aluno', 'first'), Presenças=('Data', 'size'))
+                    .reset_index(drop=True)
+                )
                 presencas_por_aluno = presencas_por_aluno.sort_values('Presenças', ascending=False)
                 
                 if total_dias > 0:
@@ -263,12 +622,12 @@ if uploaded_file is not None:
                     font=dict(size=12)
                 )
                 fig_top.update_traces(textposition='outside')
-                st.plotly_chart(fig_top, use_container_width=True, key=get_unique_chart_key("top_alunos"))
+                exibir_grafico(fig_top, "top_alunos")
             
             with col2:
                 # Distribuição por faixa de frequência
                 if total_dias > 0:
-                    freq_ranges = ['0-25%', '26-50%', '51-75%', '76-100%']
+                    freq_ranges = FAIXAS_FREQUENCIA
                     freq_counts = [
                         len(presencas_por_aluno[(presencas_por_aluno['Frequência (%)'] >= 0) & (presencas_por_aluno['Frequência (%)'] <= 25)]),
                         len(presencas_por_aluno[(presencas_por_aluno['Frequência (%)'] > 25) & (presencas_por_aluno['Frequência (%)'] <= 50)]),
@@ -290,26 +649,16 @@ if uploaded_file is not None:
                         font=dict(size=12)
                     )
                     fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-                    st.plotly_chart(fig_pie, use_container_width=True, key=get_unique_chart_key("distribuicao_frequencia"))
+                    exibir_grafico(fig_pie, "distribuicao_frequencia")
             
             # Gráfico de evolução temporal
             st.subheader("📈 Evolução das Presenças ao Longo do Tempo")
             
-            presencas_por_data = df_filtered.groupby('Data').size().reset_index(name='Presenças')
-            
-            fig_timeline = px.area(
-                presencas_por_data,
-                x='Data',
-                y='Presenças',
-                title="Tendência de Presenças",
-                color_discrete_sequence=['#667eea']
-            )
-            fig_timeline.update_layout(
-                height=400,
-                showlegend=False,
-                title_font_size=16
-            )
-            st.plotly_chart(fig_timeline, use_container_width=True, key=get_unique_chart_key("evolucao_temporal"))
+            # Agrupa por dia, semana ou mês conforme o período e limita os pontos enviados
+            if contagem_ao_vivo:
+                st.fragment(run_every=intervalo_monitor)(evolucao_ao_vivo)()
+            else:
+                exibir_evolucao(df_filtered.groupby('Data').size())
             
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -373,11 +722,7 @@ if uploaded_file is not None:
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    st.dataframe(
-                        dados_filtrados.reset_index(drop=True),
-                        use_container_width=True,
-                        height=400
-                    )
+                    exibir_tabela_paginada(dados_filtrados, "tabela_filtros", coluna_filtro='Nome')
                 
                 with col2:
                     # Gráfico dinâmico baseado nos filtros
@@ -396,7 +741,7 @@ if uploaded_file is not None:
                         title_font_size=14
                     )
                     fig_filtered.update_traces(textposition='outside')
-                    st.plotly_chart(fig_filtered, use_container_width=True, key=get_unique_chart_key("dados_filtrados"))
+                    exibir_grafico(fig_filtered, "dados_filtrados")
             
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -414,7 +759,7 @@ if uploaded_file is not None:
                     help="Digite qualquer parte do nome para buscar"
                 )
                 
-                nomes_disponveis = sorted(df_filtered['Nome'].unique())
+                nomes_disponveis = sorted(df_filtered['Nome_Aluno'].dropna().unique())
                 nomes_selecionados = st.multiselect(
                     "📋 Ou selecione nomes específicos:",
                     options=nomes_disponveis
@@ -427,56 +772,97 @@ if uploaded_file is not None:
                 mostrar_primeira_vez = st.checkbox("✨ Primeira vez", value=False)
                 agrupar_por_data = st.checkbox("📅 Agrupar por data", value=False)
             
+            # Perfis por aluno dos dados filtrados: construídos uma vez por dataset e filtros
+            # e estendidos só com as linhas novas
+            chave_perfis = ('perfis', versao_dados, repr(filtros_ativos), hora_inicio_aula)
+            perfis_alunos = dashboard_cache.obter(chave_perfis)
+            if perfis_alunos is None:
+                perfis_alunos = dashboard_cache.guardar(
+                    chave_perfis,
+                    sincronizar_perfis(
+                        st.session_state.get('perfis_alunos'), df_filtered,
+                        base=(chave_base, versao_dados[1]) + chave_perfis[2:], dias=dias_aula,
+                        hora_inicio=hora_inicio_aula
+                    )
+                )
+            st.session_state.perfis_alunos = perfis_alunos
+            
             # Aplicar busca
             if busca_nomes or nomes_selecionados:
-                if busca_nomes:
-                    mask_busca = df_filtered['Nome'].str.contains(busca_nomes, case=False, na=False)
-                    dados_busca = df_filtered[mask_busca]
-                else:
-                    dados_busca = df_filtered
+                ids_busca = None
+                if busca_nomes and conn_banco is not None:
+                    # No banco, consulta pelo índice de nomes
+                    ids_busca = dashboard_cache.obter_ou_calcular(
+                        ('busca', chave_dataset, repr(filtros_ativos), busca_nomes),
+                        buscar_alunos_banco, conn_banco, busca_nomes, *filtros_ativos
+                    )
+                elif busca_nomes:
+                    # Trecho literal, sem diferenciar maiúsculas (mesma regra com e sem banco)
+                    dados_busca = df_filtered[
+                        df_filtered['Nome'].str.contains(busca_nomes, case=False, na=False, regex=False)
+                    ]
+                    ids_busca = set(dados_busca.loc[dados_busca['ID_Aluno'] >= 0, 'ID_Aluno'])
                 
+                ids_selecionados = ids_busca
                 if nomes_selecionados:
-                    dados_busca = dados_busca[dados_busca['Nome'].isin(nomes_selecionados)]
+                    ids_nomes = set().union(*(perfis_alunos['ids_por_nome'].get(nome, ()) for nome in nomes_selecionados))
+                    ids_selecionados = ids_nomes if ids_busca is None else ids_nomes & ids_busca
+                
+                freq_selecionados = consultar_perfis(perfis_alunos, sorted(ids_selecionados))
                 
-                if not dados_busca.empty:
+                if not freq_selecionados.empty:
                     st.markdown(create_alert_box(
-                        f"🎯 Encontrados <strong>{len(dados_busca)} registros</strong> para <strong>{dados_busca['Nome'].nunique()} alunos</strong>",
+                        f"🎯 Encontrados <strong>{len(freq_selecionados)} alunos</strong> com <strong>{freq_selecionados['Presenças'].sum()} presenças</strong> no período",
                         "success"
                     ), unsafe_allow_html=True)
                     
-                    # Análise específica
-                    freq_selecionados = dados_busca.groupby('Nome').agg({
-                        'Data': 'count',
-                        'DDD+TELEFONE (SEM ESPAÇO)': 'first'
-                    }).reset_index()
-                    freq_selecionados.columns = ['Nome', 'Quantidade_Presenças', 'Telefone']
-                    freq_selecionados['Frequência_Período (%)'] = (
-                        freq_selecionados['Quantidade_Presenças'] / total_dias * 100
-                    ).round(1) if total_dias > 0 else 0
+                    colunas_perfil = ['Nome', 'Presenças', 'Frequência (%)', 'Primeira Visita', 'Última Visita',
+                                      'Atrasos (%)', 'Atraso Médio (min)', 'Presenças por Mês']
+                    if mostrar_telefone:
+                        colunas_perfil.insert(2, 'Telefone')
+                    
+                    st.subheader("📊 Perfil dos Alunos Selecionados")
+                    exibir_tabela_paginada(
+                        freq_selecionados[colunas_perfil],
+                        "tabela_busca",
+                        coluna_filtro='Nome',
+                        column_config={
+                            'Presenças por Mês': st.column_config.LineChartColumn("📈 Presenças por Mês", y_min=0)
+                        }
+                    )
                     
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        st.subheader("📊 Resumo dos Alunos Selecionados")
-                        if mostrar_telefone:
-                            st.dataframe(freq_selecionados, use_container_width=True)
-                        else:
-                            st.dataframe(freq_selecionados[['Nome', 'Quantidade_Presenças', 'Frequência_Período (%)']], use_container_width=True)
+                        fig_busca = px.bar(
+                            freq_selecionados.head(50),
+                            x='Nome',
+                            y='Presenças',
+                            title="📈 Presenças dos Alunos Selecionados",
+                            color='Frequência (%)',
+                            color_continuous_scale='Turbo',
+                            text='Presenças'
+                        )
+                        fig_busca.update_layout(xaxis_tickangle=45)
+                        fig_busca.update_traces(textposition='outside')
+                        exibir_grafico(fig_busca, "busca_alunos")
                     
                     with col2:
-                        if len(freq_selecionados) > 0:
-                            fig_busca = px.bar(
-                                freq_selecionados,
-                                x='Nome',
-                                y='Quantidade_Presenças',
-                                title="📈 Presenças dos Alunos Selecionados",
-                                color='Frequência_Período (%)',
-                                color_continuous_scale='Turbo',
-                                text='Quantidade_Presenças'
-                            )
-                            fig_busca.update_layout(xaxis_tickangle=45)
-                            fig_busca.update_traces(textposition='outside')
-                            st.plotly_chart(fig_busca, use_container_width=True, key=get_unique_chart_key("busca_alunos"))
+                        # Histórico mensal a partir das sparklines dos perfis
+                        historico = freq_selecionados.head(10)[['Nome', 'Presenças por Mês']]
+                        historico = historico.explode('Presenças por Mês').assign(
+                            Mês=np.tile([str(mes) for mes in perfis_alunos['meses']], len(historico))
+                        )
+                        fig_historico = px.line(
+                            historico,
+                            x='Mês',
+                            y='Presenças por Mês',
+                            color='Nome',
+                            markers=True,
+                            title="🗓️ Histórico Mensal de Presenças"
+                        )
+                        fig_historico.update_layout(yaxis_title="Presenças")
+                        exibir_grafico(fig_historico, "historico_alunos")
                 
                 else:
                     st.markdown(create_alert_box(
@@ -492,6 +878,16 @@ if uploaded_file is not None:
             
             st.markdown("</div>", unsafe_allow_html=True)
 
+        # Vetores de presença por aluno (bits por dia de aula), usados no relatório e no painel de risco
+        presencas_bits = dashboard_cache.obter_ou_calcular(
+            ('presencas_bits', versao_dados, repr(filtros_ativos)),
+            construir_presencas_bits, df_filtered, dias_aula
+        )
+        resumo_presencas = dashboard_cache.obter_ou_calcular(
+            ('resumo_presencas', versao_dados, repr(filtros_ativos)),
+            resumo_presencas_bits, presencas_bits
+        )
+        
         # TAB 4: RELATÓRIOS
         with tab4:
             st.markdown('<div class="animated-content">', unsafe_allow_html=True)
@@ -531,70 +927,63 @@ if uploaded_file is not None:
                     
                     responsavel = st.text_input("👤 Responsável:", value="", help="Nome do responsável pelo relatório")
                     top_n = st.number_input("🔢 Quantidade no Top:", min_value=5, max_value=50, value=10)
+                    aulas_ausencia_relatorio = st.number_input(
+                        "🚨 Aulas seguidas de ausência:",
+                        min_value=1,
+                        max_value=max(1, total_dias),
+                        value=min(AULAS_AUSENCIA_RISCO, max(1, total_dias)),
+                        help="Alunos sem presença nas últimas aulas entram na seção de baixa frequência"
+                    )
                     
                     periodo_texto = f"{data_inicio_relatorio.strftime('%d/%m/%Y')} a {data_fim_relatorio.strftime('%d/%m/%Y')}"
             
+            # Tabela completa paginada (apenas a página visível é enviada)
+            if incluir_tabela_completa:
+                st.markdown("**📋 Tabela Completa**")
+                if conn_banco is not None and start_date is not None:
+                    # No banco, o período do relatório (dentro do período filtrado) é uma consulta por data
+                    filtros_relatorio = (
+                        max(start_date, data_inicio_relatorio), min(end_date, data_fim_relatorio)
+                    ) + filtros_ativos[2:]
+                    dados_periodo = dashboard_cache.obter_ou_calcular(
+                        ('consulta', chave_dataset, repr(filtros_relatorio)),
+                        consultar_checkins, conn_banco, *filtros_relatorio
+                    )
+                else:
+                    dados_periodo = df_filtered[
+                        (df_filtered['Data'] >= data_inicio_relatorio) & (df_filtered['Data'] <= data_fim_relatorio)
+                    ]
+                exibir_tabela_paginada(dados_periodo[REQUIRED_COLUMNS + ['Arquivo']], "tabela_completa", coluna_filtro='Nome')
+            
             if st.button("🚀 Gerar Relatório HTML", type="primary"):
                 with st.spinner("📊 Gerando relatório..."):
-                    st.success("✅ Relatório gerado com sucesso!")
-                    st.balloons()
-                    
-                    # Criar HTML simples do relatório
-                    html_content = f"""
-                    <!DOCTYPE html>
-                    <html>
-                    <head>
-                        <meta charset="UTF-8">
-                        <title>{titulo_relatorio}</title>
-                        <style>
-                            body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                            .header {{ text-align: center; margin-bottom: 30px; }}
-                            .title {{ color: #1f77b4; font-size: 24px; font-weight: bold; }}
-                            .subtitle {{ color: #666; margin: 10px 0; }}
-                            table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-                            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                            th {{ background-color: #f2f2f2; }}
-                        </style>
-                    </head>
-                    <body>
-                        <div class="header">
-                            <div class="title">{titulo_relatorio}</div>
-                            <div class="subtitle">Período: {periodo_texto}</div>
-                            <div class="subtitle">Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}</div>
-                            {f'<div class="subtitle">Responsável: {responsavel}</div>' if responsavel else ''}
-                        </div>
-                        
-                        <h2>Resumo Geral</h2>
-                        <p>Total de Presenças: {total_presencas}</p>
-                        <p>Total de Alunos: {total_alunos}</p>
-                        <p>Dias de Aula: {total_dias}</p>
-                        <p>Média Presenças/Dia: {media_presencas:.1f}</p>
-                        
-                        <h2>Top {top_n} Alunos Mais Assíduos</h2>
-                        <table>
-                            <tr>
-                                <th>Posição</th>
-                                <th>Nome</th>
-                                <th>Presenças</th>
-                                <th>Frequência (%)</th>
-                            </tr>
-                    """
+                    baixa_frequencia = None
+                    if incluir_baixa_freq:
+                        baixa_frequencia = resumo_presencas[ausentes_ultimas_aulas(presencas_bits, aulas_ausencia_relatorio)]
+                        baixa_frequencia = baixa_frequencia.sort_values(
+                            ['Aulas Desde a Última', 'Frequência (%)'], ascending=[False, True]
+                        )
                     
-                    for i, (_, row) in enumerate(presencas_por_aluno.head(top_n).iterrows(), 1):
-                        html_content += f"""
-                            <tr>
-                                <td>{i}º</td>
-                                <td>{row['Nome']}</td>
-                                <td>{row['Presenças']}</td>
-                                <td>{row['Frequência (%)']:.1f}%</td>
-                            </tr>
-                        """
+                    # HTML montado em um processo do pool
+                    html_content = executar_em_processo(
+                        id_sessao,
+                        gerar_relatorio_html,
+                        titulo_relatorio,
+                        periodo_texto,
+                        responsavel,
+                        {
+                            'total_presencas': total_presencas,
+                            'total_alunos': total_alunos,
+                            'total_dias': total_dias,
+                            'media_presencas': media_presencas,
+                        },
+                        presencas_por_aluno.head(top_n),
+                        baixa_frequencia,
+                        aulas_ausencia_relatorio
+                    )
                     
-                    html_content += """
-                        </table>
-                    </body>
-                    </html>
-                    """
+                    st.success("✅ Relatório gerado com sucesso!")
+                    st.balloons()
                     
                     # Download do relatório
                     nome_arquivo = f"relatorio_frequencia_{datetime.now().strftime('%Y%m%d_%H%M')}.html"
@@ -621,51 +1010,105 @@ if uploaded_file is not None:
             
             st.subheader("🧹 Análise de Qualidade dos Dados")
             
+            # Perfil de qualidade em uma passada, em cache junto com a versão dos dados e os
+            # arquivos da sessão (no banco, as descartadas e duplicadas vêm só do upload atual
+            # e os dados em uso são o recorte dos filtros)
+            chave_qualidade = ('qualidade', versao_dados, chave_sessao)
+            if conn_banco is not None:
+                chave_qualidade += (repr(filtros_ativos),)
+            perfil = calcular_em_processo(
+                chave_qualidade, id_sessao, "🧹 Analisando a qualidade dos dados...",
+                perfilar_qualidade, df_working, df_descartadas, df_duplicatas
+            )
+            
+            col1, col2, col3, col4, col5 = st.columns(5)
+            colunas_problemas = dict(zip(PROBLEMAS_QUALIDADE, (col1, col2, col3, col4, col5)))
+            icones_problemas = {
+                'data_invalida': '📅',
+                'data_futura': '🔮',
+                'telefone_invalido': '📞',
+                'nome_vazio': '❔',
+                'duplicada': '🔁',
+            }
+            
+            for chave, rotulo in PROBLEMAS_QUALIDADE.items():
+                with colunas_problemas[chave]:
+                    st.metric(f"{icones_problemas[chave]} {rotulo}", perfil['contagens'][chave])
+            
+            with st.expander(f"🔎 Linhas com Problemas ({len(perfil['linhas_problema'])} de {perfil['total_linhas']})", expanded=False):
+                if perfil['linhas_problema'].empty:
+                    st.markdown(create_alert_box("✅ Nenhuma linha com problemas!", "success"), unsafe_allow_html=True)
+                else:
+                    exibir_tabela_paginada(perfil['linhas_problema'], "tabela_problemas", coluna_filtro='Problemas')
+                    
+                    # CSV gerado só sob demanda, em cache pela mesma chave do perfil
+                    if st.button("📦 Preparar CSV", key="preparar_problemas"):
+                        st.session_state.pedido_problemas = chave_qualidade
+                    
+                    if st.session_state.get('pedido_problemas') == chave_qualidade:
+                        conteudo_problemas, _, _ = dashboard_cache.obter_ou_calcular(
+                            chave_qualidade + ('CSV',),
+                            exportar_dados, perfil['linhas_problema'], 'CSV'
+                        )
+                        st.download_button(
+                            label="⬇️ Baixar Linhas com Problemas (CSV)",
+                            data=conteudo_problemas,
+                            file_name=f"linhas_com_problemas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                            mime="text/csv"
+                        )
+                
+                st.markdown("**🕳️ Taxa de Nulos por Coluna**")
+                st.dataframe(perfil['nulos'], use_container_width=True, hide_index=True)
+            
             # Estatísticas de limpeza
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("**📊 Estatísticas de Limpeza**")
                 
-                if 'Nome_Original' in df_working.columns:
-                    nomes_alterados = df_working[df_working['Nome'] != df_working['Nome_Original']]
-                    st.metric("✏️ Nomes Padronizados", len(nomes_alterados))
-                    
-                    if not nomes_alterados.empty:
-                        st.markdown("**📝 Exemplos de Padronização:**")
-                        exemplos = nomes_alterados[['Nome_Original', 'Nome']].drop_duplicates().head(5)
-                        for _, row in exemplos.iterrows():
-                            st.write(f"• `{row['Nome_Original']}` → `{row['Nome']}`")
-                else:
-                    st.metric("✏️ Nomes Padronizados", "N/A")
+                st.metric("✏️ Nomes Padronizados", perfil['nomes_padronizados'])
+                
+                if not perfil['exemplos_padronizacao'].empty:
+                    st.markdown("**📝 Exemplos de Padronização:**")
+                    for _, row in perfil['exemplos_padronizacao'].iterrows():
+                        st.write(f"• `{row['Nome_Original']}` → `{row['Nome']}`")
                 
-                st.metric("👥 Nomes Únicos", df_working['Nome'].nunique())
-                st.metric("🔍 Nomes com 1 Presença", sum(df_working['Nome'].value_counts() == 1))
-                st.metric("❌ Registros Vazios", df_working['Nome'].isna().sum())
+                st.metric("👥 Nomes Únicos", perfil['nomes_unicos'])
+                st.metric("🆔 Alunos Identificados", perfil['alunos_identificados'])
+                st.metric("🔍 Nomes com 1 Presença", perfil['nomes_uma_presenca'])
+                st.metric("❌ Registros Vazios", perfil['contagens']['nome_vazio'])
+                st.metric("🔁 Check-ins Duplicados Removidos", duplicatas_removidas)
             
             with col2:
                 st.markdown("**⚠️ Possíveis Problemas Detectados**")
                 
-                from difflib import SequenceMatcher
-                
-                def similaridade(a, b):
-                    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
-                
-                nomes_unicos = [nome for nome in df_working['Nome'].unique() if pd.notna(nome)]
-                problemas_encontrados = []
+                # Comparação de todos os pares em um processo do pool, uma vez por conjunto de nomes
+                # (check-ins novos de nomes já vistos não refazem a comparação);
+                # o limite só recorta a tabela já ordenada
+                nomes_unicos = sorted(contagem_nomes.index)
+                assinatura_nomes = hashlib.sha1('\n'.join(nomes_unicos).encode('utf-8')).hexdigest()
+                pares_nomes = calcular_em_processo(
+                    ('similares', assinatura_nomes), id_sessao, "🔍 Comparando nomes...",
+                    pares_similares, nomes_unicos
+                )
                 
-                for i, nome1 in enumerate(nomes_unicos):
-                    for nome2 in nomes_unicos[i+1:]:
-                        if 0.8 <= similaridade(nome1, nome2) < 1.0:
-                            problemas_encontrados.append((nome1, nome2, similaridade(nome1, nome2)))
+                limite_similaridade = st.slider(
+                    "🎚️ Similaridade mínima (%):",
+                    min_value=int(SIMILARIDADE_MINIMA_PARES * 100),
+                    max_value=99,
+                    value=80,
+                    key="limite_similaridade",
+                    help="Filtra os pares já calculados, sem nova comparação"
+                )
+                problemas_encontrados = pares_acima(pares_nomes, limite_similaridade / 100)
                 
-                if problemas_encontrados:
+                if not problemas_encontrados.empty:
                     st.markdown(create_alert_box(
                         f"⚠️ {len(problemas_encontrados)} pares de nomes similares detectados",
                         "warning"
                     ), unsafe_allow_html=True)
                     
-                    for nome1, nome2, sim in sorted(problemas_encontrados, key=lambda x: x[2], reverse=True)[:5]:
+                    for nome1, nome2, sim in problemas_encontrados.head(5).itertuples(index=False):
                         st.write(f"• `{nome1}` ≈ `{nome2}` ({sim:.1%})")
                 else:
                     st.markdown(create_alert_box(
@@ -673,6 +1116,51 @@ if uploaded_file is not None:
                         "success"
                     ), unsafe_allow_html=True)
             
+            if not problemas_encontrados.empty:
+                with st.expander(f"🔗 Pares Similares ({len(problemas_encontrados)})"):
+                    presencas_nome = contagem_nomes
+                    tabela_pares = problemas_encontrados.assign(
+                        **{
+                            'Similaridade (%)': (problemas_encontrados['Similaridade'] * 100).round(1),
+                            'Presenças 1': problemas_encontrados['Nome 1'].map(presencas_nome).fillna(0).astype(int),
+                            'Presenças 2': problemas_encontrados['Nome 2'].map(presencas_nome).fillna(0).astype(int),
+                        }
+                    ).drop(columns='Similaridade')
+                    exibir_tabela_paginada(tabela_pares, "tabela_pares_similares", coluna_filtro='Nome 1')
+                    
+                    # Confirmar um par só preenche o corretor; a varredura guardada não é refeita
+                    col1, col2, col3 = st.columns([3, 2, 1])
+                    
+                    with col1:
+                        indice_par = st.selectbox(
+                            "🔗 Par:",
+                            options=range(min(len(tabela_pares), MAX_PARES_CONFIRMACAO)),
+                            format_func=lambda i: (
+                                f"{tabela_pares['Nome 1'].iat[i]} ≈ {tabela_pares['Nome 2'].iat[i]} "
+                                f"({tabela_pares['Similaridade (%)'].iat[i]:.1f}%)"
+                            ),
+                            key="par_confirmacao"
+                        )
+                    
+                    nome1, nome2 = tabela_pares['Nome 1'].iat[indice_par], tabela_pares['Nome 2'].iat[indice_par]
+                    with col2:
+                        # Sugere como correto o nome com mais presenças
+                        nome_mantido = st.radio(
+                            "✅ Manter:",
+                            options=[nome1, nome2],
+                            index=int(presencas_nome.get(nome2, 0) > presencas_nome.get(nome1, 0)),
+                            key=f"par_mantido_{indice_par}"
+                        )
+                    
+                    with col3:
+                        st.write("")
+                        if st.button("➡️ Enviar ao Corretor", key="confirmar_par"):
+                            st.session_state.corretor_nome_errado = nome2 if nome_mantido == nome1 else nome1
+                            st.session_state.corretor_nome_correto = nome_mantido
+                    
+                    if len(tabela_pares) > MAX_PARES_CONFIRMACAO:
+                        st.caption(f"ℹ️ Confirmação disponível para os {MAX_PARES_CONFIRMACAO} pares mais similares")
+            
             # FERRAMENTA DE CORREÇÃO MANUAL
             st.subheader("✏️ Corretor Manual de Nomes")
             
@@ -682,13 +1170,15 @@ if uploaded_file is not None:
                 with col1:
                     nome_errado = st.selectbox(
                         "🎯 Nome para corrigir:",
-                        options=[''] + sorted(df_working['Nome'].unique().tolist()),
+                        options=[''] + sorted(contagem_nomes.index),
+                        key="corretor_nome_errado",
                         help="Selecione o nome que precisa ser corrigido"
                     )
                 
                 with col2:
                     nome_correto = st.text_input(
                         "✅ Nome correto:",
+                        key="corretor_nome_correto",
                         help="Digite o nome correto"
                     )
                 
@@ -702,25 +1192,38 @@ if uploaded_file is not None:
                 
                 # Aplicar correção
                 if aplicar_correcao and nome_errado and nome_correto and nome_errado != nome_correto:
-                    mask = df_working['Nome'] == nome_errado
-                    registros_alterados = mask.sum()
+                    registros_alterados = int(contagem_nomes.get(nome_errado, 0))
                     
-                    if registros_alterados > 0:
-                        df_working.loc[mask, 'Nome'] = nome_correto
-                        st.session_state.df_corrigido = df_working
-                        
-                        if 'log_correcoes' not in st.session_state:
-                            st.session_state.log_correcoes = []
+                    if registros_alterados > 0 and conn_banco is not None:
+                        # Correção gravada no banco; o recorte é consultado de novo na próxima execução
+                        registros_alterados = aplicar_correcao_banco(conn_banco, nome_errado, nome_correto)
+                        st.success(f"✅ Correção aplicada: `{nome_errado}` → `{nome_correto}` ({registros_alterados} registros)")
                         
-                        st.session_state.log_correcoes.append({
+                        # O nome corrigido deixa de existir nas opções do corretor
+                        st.session_state.pop('corretor_nome_errado', None)
+                        st.session_state.pop('corretor_nome_correto', None)
+                        st.rerun()
+                    elif registros_alterados > 0:
+                        correcao = {
                             'timestamp': datetime.now().strftime('%H:%M:%S'),
                             'tipo': 'Correção Manual',
                             'de': nome_errado,
                             'para': nome_correto,
                             'registros': registros_alterados
-                        })
+                        }
+                        # Recalcula identidades e remove check-ins repetidos dos alunos unidos
+                        st.session_state.df_corrigido = aplicar_correcoes(df_working, [correcao])
+                        
+                        if 'log_correcoes' not in st.session_state:
+                            st.session_state.log_correcoes = []
+                        
+                        st.session_state.log_correcoes.append(correcao)
                         
                         st.success(f"✅ Correção aplicada: `{nome_errado}` → `{nome_correto}` ({registros_alterados} registros)")
+                        
+                        # O nome corrigido deixa de existir nas opções do corretor
+                        st.session_state.pop('corretor_nome_errado', None)
+                        st.session_state.pop('corretor_nome_correto', None)
                         st.rerun()
                     else:
                         st.warning("⚠️ Nome não encontrado nos dados.")
@@ -730,38 +1233,63 @@ if uploaded_file is not None:
                     st.subheader("📋 Correções Aplicadas")
                     
                     df_log = pd.DataFrame(st.session_state.log_correcoes)
-                    st.dataframe(df_log, use_container_width=True)
+                    exibir_tabela_paginada(df_log, "tabela_log_correcoes", coluna_filtro='de')
                     
                     col1, col2 = st.columns(2)
                     
                     with col1:
                         if st.button("🔄 Resetar Correções"):
-                            st.session_state.df_corrigido = df.copy()
+                            if conn_banco is not None:
+                                resetar_correcoes_banco(conn_banco)
+                            else:
+                                st.session_state.df_corrigido = df.copy()
                             st.session_state.log_correcoes = []
                             st.success("✅ Correções resetadas!")
                             st.rerun()
                     
                     with col2:
-                        csv_corrigido = df_working.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download Dados Corrigidos",
-                            data=csv_corrigido,
-                            file_name=f"dados_corrigidos_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                            mime="text/csv"
+                        # Exportação sob demanda, em cache por versão do dataset e das correções
+                        formato_exportacao = st.selectbox(
+                            "📦 Formato:",
+                            options=formatos_disponiveis()
                         )
+                        versao_correcoes = tuple((c['de'], c['para']) for c in st.session_state.log_correcoes)
+                        pedido_exportacao = (formato_exportacao, chave_dataset, versao_correcoes)
+                        
+                        if st.button("📦 Preparar Download"):
+                            st.session_state.pedido_exportacao = pedido_exportacao
+                        
+                        if st.session_state.get('pedido_exportacao') == pedido_exportacao:
+                            with st.spinner("📦 Preparando arquivo..."):
+                                if conn_banco is not None:
+                                    # Histórico completo lido do banco só no pool, ao pedir o download
+                                    conteudo_exportacao, extensao, mime = exportar_banco_cache(
+                                        CAMINHO_BANCO_PADRAO, formato_exportacao, chave_dataset, versao_correcoes,
+                                        sessao=id_sessao
+                                    )
+                                else:
+                                    conteudo_exportacao, extensao, mime = exportar_dados_cache(
+                                        df_working, formato_exportacao, chave_dataset, versao_correcoes, sessao=id_sessao
+                                    )
+                            st.download_button(
+                                label="📥 Download Dados Corrigidos",
+                                data=conteudo_exportacao,
+                                file_name=f"dados_corrigidos_{datetime.now().strftime('%Y%m%d_%H%M')}.{extensao}",
+                                mime=mime
+                            )
                 else:
                     st.info("ℹ️ Nenhuma correção aplicada ainda.")
             
             # TOP NOMES PARA REVISÃO
             st.subheader("📋 Top 20 Nomes Mais Frequentes")
             
-            top_nomes = df_working['Nome'].value_counts().head(20).reset_index()
+            top_nomes = contagem_nomes.head(20).reset_index()
             top_nomes.columns = ['Nome', 'Frequência']
             
             col1, col2 = st.columns([3, 1])
             
             with col1:
-                st.dataframe(top_nomes, use_container_width=True, height=400)
+                exibir_tabela_paginada(top_nomes, "tabela_top_nomes", coluna_filtro='Nome')
             
             with col2:
                 fig_top_nomes = px.bar(
@@ -774,10 +1302,345 @@ if uploaded_file is not None:
                     color_continuous_scale='Viridis'
                 )
                 fig_top_nomes.update_layout(height=400)
-                st.plotly_chart(fig_top_nomes, use_container_width=True, key=get_unique_chart_key("top_nomes_qualidade"))
+                exibir_grafico(fig_top_nomes, "top_nomes_qualidade")
+            
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # TAB 6: RETENÇÃO POR COORTE
+        with tab6:
+            st.markdown('<div class="animated-content">', unsafe_allow_html=True)
+            
+            st.subheader("🔁 Retenção por Coorte de Entrada")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                periodo_coorte = st.selectbox(
+                    "📆 Agrupar coortes por:",
+                    options=['M', 'W'],
+                    format_func=lambda periodo: {'M': 'Mês', 'W': 'Semana'}[periodo]
+                )
+            
+            with col2:
+                max_semanas = st.slider(
+                    "Semanas acompanhadas:",
+                    min_value=4,
+                    max_value=52,
+                    value=SEMANAS_RETENCAO
+                )
+            
+            with col3:
+                st.write("")
+                apenas_primeira_vez = st.checkbox(
+                    "✨ Só quem marcou primeira vez",
+                    value=False,
+                    help="Considera apenas alunos que responderam SIM em 'PRIMEIRA VEZ NO GRUPO?' na primeira visita"
+                )
+            
+            # Entrada de cada aluno no dataset completo, antes dos filtros (quem voltou
+            # dentro do recorte não conta como novo); no banco, agregada por SQL
+            if conn_banco is not None:
+                entradas = dashboard_cache.obter_ou_calcular(('entradas', versao_dados), entradas_banco, conn_banco)
+            else:
+                entradas = dashboard_cache.obter_ou_calcular(('entradas', versao_dados), entradas_alunos, df_working)
+            
+            # Calculado uma vez por versão dos dados e filtros, em cache de processo
+            coortes = calcular_em_processo(
+                ('coortes', versao_dados, repr(filtros_ativos), periodo_coorte, max_semanas, apenas_primeira_vez),
+                id_sessao, "🔁 Calculando a retenção...",
+                calcular_coortes, df_filtered, periodo_coorte, max_semanas, apenas_primeira_vez, entradas
+            )
+            
+            if coortes is None:
+                st.markdown(create_alert_box(
+                    "💡 Nenhum aluno no período selecionado para calcular a retenção",
+                    "info"
+                ), unsafe_allow_html=True)
+            else:
+                formato_coorte = '%m/%Y' if periodo_coorte == 'M' else '%d/%m/%Y'
+                retencao = (coortes['retencao'] * 100).round(1)
+                retencao.index = [
+                    f"{data.strftime(formato_coorte)} ({tamanho})"
+                    for data, tamanho in zip(retencao.index, coortes['tamanhos'])
+                ]
+                
+                fig_coortes = px.imshow(
+                    retencao,
+                    labels=dict(x="Semanas desde a 1ª visita", y="Coorte (alunos)", color="Retenção (%)"),
+                    color_continuous_scale='Viridis',
+                    aspect='auto',
+                    text_auto='.0f',
+                    title="🔥 Mapa de Retenção por Coorte"
+                )
+                fig_coortes.update_layout(
+                    height=max(400, 28 * len(retencao)),
+                    title_font_size=16
+                )
+                exibir_grafico(fig_coortes, "retencao_coortes")
+                
+                st.subheader("🤝 Retenção por Canal de Aquisição")
+                
+                col1, col2 = st.columns([3, 1])
+                
+                with col1:
+                    retencao_canal = (
+                        (coortes['retencao_canal'] * 100).round(1)
+                        .reset_index()
+                        .melt(id_vars='Canal', var_name='Semana', value_name='Retenção (%)')
+                    )
+                    fig_canais = px.line(
+                        retencao_canal,
+                        x='Semana',
+                        y='Retenção (%)',
+                        color='Canal',
+                        markers=True,
+                        title="Curvas de Retenção por 'Como Conheceu o Grupo'"
+                    )
+                    fig_canais.update_layout(height=400, title_font_size=16)
+                    exibir_grafico(fig_canais, "retencao_canais")
+                
+                with col2:
+                    st.markdown("**👥 Alunos por Canal**")
+                    st.dataframe(coortes['tamanhos_canal'].reset_index(), use_container_width=True, hide_index=True)
+            
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # TAB 7: INDICAÇÕES
+        with tab7:
+            st.markdown('<div class="animated-content">', unsafe_allow_html=True)
+            
+            st.subheader("🌱 Rede de Indicações")
+            
+            if COLUNA_CONVIDOU not in df_filtered.columns or df_filtered[COLUNA_CONVIDOU].isna().all():
+                st.markdown(create_alert_box(
+                    f"💡 A coluna <strong>{COLUNA_CONVIDOU}</strong> não foi encontrada ou está vazia",
+                    "info"
+                ), unsafe_allow_html=True)
+            else:
+                # Grafo construído uma vez por versão dos dados e filtros
+                grafo_indicacoes = dashboard_cache.obter_ou_calcular(
+                    ('indicacoes', versao_dados, repr(filtros_ativos)),
+                    construir_grafo_indicacoes, df_filtered
+                )
+                resumo_convites = dashboard_cache.obter_ou_calcular(
+                    ('resumo_indicacoes', versao_dados, repr(filtros_ativos)),
+                    resumo_indicacoes, grafo_indicacoes
+                )
+                
+                total_convidados = len(grafo_indicacoes['pai'])
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.markdown(create_metric_card(len(resumo_convites), "Convidantes"), unsafe_allow_html=True)
+                
+                with col2:
+                    st.markdown(create_metric_card(total_convidados, "Alunos Convidados"), unsafe_allow_html=True)
+                
+                with col3:
+                    convidados_voltaram = int(resumo_convites['Convidados que Voltaram'].sum())
+                    retencao_convidados = convidados_voltaram / total_convidados * 100 if total_convidados else 0
+                    st.markdown(create_metric_card(f"{retencao_convidados:.1f}%", "Convidados que Voltaram"), unsafe_allow_html=True)
+                
+                col1, col2 = st.columns([1, 1])
+                
+                with col1:
+                    fig_convidantes = px.bar(
+                        resumo_convites.head(15),
+                        x='Convidados Diretos',
+                        y='Convidante',
+                        orientation='h',
+                        title="🏆 Top 15 Convidantes",
+                        color='Retenção (%)',
+                        color_continuous_scale='Viridis',
+                        text='Convidados Diretos'
+                    )
+                    fig_convidantes.update_layout(
+                        height=500,
+                        title_font_size=16,
+                        yaxis={'categoryorder': 'total ascending'}
+                    )
+                    fig_convidantes.update_traces(textposition='outside')
+                    exibir_grafico(fig_convidantes, "top_convidantes")
+                
+                with col2:
+                    st.markdown("**📋 Convidantes**")
+                    exibir_tabela_paginada(resumo_convites, "tabela_convidantes", coluna_filtro='Convidante')
+            
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        # TAB 8: ALUNOS EM RISCO
+        with tab8:
+            st.markdown('<div class="animated-content">', unsafe_allow_html=True)
+            
+            st.subheader("🚨 Alunos em Risco e Sequências de Presença")
+            
+            if resumo_presencas.empty:
+                st.markdown(create_alert_box(
+                    "💡 Não há alunos identificados no período selecionado",
+                    "info"
+                ), unsafe_allow_html=True)
+            else:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    aulas_ausencia = st.number_input(
+                        "🚨 Ausente nas últimas aulas:",
+                        min_value=1,
+                        max_value=max(1, total_dias),
+                        value=min(AULAS_AUSENCIA_RISCO, max(1, total_dias)),
+                        help="Alunos sem nenhuma presença nas últimas K aulas do período"
+                    )
+                
+                with col2:
+                    sequencia_minima = st.number_input(
+                        "🔥 Aulas seguidas (mínimo):",
+                        min_value=1,
+                        max_value=max(1, total_dias),
+                        value=min(4, max(1, total_dias)),
+                        help="Alunos que já compareceram a pelo menos N aulas em sequência"
+                    )
+                
+                em_risco = resumo_presencas[ausentes_ultimas_aulas(presencas_bits, aulas_ausencia)]
+                em_sequencia = resumo_presencas[resumo_presencas['Maior Sequência'] >= sequencia_minima]
+                
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
+                    st.markdown(create_metric_card(len(em_risco), f"Ausentes nas Últimas {aulas_ausencia} Aulas"), unsafe_allow_html=True)
+                
+                with col2:
+                    st.markdown(create_metric_card(len(em_sequencia), f"Com {sequencia_minima}+ Aulas Seguidas"), unsafe_allow_html=True)
+                
+                with col3:
+                    st.markdown(create_metric_card(int((resumo_presencas['Sequência Atual'] >= sequencia_minima).sum()), "Em Sequência Agora"), unsafe_allow_html=True)
+                
+                with col4:
+                    st.markdown(create_metric_card(int(resumo_presencas['Maior Sequência'].max()), "Maior Sequência"), unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("**🚨 Sem Presença nas Últimas Aulas**")
+                    exibir_tabela_paginada(
+                        em_risco.drop(columns='ID_Aluno').sort_values(
+                            ['Aulas Desde a Última', 'Frequência (%)'], ascending=[False, True]
+                        ),
+                        "tabela_em_risco",
+                        coluna_filtro='Nome'
+                    )
+                
+                with col2:
+                    st.markdown("**🔥 Maiores Sequências de Presença**")
+                    exibir_tabela_paginada(
+                        em_sequencia.drop(columns='ID_Aluno').sort_values(
+                            ['Sequência Atual', 'Maior Sequência'], ascending=False
+                        ),
+                        "tabela_sequencias",
+                        coluna_filtro='Nome'
+                    )
+            
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        # TAB 9: COMPARAÇÃO ENTRE GRUPOS
+        with tab9:
+            st.markdown('<div class="animated-content">', unsafe_allow_html=True)
+            
+            st.subheader("⚖️ Comparação entre Grupos")
+            st.caption("Cada arquivo carregado é tratado como um grupo; os filtros de período e alunos valem para todos")
+            
+            if len(arquivos_selecionados or arquivos_carregados) < 2:
+                st.markdown(create_alert_box(
+                    "💡 Carregue dois ou mais arquivos (um por grupo) para comparar",
+                    "info"
+                ), unsafe_allow_html=True)
+            else:
+                # Check-ins de cada grupo deduplicados só dentro do próprio arquivo: quem foi a
+                # dois grupos no mesmo dia conta nos dois
+                if conn_banco is not None:
+                    dados_grupos = dashboard_cache.obter_ou_calcular(
+                        ('consulta_grupos', chave_dataset, repr(filtros_ativos)),
+                        consultar_checkins, conn_banco, *filtros_ativos, grupos=True
+                    )
+                else:
+                    dados_grupos = calcular_em_processo(
+                        ('grupos', versao_dados), id_sessao, "🧩 Separando os grupos...",
+                        preparar_grupos, df, df_duplicatas, st.session_state.log_correcoes
+                    )
+                    dados_grupos = dashboard_cache.obter_ou_calcular(
+                        ('grupos_filtrados', versao_dados, repr(filtros_ativos)),
+                        filtrar_checkins, dados_grupos, *filtros_ativos
+                    )
+                
+                # Todos os grupos em uma única passada agrupada
+                comparativo = dashboard_cache.obter_ou_calcular(
+                    ('comparacao', versao_dados, repr(filtros_ativos)),
+                    comparar_grupos, dados_grupos
+                )
+                
+                st.dataframe(comparativo, use_container_width=True, hide_index=True)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    metricas_grupos = comparativo.melt(
+                        id_vars='Grupo',
+                        value_vars=['Presenças', 'Alunos', 'Dias', 'Média/Dia'],
+                        var_name='Métrica',
+                        value_name='Valor'
+                    )
+                    fig_metricas = px.bar(
+                        metricas_grupos,
+                        x='Grupo',
+                        y='Valor',
+                        color='Grupo',
+                        facet_col='Métrica',
+                        facet_col_wrap=2,
+                        title="📊 Métricas por Grupo",
+                        text='Valor'
+                    )
+                    fig_metricas.update_yaxes(matches=None, showticklabels=True, title_text='')
+                    fig_metricas.update_xaxes(showticklabels=False, title_text='')
+                    fig_metricas.for_each_annotation(lambda a: a.update(text=a.text.split('=')[-1]))
+                    fig_metricas.update_layout(
+                        height=500,
+                        title_font_size=16,
+                        font=dict(size=12)
+                    )
+                    exibir_grafico(fig_metricas, "comparacao_metricas")
+                
+                with col2:
+                    faixas_grupos = comparativo.melt(
+                        id_vars='Grupo',
+                        value_vars=FAIXAS_FREQUENCIA,
+                        var_name='Faixa',
+                        value_name='Alunos na Faixa'
+                    )
+                    total_grupo = faixas_grupos['Grupo'].map(comparativo.set_index('Grupo')['Alunos'])
+                    faixas_grupos['% dos Alunos'] = (faixas_grupos['Alunos na Faixa'] / total_grupo.where(total_grupo > 0) * 100).fillna(0).round(1)
+                    
+                    fig_faixas = px.bar(
+                        faixas_grupos,
+                        x='Grupo',
+                        y='% dos Alunos',
+                        color='Faixa',
+                        title="📊 Distribuição por Faixa de Frequência",
+                        color_discrete_sequence=CHART_COLORS['gradient_colors'],
+                        hover_data=['Alunos na Faixa'],
+                        text='% dos Alunos'
+                    )
+                    fig_faixas.update_layout(
+                        height=500,
+                        barmode='stack',
+                        title_font_size=16,
+                        font=dict(size=12)
+                    )
+                    exibir_grafico(fig_faixas, "comparacao_faixas")
             
             st.markdown("</div>", unsafe_allow_html=True)
 
+    except TarefaInterrompida as e:
+        st.error(f"❌ {e}")
+    
     except Exception as e:
         st.error(f"❌ Erro ao processar o arquivo: {str(e)}")
         st.write("**💡 Possíveis soluções:**")
@@ -831,4 +1694,49 @@ else:
         'DDD+TELEFONE (SEM ESPAÇO)': ['11987654321', '11876543210', '11987654321']
     })
     
-    st.dataframe(exemplo_df, use_container_width=True)
\ No newline at end of file
+    st.dataframe(exemplo_df, use_container_width=True)
+
+# Uso do cache de processo (compartilhado entre as sessões; detalhes só para administradores)
+with st.sidebar:
+    with st.expander("🗄️ Cache do Servidor", expanded=False):
+        stats_cache = dashboard_cache.estatisticas_cache()
+        
+        st.progress(
+            min(1.0, stats_cache['bytes_usados'] / stats_cache['limite_bytes']) if stats_cache['limite_bytes'] else 0.0,
+            text=f"{stats_cache['bytes_usados'] / 1024**2:.1f} MB de {stats_cache['limite_bytes'] / 1024**2:.0f} MB"
+        )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("✅ Hits", stats_cache['hits'])
+            st.metric("🗑️ Evictions", stats_cache['evictions'])
+        with col2:
+            st.metric("❌ Misses", stats_cache['misses'])
+            st.metric("⌛ Expirados", stats_cache['expiracoes'])
+        
+        # Entradas (de todas as sessões) e limpeza só para administradores do servidor
+        if dashboard_cache.TOKEN_ADMIN_CACHE:
+            token_admin = st.text_input("🔑 Token de administrador:", type="password", key="token_admin_cache")
+            
+            if dashboard_cache.autorizar_admin(token_admin):
+                st.dataframe(dashboard_cache.entradas_cache(), use_container_width=True, hide_index=True)
+                
+                if st.button("🧹 Limpar Cache"):
+                    dashboard_cache.limpar_cache()
+                    st.rerun()
+            elif token_admin:
+                st.error("❌ Token inválido.")
+    
+    # Ocupação do pool de processos (compartilhado entre as sessões)
+    with st.expander("⚙️ Processamento", expanded=False):
+        stats_tarefas = estado_tarefas(id_sessao)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("🖥️ Processos", stats_tarefas['processos'])
+            st.metric("▶️ Em Execução", stats_tarefas['em_execucao'])
+            st.metric("✅ Concluídas", stats_tarefas['concluidas'])
+        with col2:
+            st.metric("⏳ Na Fila", stats_tarefas['na_fila'])
+            st.metric("👤 Desta Sessão", stats_tarefas['da_sessao'])
+            st.metric("⚠️ Falhas", stats_tarefas['falhas'])
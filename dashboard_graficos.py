@@ -0,0 +1,206 @@
+"""
+Preparação e envio de gráficos para o Dashboard de Frequência de Alunos
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+from plotly.utils import PlotlyJSONEncoder
+
+try:
+    from dashboard_utils import get_unique_chart_key
+except ImportError:
+    # Mesmo fallback do script principal
+    def get_unique_chart_key(base_name):
+        if 'chart_counter' not in st.session_state:
+            st.session_state.chart_counter = 0
+        st.session_state.chart_counter += 1
+        return f"{base_name}_{st.session_state.chart_counter}"
+
+# Número máximo de pontos enviados ao navegador por série temporal
+MAX_PONTOS_GRAFICO = 400
+
+# Granularidades da linha do tempo: (código do período, rótulo)
+GRANULARIDADES = [
+    (None, 'dia'),
+    ('W', 'semana'),
+    ('M', 'mês'),
+]
+
+# Tamanho do modelo (template) de layout serializado, medido uma vez por modelo
+_tamanho_modelos = {}
+
+
+def escolher_granularidade(datas, max_pontos=MAX_PONTOS_GRAFICO):
+    """
+    Escolhe a granularidade da linha do tempo conforme o período selecionado
+
+    Usa dias enquanto couberem no orçamento de pontos, depois semanas e,
+    por fim, meses.
+
+    Args:
+        datas (pd.Series): Coluna 'Data/hora' dos dados filtrados
+        max_pontos (int): Orçamento de pontos do gráfico
+
+    Returns:
+        tuple: (código do período ou None para diário, rótulo)
+    """
+    if datas.empty:
+        return GRANULARIDADES[0]
+
+    dias = datas.dt.normalize()
+    if dias.nunique() <= max_pontos:
+        return GRANULARIDADES[0]
+
+    extensao_dias = (dias.max() - dias.min()).days + 1
+    if extensao_dias / 7 <= max_pontos:
+        return GRANULARIDADES[1]
+    return GRANULARIDADES[2]
+
+
+def reduzir_pontos_lttb(x, y, max_pontos):
+    """
+    Reduz uma série com Largest-Triangle-Three-Buckets
+
+    Mantém o primeiro e o último ponto e, em cada balde intermediário,
+    o ponto que forma o maior triângulo com os vizinhos, preservando
+    picos e vales da curva.
+
+    Args:
+        x (np.ndarray): Eixo x numérico e crescente
+        y (np.ndarray): Valores da série
+        max_pontos (int): Quantidade de pontos desejada (mínimo 3)
+
+    Returns:
+        np.ndarray: Índices dos pontos mantidos
+    """
+    n = len(x)
+    if max_pontos >= n or max_pontos < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    limites = np.linspace(1, n - 1, max_pontos - 1).astype(int)
+
+    indices = np.empty(max_pontos, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    anterior = 0
+
+    for i in range(max_pontos - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        proximo_inicio, proximo_fim = limites[i + 1], limites[i + 2] if i + 2 < len(limites) else n
+        media_x = x[proximo_inicio:proximo_fim].mean()
+        media_y = y[proximo_inicio:proximo_fim].mean()
+
+        areas = np.abs(
+            (x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        indices[i + 1] = anterior
+
+    return indices
+
+
+def agrupar_contagem_diaria(contagem, max_pontos=MAX_PONTOS_GRAFICO):
+    """
+    Agrupa contagens diárias para a linha do tempo respeitando o orçamento de pontos
+
+    Args:
+        contagem (pd.Series): Presenças por dia (índice de datas)
+        max_pontos (int): Orçamento de pontos do gráfico
+
+    Returns:
+        tuple: (DataFrame com 'Data' e 'Presenças', rótulo da granularidade,
+            indica se a série foi reduzida)
+    """
+    dias = pd.Series(pd.to_datetime(pd.Index(contagem.index)), dtype='datetime64[ns]')
+    periodo, rotulo = escolher_granularidade(dias, max_pontos)
+
+    serie = contagem
+    if periodo is not None:
+        serie = contagem.groupby(dias.dt.to_period(periodo).dt.start_time.to_numpy()).sum()
+    serie = serie.sort_index()
+
+    reduzida = len(serie) > max_pontos
+    if reduzida:
+        x = pd.to_datetime(pd.Series(serie.index)).to_numpy().astype('datetime64[s]').astype(np.int64)
+        serie = serie.iloc[reduzir_pontos_lttb(x, serie.to_numpy(), max_pontos)]
+
+    presencas = serie.rename_axis('Data').reset_index(name='Presenças')
+    return presencas, rotulo, reduzida
+
+
+def presencas_por_periodo(df, max_pontos=MAX_PONTOS_GRAFICO):
+    """
+    Agrega as presenças para a linha do tempo respeitando o orçamento de pontos
+
+    Args:
+        df (pd.DataFrame): Dados filtrados com a coluna 'Data'
+        max_pontos (int): Orçamento de pontos do gráfico
+
+    Returns:
+        tuple: (DataFrame com 'Data' e 'Presenças', rótulo da granularidade,
+            indica se a série foi reduzida)
+    """
+    return agrupar_contagem_diaria(df.groupby('Data').size(), max_pontos)
+
+
+def _tamanho_json(valor):
+    """Tamanho em bytes de um valor serializado como no Plotly"""
+    return len(json.dumps(valor, cls=PlotlyJSONEncoder).encode('utf-8'))
+
+
+def _tamanho_array(valores):
+    """Estimativa do texto de um array no JSON: cada valor como string, com aspas e vírgula"""
+    textos = pd.Series(np.asarray(valores).ravel(), dtype=object).astype(str)
+    return int(textos.str.len().sum()) + 3 * len(textos)
+
+
+def tamanho_payload(fig):
+    """
+    Estima o tamanho do JSON que o gráfico envia ao navegador sem serializar a
+    figura inteira: os arrays das séries são medidos pelo texto dos valores e o
+    modelo de layout, igual em todos os gráficos, é medido uma vez só
+
+    Args:
+        fig (go.Figure): Figura Plotly
+
+    Returns:
+        int: Tamanho aproximado em bytes
+    """
+    layout = fig.layout.to_plotly_json()
+    modelo = layout.pop('template', None)
+    total = _tamanho_json(layout)
+    if modelo is not None:
+        nome_modelo = str(pio.templates.default)
+        if nome_modelo not in _tamanho_modelos:
+            _tamanho_modelos[nome_modelo] = _tamanho_json(modelo)
+        total += _tamanho_modelos[nome_modelo]
+    for trace in fig.data:
+        for valor in trace.to_plotly_json().values():
+            if isinstance(valor, (np.ndarray, list, tuple)):
+                total += _tamanho_array(valor)
+            else:
+                total += _tamanho_json(valor)
+    return total
+
+
+def exibir_grafico(fig, base_name):
+    """
+    Exibe um gráfico Plotly informando o tamanho do payload enviado
+
+    Args:
+        fig (go.Figure): Figura Plotly
+        base_name (str): Nome base para a chave do gráfico
+    """
+    pontos = 0
+    for trace in fig.data:
+        valores = trace.values if trace.type == 'pie' else trace.x
+        pontos += len(valores) if valores is not None else 0
+    st.plotly_chart(fig, use_container_width=True, key=get_unique_chart_key(base_name))
+    st.caption(f"📦 ≈{tamanho_payload(fig) / 1024:.1f} KB enviados · {pontos} pontos")
@@ -0,0 +1,351 @@
+"""
+Modo ao vivo do Dashboard de Frequência de Alunos
+
+Acompanha um CSV local que recebe check-ins continuamente (export do
+formulário sincronizado em disco), lendo apenas os bytes acrescentados
+desde a última leitura. As linhas lidas entram no dataset do dashboard
+como mais um arquivo na próxima execução completa do script; entre uma e
+outra, as chegadas são somadas a contagens mantidas no estado do monitor.
+"""
+
+import os
+import time
+
+import pandas as pd
+
+from dashboard_dados import normalizar_telefones, processar_arquivo
+
+# Pasta cujos CSV podem ser monitorados e arquivo sugerido, configuráveis por ambiente
+PASTA_MONITOR = os.environ.get('DASHBOARD_PASTA_MONITOR', 'dados')
+ARQUIVO_MONITOR_PADRAO = os.environ.get('DASHBOARD_MONITOR', 'frequencia.csv')
+
+# Intervalo padrão entre leituras do arquivo monitorado (segundos)
+INTERVALO_MONITOR_SEGUNDOS = 5
+
+
+def listar_arquivos_monitor(pasta=PASTA_MONITOR):
+    """
+    CSV da pasta monitorada que podem ser escolhidos na tela
+
+    Args:
+        pasta (str): Pasta configurada no servidor
+
+    Returns:
+        list: Nomes dos arquivos (sem caminho), em ordem alfabética
+    """
+    try:
+        nomes = os.listdir(pasta)
+    except OSError:
+        return []
+    return sorted(
+        nome for nome in nomes
+        if nome.lower().endswith('.csv') and os.path.isfile(os.path.join(pasta, nome))
+    )
+
+
+def resolver_caminho_monitor(nome_arquivo, pasta=PASTA_MONITOR):
+    """
+    Caminho real de um arquivo da pasta monitorada
+
+    Links simbólicos e nomes com '..' ou separadores são resolvidos antes da
+    verificação, então nada fora da pasta configurada pode ser lido.
+
+    Args:
+        nome_arquivo (str): Nome escolhido na tela
+        pasta (str): Pasta configurada no servidor
+
+    Returns:
+        str: Caminho absoluto do arquivo
+
+    Raises:
+        ValueError: Se o arquivo não estiver diretamente na pasta
+    """
+    raiz = os.path.realpath(pasta)
+    caminho = os.path.realpath(os.path.join(raiz, nome_arquivo))
+    if os.path.dirname(caminho) != raiz:
+        raise ValueError(f"{nome_arquivo} não está na pasta monitorada.")
+    return caminho
+
+
+def criar_monitor(caminho):
+    """
+    Cria o estado de acompanhamento de um arquivo
+
+    Args:
+        caminho (str): Caminho do CSV monitorado (ver resolver_caminho_monitor)
+
+    Returns:
+        dict: Posição lida, cabeçalho, blocos processados, blocos ainda
+            não contados, linhas com data inválida e o tamanho e o horário
+            da última chegada de linhas
+    """
+    return {
+        'caminho': caminho,
+        'posicao': 0,
+        'cabecalho': b'',
+        'blocos': [],
+        'frame': None,
+        'chegadas': [],
+        'contagem': None,
+        'descartadas': [],
+        'linhas_novas': 0,
+        'lido_em': None,
+        'recebido_em': None,
+        'erro': None,
+    }
+
+
+def atualizar_monitor(estado):
+    """
+    Lê as linhas acrescentadas ao arquivo desde a última leitura
+
+    Só linhas completas (terminadas em quebra de linha) são consumidas; uma
+    linha ainda em gravação fica para a próxima leitura. Se o arquivo
+    encolher (foi substituído ou truncado), a leitura recomeça do início.
+
+    Args:
+        estado (dict): Estado criado por criar_monitor (alterado no lugar)
+
+    Returns:
+        int: Quantidade de check-ins novos válidos
+    """
+    caminho = estado['caminho']
+    estado['lido_em'] = time.time()
+
+    try:
+        tamanho = os.path.getsize(caminho)
+        if tamanho < estado['posicao']:
+            estado.update(criar_monitor(caminho))
+            estado['lido_em'] = time.time()
+
+        with open(caminho, 'rb') as arquivo:
+            arquivo.seek(estado['posicao'])
+            novos = arquivo.read()
+    except OSError as e:
+        estado['erro'] = f"Não foi possível ler {os.path.basename(caminho)}: {e.strerror or e}"
+        return 0
+
+    fim = novos.rfind(b'\n') + 1
+    if fim == 0:
+        estado['erro'] = None
+        return 0
+
+    novos = novos[:fim]
+    cabecalho = estado['cabecalho']
+    if not cabecalho:
+        fim_cabecalho = novos.find(b'\n') + 1
+        cabecalho, novos = novos[:fim_cabecalho], novos[fim_cabecalho:]
+
+    novas = 0
+    if novos.strip():
+        try:
+            df, _, descartadas = processar_arquivo(os.path.basename(caminho), cabecalho + novos)
+        except ValueError as e:
+            # Mantém a posição: a leitura é repetida no próximo ciclo
+            estado['erro'] = str(e)
+            return 0
+
+        if not descartadas.empty:
+            estado['descartadas'].append(descartadas)
+
+        novas = len(df)
+        if novas:
+            estado['blocos'].append(df)
+            if estado['contagem'] is not None:
+                estado['chegadas'].append(df)
+            estado['frame'] = None
+            estado['linhas_novas'] = novas
+            estado['recebido_em'] = estado['lido_em']
+
+    estado['cabecalho'] = cabecalho
+    estado['posicao'] += fim
+    estado['erro'] = None
+    return novas
+
+
+def frame_monitor(estado):
+    """
+    Junta os blocos já lidos do arquivo monitorado
+
+    A junção é guardada no estado até chegar um bloco novo.
+
+    Args:
+        estado (dict): Estado do monitor
+
+    Returns:
+        pd.DataFrame: Check-ins processados (vazio se nada foi lido)
+    """
+    if estado['frame'] is None:
+        blocos = estado['blocos']
+        if not blocos:
+            return pd.DataFrame()
+        estado['frame'] = blocos[0] if len(blocos) == 1 else pd.concat(blocos, ignore_index=True, sort=False)
+        estado['blocos'] = [estado['frame']]
+    return estado['frame']
+
+
+def descartadas_monitor(estado):
+    """
+    Linhas do arquivo monitorado descartadas por data inválida
+
+    Args:
+        estado (dict): Estado do monitor
+
+    Returns:
+        pd.DataFrame: Linhas descartadas (vazio se não houver)
+    """
+    if not estado['descartadas']:
+        return pd.DataFrame()
+    if len(estado['descartadas']) > 1:
+        estado['descartadas'] = [pd.concat(estado['descartadas'], ignore_index=True, sort=False)]
+    return estado['descartadas'][0]
+
+
+def chave_monitor(estado):
+    """
+    Chave do conteúdo lido, no mesmo formato das chaves de arquivo
+
+    Args:
+        estado (dict): Estado do monitor
+
+    Returns:
+        tuple: (nome do arquivo, posição lida)
+    """
+    return os.path.basename(estado['caminho']), f"ao_vivo:{estado['posicao']}"
+
+
+def chaves_checkins(df):
+    """
+    Chave de identidade de cada check-in, com a regra de resolver_identidades
+
+    Telefone normalizado e primeiro nome quando há telefone válido; senão, o
+    nome sem diferenciar maiúsculas. Permite reconhecer um aluno já visto
+    sem recalcular os IDs do dataset.
+
+    Args:
+        df (pd.DataFrame): Check-ins com 'Nome' e 'DDD+TELEFONE (SEM ESPAÇO)'
+
+    Returns:
+        pd.Series: Chaves (nulas para linhas sem nome), com o mesmo índice
+    """
+    nomes = df['Nome'].astype(object)
+    telefones = normalizar_telefones(df['DDD+TELEFONE (SEM ESPAÇO)'])
+    primeiro_nome = nomes.str.split(n=1).str[0].str.casefold()
+    por_telefone = 'telefone:' + telefones + '|' + primeiro_nome
+    return por_telefone.where(por_telefone.notna(), 'nome:' + nomes.str.casefold())
+
+
+def resumir_base(df):
+    """
+    Chaves e presenças por dia dos check-ins que já estão no dashboard
+
+    Ponto de partida da contagem ao vivo (ver iniciar_contagem).
+
+    Args:
+        df (pd.DataFrame): Check-ins filtrados, sem repetições no dia
+
+    Returns:
+        dict: Pares (chave, dia) vistos, chaves dos alunos e presenças por dia
+    """
+    chaves = chaves_checkins(df)
+    com_chave = chaves.notna()
+    return {
+        'vistos': set(zip(chaves[com_chave], df.loc[com_chave, 'Data'])),
+        'alunos': set(chaves[com_chave]),
+        'por_dia': df.groupby('Data').size(),
+    }
+
+
+def iniciar_contagem(estado, base, correcoes=(), inicio=None, fim=None, so_alunos_da_base=False):
+    """
+    Zera a contagem das chegadas a partir deste ponto
+
+    Chamada a cada execução completa do script, quando as linhas já lidas
+    entraram no dataset (e em `base`); os blocos anteriores são esquecidos.
+
+    Args:
+        estado (dict): Estado do monitor (alterado no lugar)
+        base (dict): Resultado de resumir_base para os dados exibidos
+        correcoes (iterable): Pares (de, para) das correções da sessão
+        inicio (date): Primeiro dia contado (opcional)
+        fim (date): Último dia contado (opcional; sem ele, dias novos contam)
+        so_alunos_da_base (bool): Conta só alunos já presentes na base
+            (filtro de alunos ativo)
+    """
+    estado['chegadas'] = []
+    estado['contagem'] = {
+        'base': base,
+        'correcoes': list(correcoes),
+        'inicio': inicio,
+        'fim': fim,
+        'so_alunos_da_base': so_alunos_da_base,
+        'lidas': 0,
+        'vistos': set(),
+        'presencas': 0,
+        'novos_alunos': set(),
+        'por_dia': {},
+    }
+
+
+def encerrar_contagem(estado):
+    """Para de contar as chegadas (arquivo fora dos filtros ou dados no banco)"""
+    estado['chegadas'] = []
+    estado['contagem'] = None
+
+
+def contar_chegadas(estado):
+    """
+    Soma à contagem só os blocos lidos desde a última chamada
+
+    Cada check-in novo é comparado com as chaves da base e com as já
+    contadas: repetições no mesmo dia não contam, e um aluno só é novo se
+    a chave não estiver na base.
+
+    Args:
+        estado (dict): Estado do monitor com a contagem iniciada
+
+    Returns:
+        dict: Contagem ('presencas', 'novos_alunos', 'por_dia' etc.)
+    """
+    contagem = estado['contagem']
+    base = contagem['base']
+    for df in estado['chegadas'][contagem['lidas']:]:
+        nomes = df['Nome']
+        for de, para in contagem['correcoes']:
+            nomes = nomes.mask(nomes == de, para)
+        df = df.assign(Nome=nomes)
+        if contagem['inicio'] is not None:
+            df = df[df['Data'] >= contagem['inicio']]
+        if contagem['fim'] is not None:
+            df = df[df['Data'] <= contagem['fim']]
+
+        for chave, dia in zip(chaves_checkins(df), df['Data']):
+            if pd.isna(chave):
+                if contagem['so_alunos_da_base']:
+                    continue
+            elif (chave, dia) in base['vistos'] or (chave, dia) in contagem['vistos']:
+                continue
+            elif contagem['so_alunos_da_base'] and chave not in base['alunos']:
+                continue
+            else:
+                contagem['vistos'].add((chave, dia))
+                if chave not in base['alunos']:
+                    contagem['novos_alunos'].add(chave)
+            contagem['presencas'] += 1
+            contagem['por_dia'][dia] = contagem['por_dia'].get(dia, 0) + 1
+    contagem['lidas'] = len(estado['chegadas'])
+    return contagem
+
+
+def presencas_por_dia_ao_vivo(contagem):
+    """
+    Presenças por dia da base somadas às chegadas contadas
+
+    Args:
+        contagem (dict): Resultado de contar_chegadas
+
+    Returns:
+        pd.Series: Presenças por dia (índice de datas)
+    """
+    novas = pd.Series(contagem['por_dia'], dtype='int64')
+    return contagem['base']['por_dia'].add(novas, fill_value=0).astype('int64')
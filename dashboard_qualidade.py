@@ -0,0 +1,173 @@
+"""
+Perfil de qualidade dos dados para o Dashboard de Frequência de Alunos
+"""
+
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from dashboard_dados import normalizar_telefones
+
+# Coluna de telefone como vem do formulário
+COLUNA_TELEFONE = 'DDD+TELEFONE (SEM ESPAÇO)'
+
+# Problemas verificados por linha: chave -> rótulo exibido e exportado
+PROBLEMAS_QUALIDADE = {
+    'data_invalida': 'Data inválida',
+    'data_futura': 'Data futura',
+    'telefone_invalido': 'Telefone inválido',
+    'nome_vazio': 'Nome vazio',
+    'duplicada': 'Check-in duplicado',
+}
+
+# Similaridade mínima guardada na varredura de nomes; o limite exibido é escolhido na tela
+SIMILARIDADE_MINIMA_PARES = 0.6
+
+# Pares oferecidos para confirmação no corretor (os mais similares acima do limite)
+MAX_PARES_CONFIRMACAO = 200
+
+# Colunas criadas pelo dashboard, fora das taxas de nulos e da exportação de problemas
+COLUNAS_INTERNAS = ['Data', 'Hora', 'Hora_decimal', 'Nome_Original', 'Telefone_Normalizado',
+                    'ID_Aluno', 'Nome_Aluno', 'Arquivo']
+
+
+def _sem_vazios(frames):
+    """Descarta frames ausentes ou vazios antes de um concat"""
+    return [frame for frame in frames if frame is not None and not frame.empty]
+
+
+def perfilar_qualidade(df, descartadas=None, duplicatas=None, agora=None):
+    """
+    Levanta os problemas de qualidade de todas as linhas ingeridas
+
+    As linhas mantidas, as duplicadas e as descartadas por data inválida
+    são unidas uma única vez, e cada problema vira uma máscara vetorizada
+    sobre esse conjunto.
+
+    Args:
+        df (pd.DataFrame): Dados em uso (corrigidos e sem duplicatas)
+        descartadas (pd.DataFrame): Linhas descartadas por 'Data/hora'
+            inválida, com o valor original
+        duplicatas (pd.DataFrame): Check-ins repetidos removidos na ingestão
+        agora (pd.Timestamp): Referência para datas futuras (padrão: agora)
+
+    Returns:
+        dict: 'total_linhas', 'contagens' por problema, 'nulos' por coluna,
+            'linhas_problema' (linhas afetadas com a coluna 'Problemas'),
+            'nomes_padronizados', 'exemplos_padronizacao', 'nomes_unicos',
+            'nomes_uma_presenca' e 'alunos_identificados'
+    """
+    agora = pd.Timestamp.now() if agora is None else agora
+
+    validas = _sem_vazios([df, duplicatas])
+    validas = pd.concat(validas, ignore_index=True, sort=False) if len(validas) > 1 else df
+    invalidas = _sem_vazios([descartadas])
+    linhas = pd.concat([validas] + invalidas, ignore_index=True, sort=False) if invalidas else validas
+
+    total_validas = len(validas)
+    total_uso = len(df)
+    posicao = np.arange(len(linhas))
+
+    nomes = linhas['Nome'].astype('string').str.strip()
+    telefones = linhas[COLUNA_TELEFONE]
+    informados = telefones.notna() & telefones.astype('string').str.strip().ne('')
+
+    # Máscaras como arrays booleanos puros: comparações com dtypes anuláveis
+    # ('string', 'boolean') trazem pd.NA, que não serve para indexar
+    mascaras = {
+        'data_invalida': posicao >= total_validas,
+        'data_futura': np.concatenate([
+            (validas['Data/hora'] > agora).to_numpy(dtype=bool, na_value=False),
+            np.zeros(len(linhas) - total_validas, dtype=bool)
+        ]),
+        'telefone_invalido': (informados & normalizar_telefones(telefones).isna()).to_numpy(dtype=bool, na_value=False),
+        'nome_vazio': nomes.isna().to_numpy(dtype=bool) | nomes.eq('').to_numpy(dtype=bool, na_value=False),
+        'duplicada': (posicao >= total_uso) & (posicao < total_validas),
+    }
+
+    afetadas = np.logical_or.reduce(list(mascaras.values()))
+    problemas = pd.Series('', index=linhas.index[afetadas], dtype=object)
+    for chave, mascara in mascaras.items():
+        marcadas = mascara[afetadas]
+        problemas[marcadas] = problemas[marcadas] + PROBLEMAS_QUALIDADE[chave] + '; '
+
+    colunas_originais = [col for col in linhas.columns if col not in COLUNAS_INTERNAS]
+    linhas_problema = linhas.loc[afetadas, colunas_originais + ['Arquivo']].copy()
+    linhas_problema.insert(0, 'Problemas', problemas.str.rstrip('; '))
+
+    contagem_nulos = linhas[colunas_originais].isna().sum()
+    nulos = pd.DataFrame({
+        'Coluna': contagem_nulos.index,
+        'Nulos': contagem_nulos.to_numpy(),
+        'Taxa (%)': (contagem_nulos.to_numpy() / max(len(linhas), 1) * 100).round(1),
+    })
+
+    # Estatísticas de nomes sobre os dados em uso (uma contagem por nome)
+    presencas_nome = df['Nome'].value_counts()
+    padronizados = df['Nome_Original'].notna() & df['Nome'].ne(df['Nome_Original'])
+
+    return {
+        'total_linhas': len(linhas),
+        'contagens': {chave: int(mascara.sum()) for chave, mascara in mascaras.items()},
+        'nulos': nulos,
+        'linhas_problema': linhas_problema,
+        'nomes_padronizados': int(padronizados.sum()),
+        'exemplos_padronizacao': df.loc[padronizados, ['Nome_Original', 'Nome']].drop_duplicates().head(5),
+        'nomes_unicos': len(presencas_nome),
+        'nomes_uma_presenca': int((presencas_nome == 1).sum()),
+        'alunos_identificados': df.loc[df['ID_Aluno'] >= 0, 'ID_Aluno'].nunique(),
+    }
+
+
+def pares_similares(nomes, minimo=SIMILARIDADE_MINIMA_PARES):
+    """
+    Compara todos os pares de nomes e guarda os parecidos mas diferentes
+
+    As estimativas rápidas do SequenceMatcher (limites superiores da
+    similaridade) descartam a maior parte dos pares antes do cálculo exato.
+
+    Args:
+        nomes (list): Nomes distintos
+        minimo (float): Similaridade mínima guardada (0 a 1)
+
+    Returns:
+        pd.DataFrame: 'Nome 1', 'Nome 2' e 'Similaridade', da mais para a
+            menos similar
+    """
+    minusculos = [nome.lower() for nome in nomes]
+    pares = []
+    # O lado "b" do SequenceMatcher guarda o índice do nome; fixado, serve a toda a coluna
+    for j, nome2 in enumerate(minusculos):
+        comparador = SequenceMatcher(None, b=nome2)
+        for i in range(j):
+            comparador.set_seq1(minusculos[i])
+            if comparador.real_quick_ratio() < minimo or comparador.quick_ratio() < minimo:
+                continue
+            similaridade = comparador.ratio()
+            if minimo <= similaridade < 1.0:
+                pares.append((i, j, similaridade))
+    pares.sort(key=lambda par: (-par[2], par[0], par[1]))
+    return pd.DataFrame({
+        'Nome 1': [nomes[i] for i, _, _ in pares],
+        'Nome 2': [nomes[j] for _, j, _ in pares],
+        'Similaridade': np.array([similaridade for _, _, similaridade in pares], dtype=float),
+    })
+
+
+def pares_acima(pares, limite):
+    """
+    Recorta os pares com similaridade a partir de um limite
+
+    Como os pares estão ordenados, o recorte é um prefixo encontrado por
+    busca binária, sem percorrer a tabela.
+
+    Args:
+        pares (pd.DataFrame): Resultado de pares_similares
+        limite (float): Similaridade mínima (0 a 1)
+
+    Returns:
+        pd.DataFrame: Prefixo de `pares` com similaridade >= limite
+    """
+    quantidade = np.searchsorted(-pares['Similaridade'].to_numpy(), -limite, side='right')
+    return pares.iloc[:quantidade]
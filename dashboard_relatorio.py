@@ -0,0 +1,115 @@
+"""
+Relatório HTML do Dashboard de Frequência de Alunos
+"""
+
+from datetime import datetime
+
+
+def gerar_relatorio_html(titulo, periodo_texto, responsavel, metricas, top_alunos,
+                         baixa_frequencia=None, aulas_ausencia=None):
+    """
+    Monta o relatório de frequência em HTML para download
+
+    Args:
+        titulo (str): Título do relatório
+        periodo_texto (str): Período exibido no cabeçalho
+        responsavel (str): Nome do responsável (opcional)
+        metricas (dict): 'total_presencas', 'total_alunos', 'total_dias' e
+            'media_presencas'
+        top_alunos (pd.DataFrame): Alunos mais assíduos com 'Nome',
+            'Presenças' e 'Frequência (%)'
+        baixa_frequencia (pd.DataFrame): Alunos ausentes nas últimas aulas,
+            com 'Última Presença' e 'Aulas Desde a Última' (None omite a seção)
+        aulas_ausencia (int): Aulas consideradas na seção de baixa frequência
+
+    Returns:
+        str: Documento HTML
+    """
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <title>{titulo}</title>
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 40px; }}
+            .header {{ text-align: center; margin-bottom: 30px; }}
+            .title {{ color: #1f77b4; font-size: 24px; font-weight: bold; }}
+            .subtitle {{ color: #666; margin: 10px 0; }}
+            table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
+            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+            th {{ background-color: #f2f2f2; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <div class="title">{titulo}</div>
+            <div class="subtitle">Período: {periodo_texto}</div>
+            <div class="subtitle">Gerado em: {datetime.now().strftime('%d/%m/%Y às %H:%M')}</div>
+            {f'<div class="subtitle">Responsável: {responsavel}</div>' if responsavel else ''}
+        </div>
+
+        <h2>Resumo Geral</h2>
+        <p>Total de Presenças: {metricas['total_presencas']}</p>
+        <p>Total de Alunos: {metricas['total_alunos']}</p>
+        <p>Dias de Aula: {metricas['total_dias']}</p>
+        <p>Média Presenças/Dia: {metricas['media_presencas']:.1f}</p>
+
+        <h2>Top {len(top_alunos)} Alunos Mais Assíduos</h2>
+        <table>
+            <tr>
+                <th>Posição</th>
+                <th>Nome</th>
+                <th>Presenças</th>
+                <th>Frequência (%)</th>
+            </tr>
+    """
+
+    for i, (_, row) in enumerate(top_alunos.iterrows(), 1):
+        html_content += f"""
+            <tr>
+                <td>{i}º</td>
+                <td>{row['Nome']}</td>
+                <td>{row['Presenças']}</td>
+                <td>{row['Frequência (%)']:.1f}%</td>
+            </tr>
+        """
+
+    html_content += """
+        </table>
+    """
+
+    if baixa_frequencia is not None:
+        html_content += f"""
+        <h2>Alunos com Baixa Frequência</h2>
+        <p>Sem presença nas últimas {aulas_ausencia} aulas: {len(baixa_frequencia)} alunos</p>
+        <table>
+            <tr>
+                <th>Nome</th>
+                <th>Presenças</th>
+                <th>Frequência (%)</th>
+                <th>Última Presença</th>
+                <th>Aulas Ausente</th>
+            </tr>
+        """
+
+        for _, row in baixa_frequencia.iterrows():
+            html_content += f"""
+            <tr>
+                <td>{row['Nome']}</td>
+                <td>{row['Presenças']}</td>
+                <td>{row['Frequência (%)']:.1f}%</td>
+                <td>{row['Última Presença'].strftime('%d/%m/%Y')}</td>
+                <td>{row['Aulas Desde a Última']}</td>
+            </tr>
+            """
+
+        html_content += """
+        </table>
+        """
+
+    html_content += """
+    </body>
+    </html>
+    """
+    return html_content
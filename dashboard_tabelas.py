@@ -0,0 +1,118 @@
+"""
+Tabelas paginadas para o Dashboard de Frequência de Alunos
+"""
+
+import math
+
+import pandas as pd
+import streamlit as st
+
+# Opções de linhas por página
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+
+
+def paginar(df, pagina, tamanho_pagina, coluna_ordem=None, crescente=True,
+            filtro='', coluna_filtro=None):
+    """
+    Filtra, ordena e recorta uma página de um DataFrame no servidor
+
+    Args:
+        df (pd.DataFrame): Dados completos
+        pagina (int): Número da página (começa em 1)
+        tamanho_pagina (int): Linhas por página
+        coluna_ordem (str): Coluna de ordenação (None mantém a ordem atual)
+        crescente (bool): Ordem crescente ou decrescente
+        filtro (str): Texto buscado em coluna_filtro (sem diferenciar maiúsculas)
+        coluna_filtro (str): Coluna usada no filtro de texto
+
+    Returns:
+        tuple: (DataFrame da página, total de linhas após o filtro,
+            total de páginas)
+    """
+    if filtro and coluna_filtro in df.columns:
+        mask = df[coluna_filtro].astype(str).str.contains(filtro, case=False, na=False, regex=False)
+        df = df[mask]
+
+    total_linhas = len(df)
+    total_paginas = max(1, math.ceil(total_linhas / tamanho_pagina))
+    pagina = min(max(1, pagina), total_paginas)
+    inicio = (pagina - 1) * tamanho_pagina
+
+    if coluna_ordem in df.columns:
+        df = df.sort_values(coluna_ordem, ascending=crescente, kind='mergesort')
+
+    return df.iloc[inicio:inicio + tamanho_pagina], total_linhas, total_paginas
+
+
+def exibir_tabela_paginada(df, chave, coluna_filtro=None, height=400, column_config=None):
+    """
+    Exibe uma tabela enviando ao navegador apenas a página visível
+
+    Filtro de texto, ordenação e paginação rodam no servidor; somente as
+    linhas da página atual são serializadas.
+
+    Args:
+        df (pd.DataFrame): Dados completos
+        chave (str): Prefixo único para as chaves dos widgets
+        coluna_filtro (str): Coluna usada no filtro de texto (padrão: a
+            primeira coluna de texto)
+        height (int): Altura da tabela
+        column_config (dict): Configuração de colunas repassada ao
+            st.dataframe (opcional)
+    """
+    if coluna_filtro is None:
+        colunas_texto = [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
+        coluna_filtro = colunas_texto[0] if colunas_texto else None
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+
+    with col1:
+        filtro = ''
+        if coluna_filtro is not None:
+            filtro = st.text_input(f"🔎 Filtrar {coluna_filtro}:", key=f"{chave}_filtro")
+
+    with col2:
+        coluna_ordem = st.selectbox(
+            "↕️ Ordenar por:",
+            options=['(original)'] + list(df.columns),
+            key=f"{chave}_ordem"
+        )
+
+    with col3:
+        crescente = st.selectbox("Ordem:", options=['↑', '↓'], key=f"{chave}_direcao") == '↑'
+
+    with col4:
+        tamanho_pagina = st.selectbox("Linhas:", options=TAMANHOS_PAGINA, key=f"{chave}_tamanho")
+
+    # Mantém a página dentro do limite quando filtros reduzem o total
+    chave_pagina = f"{chave}_pagina"
+    pagina_atual = st.session_state.get(chave_pagina, 1)
+
+    pagina_df, total_linhas, total_paginas = paginar(
+        df,
+        pagina_atual,
+        tamanho_pagina,
+        coluna_ordem=None if coluna_ordem == '(original)' else coluna_ordem,
+        crescente=crescente,
+        filtro=filtro,
+        coluna_filtro=coluna_filtro
+    )
+
+    if pagina_atual > total_paginas:
+        st.session_state[chave_pagina] = total_paginas
+
+    st.dataframe(pagina_df, use_container_width=True, height=height, hide_index=True, column_config=column_config)
+
+    col1, col2 = st.columns([1, 3])
+
+    with col1:
+        st.number_input(
+            "Página:",
+            min_value=1,
+            max_value=total_paginas,
+            step=1,
+            key=chave_pagina
+        )
+
+    with col2:
+        st.caption(f"Página {min(pagina_atual, total_paginas)} de {total_paginas} · {total_linhas} registros")
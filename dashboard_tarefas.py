@@ -0,0 +1,191 @@
+"""
+Pool de processos para as etapas pesadas do Dashboard de Frequência
+
+Agrupamentos, varredura de nomes similares, montagem de relatórios e
+exportações rodam em processos separados, fora da thread do script e do
+GIL do servidor. Cada sessão tem um limite de tarefas simultâneas, para
+que um dataset grande não monopolize os workers.
+"""
+
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.machinery import ModuleSpec
+from multiprocessing import get_context
+
+import streamlit as st
+
+import dashboard_cache
+
+# Processos do pool (0 executa tudo na própria thread) e tarefas simultâneas por sessão
+MAX_PROCESSOS = int(os.environ.get('DASHBOARD_PROCESSOS', max(1, min(4, (os.cpu_count() or 2) - 1))))
+TAREFAS_POR_SESSAO = int(os.environ.get('DASHBOARD_TAREFAS_SESSAO', 1))
+
+# Módulo auxiliar, em sys.modules, que guarda o estado do pool
+_MODULO_ESTADO = '_dashboard_tarefas_estado'
+
+
+class TarefaInterrompida(RuntimeError):
+    """O worker que executava a tarefa foi encerrado antes de devolver o resultado"""
+
+
+def _criar_estado():
+    """Pool, trava e contadores do processo, reaproveitados se este arquivo for recarregado"""
+    # O Streamlit recarrega um arquivo alterado apagando o módulo de sys.modules e
+    # importando de novo; o módulo auxiliar, sem arquivo, não é apagado, e a nova
+    # versão continua usando o pool em vez de deixá-lo órfão com os workers abertos
+    auxiliar = sys.modules.setdefault(_MODULO_ESTADO, types.ModuleType(_MODULO_ESTADO))
+    if not hasattr(auxiliar, 'estado'):
+        auxiliar.estado = {
+            'pool': None,
+            'lock': threading.Lock(),
+            # sessão -> {'semaforo', 'tarefas'}; removida quando a sessão não tem tarefas
+            'sessoes': {},
+            'contadores': {'aguardando': 0, 'no_pool': 0, 'concluidas': 0, 'falhas': 0},
+        }
+    return auxiliar.estado
+
+
+_estado = _criar_estado()
+
+
+def _proteger_script_principal():
+    """Marca o __main__ do Streamlit para que os workers 'spawn' não reexecutem o script"""
+    # Um __main__ com spec de nome '__main__' não é reimportado pelo multiprocessing no
+    # worker; o módulo que o Streamlit cria a cada execução do script não tem spec, e o
+    # worker rodaria o dashboard inteiro. As funções do pool vêm de módulos importáveis.
+    principal = sys.modules.get('__main__')
+    if principal is not None and getattr(principal, '__spec__', None) is None:
+        principal.__spec__ = ModuleSpec('__main__', None, origin=getattr(principal, '__file__', None))
+
+
+def _obter_pool(estado):
+    """Cria o pool sob demanda (chamar com o lock)"""
+    if estado['pool'] is None:
+        # 'spawn' evita herdar as threads do servidor em um fork
+        estado['pool'] = ProcessPoolExecutor(max_workers=MAX_PROCESSOS, mp_context=get_context('spawn'))
+    return estado['pool']
+
+
+def _descartar_pool(estado, pool):
+    """Abandona um pool quebrado; o próximo pedido cria outro"""
+    with estado['lock']:
+        if estado['pool'] is pool:
+            estado['pool'] = None
+    # As tarefas de outras sessões nesse pool também recebem BrokenProcessPool
+    pool.shutdown(wait=False)
+
+
+def executar_em_processo(sessao, funcao, *args, **kwargs):
+    """
+    Executa uma função em um processo do pool e aguarda o resultado
+
+    A sessão espera sua vez quando já tem TAREFAS_POR_SESSAO tarefas em
+    andamento. Se o worker for encerrado no meio da tarefa, o pool é
+    descartado (o próximo pedido cria outro) e a falha é informada: a
+    função não é refeita na thread do servidor.
+
+    Args:
+        sessao (str): Identificador da sessão que pediu a tarefa
+        funcao (callable): Função de nível de módulo (precisa ser serializável)
+        *args, **kwargs: Argumentos repassados a `funcao`
+
+    Returns:
+        Resultado de `funcao`
+
+    Raises:
+        TarefaInterrompida: Se o pool quebrar antes de devolver o resultado
+    """
+    if MAX_PROCESSOS <= 0:
+        return funcao(*args, **kwargs)
+
+    estado = _estado
+    lock, contadores = estado['lock'], estado['contadores']
+    with lock:
+        registro = estado['sessoes'].setdefault(
+            sessao, {'semaforo': threading.BoundedSemaphore(TAREFAS_POR_SESSAO), 'tarefas': 0}
+        )
+        registro['tarefas'] += 1
+        contadores['aguardando'] += 1
+
+    try:
+        with registro['semaforo']:
+            with lock:
+                contadores['aguardando'] -= 1
+                contadores['no_pool'] += 1
+            try:
+                with lock:
+                    _proteger_script_principal()
+                    pool = _obter_pool(estado)
+                try:
+                    return pool.submit(funcao, *args, **kwargs).result()
+                except BrokenProcessPool:
+                    _descartar_pool(estado, pool)
+                    with lock:
+                        contadores['falhas'] += 1
+                    raise TarefaInterrompida(
+                        "O processo de cálculo foi encerrado antes de terminar. Recarregue a página para tentar de novo."
+                    ) from None
+            finally:
+                with lock:
+                    contadores['no_pool'] -= 1
+                    contadores['concluidas'] += 1
+    finally:
+        with lock:
+            registro['tarefas'] -= 1
+            if registro['tarefas'] == 0:
+                del estado['sessoes'][sessao]
+
+
+def estado_tarefas(sessao=None):
+    """
+    Resume a ocupação do pool
+
+    Args:
+        sessao (str): Sessão cujas tarefas pendentes são contadas (opcional)
+
+    Returns:
+        dict: Processos, tarefas em execução, na fila (no pool ou esperando
+            o limite da sessão), concluídas, falhas e tarefas da sessão
+    """
+    estado = _estado
+    contadores = estado['contadores']
+    with estado['lock']:
+        em_execucao = min(contadores['no_pool'], max(MAX_PROCESSOS, 0))
+        return {
+            'processos': MAX_PROCESSOS,
+            'em_execucao': em_execucao,
+            'na_fila': contadores['no_pool'] - em_execucao + contadores['aguardando'],
+            'concluidas': contadores['concluidas'],
+            'falhas': contadores['falhas'],
+            'da_sessao': estado['sessoes'][sessao]['tarefas'] if sessao in estado['sessoes'] else 0,
+        }
+
+
+def calcular_em_processo(chave, sessao, mensagem, funcao, *args, **kwargs):
+    """
+    Busca um valor no cache de processo ou o calcula no pool com um spinner
+
+    O spinner só aparece quando há cálculo e informa quantas tarefas estão
+    na fila à frente.
+
+    Args:
+        chave (tuple): Chave do cache; o primeiro item é a categoria
+        sessao (str): Identificador da sessão
+        mensagem (str): Texto do spinner
+        funcao (callable): Função de nível de módulo que produz o valor
+        *args, **kwargs: Argumentos repassados a `funcao`
+
+    Returns:
+        Valor guardado ou recém-calculado
+    """
+    sentinela = object()
+    valor = dashboard_cache.obter(chave, sentinela)
+    if valor is sentinela:
+        na_fila = estado_tarefas()['na_fila']
+        with st.spinner(f"{mensagem} ({na_fila} tarefas na fila)" if na_fila else mensagem):
+            valor = dashboard_cache.guardar(chave, executar_em_processo(sessao, funcao, *args, **kwargs))
+    return valor
@@ -0,0 +1,10 @@
+"""
+Configuração dos testes do Dashboard de Frequência de Alunos
+
+Os módulos do dashboard ficam na raiz do repositório, fora de um pacote.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,272 @@
+"""
+Testes das análises de alunos (dashboard_analises)
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard_analises import (
+    COLUNA_CONVIDOU,
+    ausentes_ultimas_aulas,
+    calcular_coortes,
+    comparar_grupos,
+    construir_grafo_indicacoes,
+    construir_presencas_bits,
+    consultar_perfis,
+    entradas_alunos,
+    resumo_indicacoes,
+    resumo_presencas_bits,
+    sincronizar_perfis
+)
+from dashboard_dados import adicionar_colunas_tempo
+
+
+def _visitas(linhas):
+    """Check-ins a partir de (ID, 'AAAA-MM-DD', canal, primeira vez)"""
+    df = pd.DataFrame(linhas, columns=['ID_Aluno', 'Data', 'COMO CONHECEU O GRUPO?', 'PRIMEIRA VEZ NO GRUPO?'])
+    df['Data/hora'] = pd.to_datetime(df['Data']) + pd.Timedelta(hours=19)
+    df['Data'] = df['Data/hora'].dt.date
+    df['Nome_Aluno'] = 'Aluno ' + df['ID_Aluno'].astype(str)
+    return df
+
+
+def _historico():
+    """Aluno 1 entra em janeiro e volta em março; aluno 2 entra em março"""
+    return _visitas([
+        (1, '2024-01-08', 'Instagram', 'SIM'),
+        (1, '2024-03-04', None, 'NÃO'),
+        (1, '2024-03-11', None, 'NÃO'),
+        (2, '2024-03-04', 'amigo', 'SIM'),
+        (2, '2024-03-18', 'Amigo', 'NÃO'),
+        (-1, '2024-03-04', None, None),
+    ])
+
+
+def test_entradas_alunos_usa_a_primeira_resposta_informada():
+    entradas = entradas_alunos(_historico())
+
+    assert list(entradas.index) == [1, 2]
+    assert entradas.loc[1, 'Primeira Visita'] == pd.Timestamp('2024-01-08 19:00')
+    assert entradas.loc[1, 'COMO CONHECEU O GRUPO?'] == 'Instagram'
+    assert entradas.loc[2, 'PRIMEIRA VEZ NO GRUPO?'] == 'SIM'
+
+
+def test_coortes_sem_filtro():
+    coortes = calcular_coortes(_historico(), periodo_coorte='M', max_semanas=4)
+
+    assert coortes['tamanhos'].to_dict() == {pd.Timestamp('2024-01-01'): 1, pd.Timestamp('2024-03-01'): 1}
+    assert coortes['tamanhos_canal'].to_dict() == {'Instagram': 1, 'Amigo': 1}
+    assert coortes['retencao'].loc[pd.Timestamp('2024-03-01'), 2] == 1.0
+
+
+def test_coortes_nao_tratam_quem_voltou_como_novo():
+    historico = _historico()
+    marco = historico[historico['Data/hora'] >= '2024-03-01']
+
+    coortes = calcular_coortes(marco, periodo_coorte='M', max_semanas=4, entradas=entradas_alunos(historico))
+
+    assert coortes['tamanhos'].to_dict() == {pd.Timestamp('2024-03-01'): 1}
+    assert coortes['tamanhos_canal'].to_dict() == {'Amigo': 1}
+
+    # Sem a entrada do histórico completo, o aluno 1 pareceria novo em março
+    ingenuo = calcular_coortes(marco, periodo_coorte='M', max_semanas=4)
+    assert ingenuo['tamanhos'].to_dict() == {pd.Timestamp('2024-03-01'): 2}
+
+
+def test_coortes_apenas_primeira_vez():
+    historico = _historico()
+    historico.loc[historico['ID_Aluno'] == 2, 'PRIMEIRA VEZ NO GRUPO?'] = 'NÃO'
+
+    coortes = calcular_coortes(historico, max_semanas=4, apenas_primeira_vez=True)
+
+    assert coortes['tamanhos'].to_dict() == {pd.Timestamp('2024-01-01'): 1}
+    assert calcular_coortes(historico.iloc[3:5], max_semanas=4, apenas_primeira_vez=True) is None
+
+
+def test_coortes_sem_alunos_identificados():
+    assert calcular_coortes(_historico().iloc[5:]) is None
+    assert np.isnan(calcular_coortes(_historico(), max_semanas=4)['retencao'].loc[pd.Timestamp('2024-03-01'), 4])
+
+
+def _indicacoes(linhas):
+    """Check-ins a partir de (ID, nome, nome de exibição, convidante)"""
+    df = pd.DataFrame(linhas, columns=['ID_Aluno', 'Nome', 'Nome_Aluno', COLUNA_CONVIDOU])
+    df['Data/hora'] = pd.date_range('2024-03-04 19:00', periods=len(df), freq='7D')
+    return df
+
+
+def test_grafo_indicacoes_usa_ids_e_resolve_variacoes_de_nome():
+    grafo = construir_grafo_indicacoes(_indicacoes([
+        (10, 'Ana Souza', 'Ana Souza', None),
+        (10, 'Ana S', 'Ana Souza', None),
+        (20, 'Bruno Lima', 'Bruno Lima', 'ana s'),
+        (20, 'Bruno Lima', 'Bruno Lima', 'Outra Pessoa'),
+        (30, 'Carla Reis', 'Carla Reis', '  bruno   LIMA '),
+        (40, 'Davi Rocha', 'Davi Rocha', 'pastor joão'),
+        (-1, None, None, 'Ana Souza'),
+    ]))
+
+    assert grafo['pai'] == {20: 10, 30: 20, 40: 'pastor joão'}
+    assert grafo['filhos'] == {10: [20], 20: [30], 'pastor joão': [40]}
+    assert grafo['presencas'] == {10: 2, 20: 2, 30: 1, 40: 1}
+    assert grafo['nomes'][10] == 'Ana Souza'
+    assert grafo['nomes']['pastor joão'] == 'Pastor João'
+
+    resumo = resumo_indicacoes(grafo).set_index('Convidante')
+    assert resumo.loc['Ana Souza', 'Tamanho da Rede'] == 2
+    assert resumo.loc['Ana Souza', 'Convidados que Voltaram'] == 1
+    assert resumo.loc['Bruno Lima', 'Retenção (%)'] == 0.0
+
+
+def test_grafo_indicacoes_nao_escolhe_entre_homonimos():
+    grafo = construir_grafo_indicacoes(_indicacoes([
+        (10, 'Ana Souza', 'Ana Souza', None),
+        (11, 'Ana Souza', 'Ana Souza', None),
+        (20, 'Bruno Lima', 'Bruno Lima', 'Ana Souza'),
+        (10, 'Ana Souza', 'Ana Souza', 'Ana Souza'),
+    ]))
+
+    assert grafo['pai'] == {20: 'ana souza', 10: 'ana souza'}
+    assert grafo['nomes'][10] == grafo['nomes'][11] == 'Ana Souza'
+
+
+def test_grafo_indicacoes_vazio():
+    grafo = construir_grafo_indicacoes(_indicacoes([(-1, None, None, 'Ana')]))
+    assert grafo == {'pai': {}, 'filhos': {}, 'presencas': {}, 'nomes': {}}
+    assert resumo_indicacoes(grafo).empty
+
+
+def _aulas(presencas_por_aluno, inicio='2024-01-01'):
+    """Check-ins semanais a partir de {ID: '1011...'} (um caractere por aula)"""
+    datas = pd.date_range(inicio, periods=max(len(p) for p in presencas_por_aluno.values()), freq='W-MON')
+    return _visitas([
+        (id_aluno, str(datas[aula].date()), None, 'NÃO')
+        for id_aluno, presencas in presencas_por_aluno.items()
+        for aula, marca in enumerate(presencas) if marca == '1'
+    ])
+
+
+def test_presencas_bits_resume_sequencias_e_ausencias():
+    # 70 aulas: cobre mais de uma palavra de 64 bits
+    df = _aulas({1: '1' * 70, 2: '1101110' + '0' * 60 + '111', 3: '1' + '0' * 69})
+
+    presencas = construir_presencas_bits(df)
+    resumo = resumo_presencas_bits(presencas).set_index('ID_Aluno')
+
+    assert presencas['bits'].shape == (3, 2)
+    assert list(resumo['Presenças']) == [70, 8, 1]
+    assert list(resumo['Maior Sequência']) == [70, 3, 1]
+    assert list(resumo['Sequência Atual']) == [70, 3, 0]
+    assert list(resumo['Aulas Desde a Última']) == [0, 0, 69]
+    assert list(ausentes_ultimas_aulas(presencas, 3)) == [False, False, True]
+
+
+def test_presencas_bits_usa_o_calendario_antes_do_filtro_de_alunos():
+    df = _aulas({1: '1111', 2: '1010'})
+    so_aluno_2 = df[df['ID_Aluno'] == 2]
+
+    presencas = construir_presencas_bits(so_aluno_2, df['Data'])
+    resumo = resumo_presencas_bits(presencas)
+
+    assert len(presencas['dias']) == 4
+    assert resumo['Frequência (%)'].tolist() == [50.0]
+    assert resumo['Aulas Desde a Última'].tolist() == [1]
+    assert list(ausentes_ultimas_aulas(presencas, 1)) == [True]
+    assert len(construir_presencas_bits(so_aluno_2)['dias']) == 2
+
+
+def test_presencas_bits_com_calendario_vazio(recwarn):
+    presencas = construir_presencas_bits(_aulas({1: '1'}).iloc[:0], [])
+
+    assert len(presencas['dias']) == 0
+    assert resumo_presencas_bits(presencas).empty
+    assert not recwarn.list
+
+
+def _checkins_perfis(linhas):
+    """Check-ins a partir de (ID, nome, 'AAAA-MM-DD HH:MM')"""
+    df = pd.DataFrame(linhas, columns=['ID_Aluno', 'Nome_Aluno', 'Data/hora'])
+    df['Data/hora'] = pd.to_datetime(df['Data/hora'])
+    df['DDD+TELEFONE (SEM ESPAÇO)'] = None
+    return adicionar_colunas_tempo(df)
+
+
+def test_perfis_de_homonimos_ficam_separados():
+    df = _checkins_perfis([
+        (1, 'Ana Souza', '2024-03-04 19:00'),
+        (2, 'Ana Souza', '2024-03-04 19:30'),
+        (2, 'Ana Souza', '2024-03-11 19:00'),
+        (3, 'Bruno Lima', '2024-03-11 19:10'),
+    ])
+
+    perfis = sincronizar_perfis(None, df)
+
+    assert perfis['ids_por_nome'] == {'Ana Souza': {1, 2}, 'Bruno Lima': {3}}
+    tabela = consultar_perfis(perfis, sorted(perfis['ids_por_nome']['Ana Souza']))
+    assert list(tabela['Presenças']) == [1, 2]
+    assert list(tabela['Frequência (%)']) == [50.0, 100.0]
+    assert list(tabela['Atrasos (%)']) == [0.0, 50.0]
+
+
+def test_perfis_usam_o_calendario_do_periodo():
+    df = _checkins_perfis([
+        (1, 'Ana Souza', '2024-03-04 19:00'),
+        (2, 'Bruno Lima', '2024-03-11 19:00'),
+        (2, 'Bruno Lima', '2024-03-18 19:00'),
+    ])
+    so_ana = df[df['ID_Aluno'] == 1]
+
+    perfis = sincronizar_perfis(None, so_ana, base='filtro', dias=df['Data'])
+
+    assert list(consultar_perfis(perfis, [1, 2])['Frequência (%)']) == [33.3]
+    assert sincronizar_perfis(None, so_ana.iloc[:0], base='vazio', dias=[])['dias'] == frozenset()
+
+
+def test_perfis_estendidos_so_com_as_linhas_novas():
+    df = _checkins_perfis([
+        (1, 'Ana Souza', '2024-03-04 19:00'),
+        (1, 'Ana Souza', '2024-03-11 19:00'),
+        (2, 'Bruno Lima', '2024-04-01 19:20'),
+    ])
+
+    anterior = sincronizar_perfis(None, df.iloc[:2], base='a')
+    perfis = sincronizar_perfis(anterior, df, base='a')
+
+    assert perfis['perfis'][1] is anterior['perfis'][1]
+    assert perfis['meses'] == (pd.Period('2024-03', 'M'), pd.Period('2024-04', 'M'))
+    pd.testing.assert_frame_equal(
+        consultar_perfis(perfis, [1, 2]), consultar_perfis(sincronizar_perfis(None, df, base='b'), [1, 2])
+    )
+    assert sincronizar_perfis(anterior, df, base='outra')['perfis'][1] is not anterior['perfis'][1]
+
+
+def test_perfis_medem_atrasos_pelo_inicio_da_aula_informado():
+    df = _checkins_perfis([
+        (1, 'Ana Souza', '2024-03-04 19:20'),
+        (1, 'Ana Souza', '2024-03-11 19:40'),
+    ])
+
+    tabela = consultar_perfis(sincronizar_perfis(None, df, hora_inicio=19.5), [1])
+
+    assert list(tabela['Atrasos (%)']) == [50.0]
+    assert list(tabela['Atraso Médio (min)']) == [10.0]
+
+
+def test_comparar_grupos_mede_cada_grupo_pelos_proprios_dias():
+    df = pd.concat([
+        _aulas({1: '1111', 2: '1100'}).assign(Arquivo='a.csv'),
+        _aulas({1: '01', 3: '11'}, inicio='2024-01-08').assign(Arquivo='b.csv'),
+    ], ignore_index=True)
+
+    comparativo = comparar_grupos(df).set_index('Grupo')
+
+    assert comparativo.loc['a.csv', ['Presenças', 'Alunos', 'Dias']].tolist() == [6, 2, 4]
+    # O aluno 1 foi aos dois grupos em 2024-01-15 e conta nos dois
+    assert comparativo.loc['b.csv', ['Presenças', 'Alunos', 'Dias']].tolist() == [3, 2, 2]
+    assert comparativo.loc['a.csv', 'Média/Dia'] == 1.5
+    assert comparativo.loc['a.csv', ['26-50%', '76-100%']].tolist() == [1, 1]
+    assert comparativo.loc['b.csv', ['26-50%', '76-100%']].tolist() == [1, 1]
+
+
+def test_comparar_grupos_vazio():
+    assert comparar_grupos(_aulas({1: '1'}).iloc[:0].assign(Arquivo=[])).empty
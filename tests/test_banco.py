@@ -0,0 +1,229 @@
+"""
+Testes do armazenamento em SQLite (dashboard_banco)
+"""
+
+import sqlite3
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import dashboard_cache
+from dashboard_analises import entradas_alunos
+from dashboard_banco import (
+    ESQUEMA,
+    aplicar_correcao_banco,
+    buscar_alunos_banco,
+    conectar,
+    consultar_checkins,
+    contar_nomes_banco,
+    dias_aula_banco,
+    duplicatas_removidas_banco,
+    entradas_banco,
+    importar_checkins,
+    listar_alunos_banco,
+    log_correcoes_banco,
+    periodo_banco,
+    resetar_correcoes_banco,
+    versao_banco
+)
+from dashboard_dados import carregar_arquivos, preparar_dataset, preparar_grupos
+from dashboard_exportacao import exportar_banco
+
+CABECALHO_CSV = 'Data/hora,Nome,COMO CONHECEU O GRUPO?,PRIMEIRA VEZ NO GRUPO?,DDD+TELEFONE (SEM ESPAÇO)\n'
+
+
+def _arquivo(nome_arquivo, linhas):
+    """Conteúdo CSV a partir de (data/hora, nome, telefone)"""
+    corpo = ''.join(f'{data_hora},{nome},Amigo,NÃO,{telefone}\n' for data_hora, nome, telefone in linhas)
+    return nome_arquivo, (CABECALHO_CSV + corpo).encode('utf-8')
+
+
+def _importar(conn, *arquivos):
+    """Lê, prepara e importa arquivos CSV como o dashboard faz"""
+    dashboard_cache.limpar_cache()
+    df, chave_dataset, _, _, _ = carregar_arquivos(list(arquivos))
+    df, df_duplicatas, _ = preparar_dataset(df)
+    return importar_checkins(conn, df, chave_dataset, df_duplicatas)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Banco vazio em um diretório temporário"""
+    conn = conectar(str(tmp_path / 'dados' / 'frequencia.db'))
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def arquivos():
+    return [
+        _arquivo('a.csv', [
+            ('04/03/2025 19:00:00', 'ana souza', '11987654321'),
+            ('04/03/2025 19:20:00', 'Ana Souza', '11987654321'),
+            ('11/03/2025 19:00:00', 'Bruno Lima', ''),
+            ('11/03/2025 19:05:00', 'Bruno (Bia) Lima', ''),
+        ]),
+        _arquivo('b.csv', [
+            ('18/03/2025 19:00:00', 'Ana Souza', '11987654321'),
+            ('18/03/2025 19:10:00', 'Bruno Lima', ''),
+        ]),
+    ]
+
+
+def test_importa_cada_arquivo_uma_vez(conn, arquivos):
+    assert _importar(conn, *arquivos) == 2
+    versao = versao_banco(conn)
+
+    assert _importar(conn, *arquivos) == 0
+    assert versao_banco(conn) == versao
+    assert duplicatas_removidas_banco(conn) == 1
+    assert len(consultar_checkins(conn)) == 5
+    assert periodo_banco(conn) == (date(2025, 3, 4), date(2025, 3, 18))
+    assert periodo_banco(conn, ['b.csv']) == (date(2025, 3, 18), date(2025, 3, 18))
+
+
+def test_consulta_filtra_por_data_arquivo_e_id(conn, arquivos):
+    _importar(conn, *arquivos)
+    alunos = listar_alunos_banco(conn)
+    id_ana = int(alunos.loc[alunos['Nome_Aluno'] == 'Ana Souza', 'ID_Aluno'].iat[0])
+
+    assert list(alunos.columns) == ['ID_Aluno', 'Nome_Aluno']
+    assert len(alunos) == 3
+
+    df = consultar_checkins(conn, date(2025, 3, 10), date(2025, 3, 31), ['b.csv'], [id_ana])
+    assert list(df['Nome']) == ['Ana Souza']
+    assert list(df['Data']) == [date(2025, 3, 18)]
+
+    assert len(listar_alunos_banco(conn, arquivos=['b.csv'])) == 2
+
+
+def test_buscar_alunos_banco_usa_a_regra_da_busca_em_memoria(conn, arquivos):
+    _importar(conn, *arquivos)
+    alunos = listar_alunos_banco(conn)
+    ids = dict(zip(alunos['Nome_Aluno'], alunos['ID_Aluno']))
+
+    assert buscar_alunos_banco(conn, 'LIMA') == {ids['Bruno Lima'], ids['Bruno (Bia) Lima']}
+    assert buscar_alunos_banco(conn, '(bia)') == {ids['Bruno (Bia) Lima']}
+    assert buscar_alunos_banco(conn, 'lima', arquivos=['b.csv']) == {ids['Bruno Lima']}
+    assert buscar_alunos_banco(conn, 'souza', fim=date(2025, 3, 1)) == set()
+    assert buscar_alunos_banco(conn, 'Carla') == set()
+
+
+def test_dias_aula_banco_ignora_o_filtro_de_alunos(conn, arquivos):
+    _importar(conn, *arquivos)
+
+    assert dias_aula_banco(conn) == [date(2025, 3, 4), date(2025, 3, 11), date(2025, 3, 18)]
+    assert dias_aula_banco(conn, date(2025, 3, 10), None, ['a.csv']) == [date(2025, 3, 11)]
+
+
+def test_entradas_banco_igual_a_entradas_alunos(conn, arquivos):
+    _importar(conn, *arquivos)
+
+    esperado = entradas_alunos(consultar_checkins(conn))
+
+    pd.testing.assert_frame_equal(entradas_banco(conn).sort_index(), esperado.sort_index(), check_names=False)
+
+
+def test_contar_nomes_banco_sem_carregar_checkins(conn, arquivos):
+    _importar(conn, *arquivos)
+
+    contagem = contar_nomes_banco(conn)
+
+    assert contagem.to_dict() == {'Ana Souza': 2, 'Bruno Lima': 2, 'Bruno (Bia) Lima': 1}
+    assert contagem.index[0] in ('Ana Souza', 'Bruno Lima')
+
+
+def test_correcao_une_alunos_e_remove_duplicatas(conn, arquivos):
+    _importar(conn, *arquivos)
+
+    registros = aplicar_correcao_banco(conn, 'Bruno (Bia) Lima', 'Bruno Lima')
+
+    assert registros == 1
+    assert [c['de'] for c in log_correcoes_banco(conn)] == ['Bruno (Bia) Lima']
+    bruno = consultar_checkins(conn).query("Nome == 'Bruno Lima'")
+    assert bruno['ID_Aluno'].nunique() == 1
+    assert len(bruno) == 2
+    assert duplicatas_removidas_banco(conn) == 2
+
+    resetar_correcoes_banco(conn)
+    assert log_correcoes_banco(conn) == []
+
+
+def test_checkin_em_outro_grupo_so_entra_na_comparacao(conn, arquivos):
+    arquivos.append(_arquivo('c.csv', [
+        ('04/03/2025 20:30:00', 'Ana Souza', '11987654321'),
+        ('04/03/2025 20:40:00', 'Ana Souza', '11987654321'),
+    ]))
+    _importar(conn, *arquivos)
+
+    assert len(consultar_checkins(conn)) == 5
+    assert 'c.csv' not in set(consultar_checkins(conn)['Arquivo'])
+    assert contar_nomes_banco(conn)['Ana Souza'] == 2
+    assert duplicatas_removidas_banco(conn) == 3
+
+    grupos = consultar_checkins(conn, grupos=True)
+    assert len(grupos) == 6
+    assert list(grupos.loc[grupos['Arquivo'] == 'c.csv', 'Data/hora']) == [pd.Timestamp('2025-03-04 20:30')]
+
+    # Mesmo resultado da comparação em memória
+    dashboard_cache.limpar_cache()
+    df, df_duplicatas, _ = preparar_dataset(carregar_arquivos(arquivos)[0])
+    em_memoria = preparar_grupos(df, df_duplicatas, [])
+    assert sorted(zip(grupos['Arquivo'], grupos['Data/hora'])) == sorted(
+        zip(em_memoria['Arquivo'], em_memoria['Data/hora'])
+    )
+
+
+def test_correcao_desfeita_remarca_os_grupos(conn):
+    _importar(conn, _arquivo('a.csv', [('04/03/2025 19:00:00', 'Bruno Lima', '')]),
+              _arquivo('b.csv', [('04/03/2025 20:00:00', 'Bruno (Bia) Lima', '')]))
+
+    aplicar_correcao_banco(conn, 'Bruno (Bia) Lima', 'Bruno Lima')
+    assert len(consultar_checkins(conn)) == 1
+    assert len(consultar_checkins(conn, grupos=True)) == 2
+
+    resetar_correcoes_banco(conn)
+    assert len(consultar_checkins(conn)) == 2
+    assert duplicatas_removidas_banco(conn) == 0
+
+
+def test_correcao_desfeita_devolve_o_checkin_do_mesmo_dia(conn):
+    _importar(conn, _arquivo('a.csv', [
+        ('01/03/2025 19:00:00', 'Ana Souza', ''),
+        ('01/03/2025 19:10:00', 'Ana Sousa', ''),
+    ]))
+
+    aplicar_correcao_banco(conn, 'Ana Sousa', 'Ana Souza')
+    assert list(consultar_checkins(conn)['Nome']) == ['Ana Souza']
+    assert duplicatas_removidas_banco(conn) == 1
+
+    resetar_correcoes_banco(conn)
+    checkins = consultar_checkins(conn)
+    assert list(checkins['Nome']) == ['Ana Souza', 'Ana Sousa']
+    assert checkins['ID_Aluno'].nunique() == 2
+    assert duplicatas_removidas_banco(conn) == 0
+
+
+def test_conectar_atualiza_banco_antigo(tmp_path):
+    caminho = str(tmp_path / 'antigo.db')
+    antigo = sqlite3.connect(caminho)
+    antigo.executescript(ESQUEMA.replace(
+        ",\n    outro_grupo INTEGER NOT NULL DEFAULT 0,\n    repetido INTEGER NOT NULL DEFAULT 0", ""
+    ))
+    antigo.close()
+
+    conn = conectar(caminho)
+    try:
+        assert consultar_checkins(conn).empty
+    finally:
+        conn.close()
+
+
+def test_exportar_banco_le_todo_o_historico(conn, arquivos, tmp_path):
+    _importar(conn, *arquivos)
+
+    conteudo, extensao, _ = exportar_banco(str(tmp_path / 'dados' / 'frequencia.db'), 'CSV')
+
+    assert extensao == 'csv'
+    assert conteudo.decode('utf-8').count('\n') == 6
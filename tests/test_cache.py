@@ -0,0 +1,91 @@
+"""
+Testes do cache de processo (dashboard_cache)
+"""
+
+import numpy as np
+import pytest
+
+import dashboard_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    """Cache vazio e configuração original em cada teste"""
+    config = dict(dashboard_cache._config)
+    dashboard_cache.limpar_cache()
+    yield
+    dashboard_cache.limpar_cache()
+    dashboard_cache._config.update(config)
+
+
+def _bloco_kb(kb):
+    """Array de `kb` KB"""
+    return np.zeros(kb * 1024, dtype=np.uint8)
+
+
+def test_descarta_a_entrada_usada_ha_mais_tempo():
+    dashboard_cache.configurar_cache(limite_mb=0.25)
+    dashboard_cache.guardar(('a',), _bloco_kb(100))
+    dashboard_cache.guardar(('b',), _bloco_kb(100))
+    assert dashboard_cache.obter(('a',)) is not None
+
+    evictions = dashboard_cache.estatisticas_cache()['evictions']
+    dashboard_cache.guardar(('c',), _bloco_kb(100))
+
+    assert dashboard_cache.obter(('b',)) is None
+    assert dashboard_cache.obter(('a',)) is not None
+    assert dashboard_cache.obter(('c',)) is not None
+    assert dashboard_cache.estatisticas_cache()['evictions'] == evictions + 1
+
+
+def test_nao_guarda_valores_maiores_que_o_orcamento():
+    dashboard_cache.configurar_cache(limite_mb=0.05)
+
+    valor = dashboard_cache.guardar(('grande',), _bloco_kb(100))
+
+    assert valor is not None
+    assert dashboard_cache.obter(('grande',)) is None
+
+
+def test_expira_entradas_ociosas(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(dashboard_cache.time, 'time', lambda: agora[0])
+    dashboard_cache.configurar_cache(ttl_segundos=60)
+    dashboard_cache.guardar(('a',), 'valor')
+
+    agora[0] += 59
+    assert dashboard_cache.obter(('a',)) == 'valor'
+    agora[0] += 59
+    assert dashboard_cache.obter(('a',)) == 'valor'
+    agora[0] += 61
+    assert dashboard_cache.obter(('a',)) is None
+
+
+def test_obter_ou_calcular_calcula_uma_vez():
+    chamadas = []
+
+    def calcular(x):
+        chamadas.append(x)
+        return x * 2
+
+    assert dashboard_cache.obter_ou_calcular(('dobro', 3), calcular, 3) == 6
+    assert dashboard_cache.obter_ou_calcular(('dobro', 3), calcular, 3) == 6
+    assert chamadas == [3]
+
+
+def test_limpar_cache_por_categoria():
+    dashboard_cache.guardar(('a', 1), 'x')
+    dashboard_cache.guardar(('b', 1), 'y')
+
+    dashboard_cache.limpar_cache('a')
+
+    assert dashboard_cache.obter(('a', 1)) is None
+    assert dashboard_cache.obter(('b', 1)) == 'y'
+
+
+def test_autorizar_admin_exige_token_configurado():
+    assert dashboard_cache.autorizar_admin('segredo', 'segredo')
+    assert not dashboard_cache.autorizar_admin('outro', 'segredo')
+    assert not dashboard_cache.autorizar_admin('', 'segredo')
+    assert not dashboard_cache.autorizar_admin('', '')
+    assert not dashboard_cache.autorizar_admin('qualquer', '')
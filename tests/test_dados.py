@@ -0,0 +1,226 @@
+"""
+Testes da ingestão e da limpeza de dados (dashboard_dados)
+"""
+
+import numpy as np
+import pandas as pd
+
+import dashboard_cache
+from dashboard_dados import (
+    aplicar_correcoes, carregar_arquivos, converter_datas, deduplicar_checkins, filtrar_checkins, limpar_nomes,
+    preparar_dataset, preparar_grupos, resolver_identidades
+)
+from dashboard_utils import limpar_nome
+
+CABECALHO_CSV = 'Data/hora,Nome,COMO CONHECEU O GRUPO?,PRIMEIRA VEZ NO GRUPO?,DDD+TELEFONE (SEM ESPAÇO)\n'
+
+
+def _checkins(linhas):
+    """Monta um frame de check-ins a partir de (nome, 'AAAA-MM-DD HH:MM')"""
+    return pd.DataFrame({
+        'Nome': [nome for nome, _ in linhas],
+        'Data/hora': pd.to_datetime([data_hora for _, data_hora in linhas]),
+    })
+
+
+def test_deduplicar_mantem_o_checkin_mais_cedo_do_dia():
+    df = _checkins([
+        ('Ana Souza', '2024-03-04 19:20'),
+        ('Ana Souza', '2024-03-04 19:05'),
+        ('Ana Souza', '2024-03-11 19:10'),
+    ])
+
+    resultado, removidos = deduplicar_checkins(df)
+
+    assert removidos == 1
+    assert list(resultado['Data/hora'].dt.strftime('%d %H:%M')) == ['04 19:05', '11 19:10']
+    assert list(resultado.index) == [1, 2]
+
+
+def test_deduplicar_ignora_maiusculas_no_nome():
+    df = _checkins([('Ana Souza', '2024-03-04 19:00'), ('ANA SOUZA', '2024-03-04 19:30')])
+
+    _, removidos = deduplicar_checkins(df)
+
+    assert removidos == 1
+
+
+def test_deduplicar_nao_agrupa_registros_sem_nome():
+    df = _checkins([(np.nan, '2024-03-04 19:00'), (np.nan, '2024-03-04 19:30')])
+
+    resultado, removidos = deduplicar_checkins(df)
+
+    assert removidos == 0
+    assert len(resultado) == 2
+
+
+def test_deduplicar_por_id_aluno():
+    df = _checkins([
+        ('Lucas Dias', '2024-03-04 19:00'),
+        ('Lucas Dias Silva', '2024-03-04 19:10'),
+        ('Maria Lima', '2024-03-04 19:10'),
+    ]).assign(ID_Aluno=[7, 7, 8])
+
+    resultado, removidos = deduplicar_checkins(df, 'ID_Aluno')
+
+    assert removidos == 1
+    assert list(resultado['Nome']) == ['Lucas Dias', 'Maria Lima']
+
+
+def test_deduplicar_frame_vazio():
+    resultado, removidos = deduplicar_checkins(_checkins([]))
+
+    assert removidos == 0
+    assert resultado.empty
+
+
+def _com_telefone(linhas):
+    """Monta check-ins a partir de (nome, 'AAAA-MM-DD HH:MM', telefone)"""
+    df = _checkins([(nome, data_hora) for nome, data_hora, _ in linhas])
+    df['DDD+TELEFONE (SEM ESPAÇO)'] = [telefone for _, _, telefone in linhas]
+    return df
+
+
+def test_resolver_identidades_une_variacoes_pelo_telefone():
+    df = resolver_identidades(_com_telefone([
+        ('Lucas Dias', '2025-03-04 19:00', '11987654321'),
+        ('Lucas Dias Silva', '2025-03-11 19:00', '(11) 98765-4321'),
+        ('Lucas Dias', '2025-03-18 19:00', None),
+        ('Maria Dias', '2025-03-04 19:00', '11987654321'),
+        (np.nan, '2025-03-04 19:00', None),
+    ]))
+
+    ids = df['ID_Aluno'].tolist()
+    assert ids[0] == ids[1] == ids[2]
+    assert ids[3] != ids[0]
+    assert ids[4] == -1
+    assert (df['ID_Aluno'].iloc[:4] >= 0).all()
+    assert df['Nome_Aluno'].iloc[1] == 'Lucas Dias'
+
+
+def test_resolver_identidades_gera_ids_independentes_dos_outros_alunos():
+    ana = ('Ana Souza', '2025-03-11 19:00', None)
+    bruno = ('Bruno Lima', '2025-03-11 19:00', '11912345678')
+    sozinhos = resolver_identidades(_com_telefone([ana, bruno]))
+    com_novato = resolver_identidades(_com_telefone([
+        ('Carla Reis', '2025-03-04 19:00', None), bruno, ('Bruno Lima', '2025-03-18 19:00', None), ana,
+    ]))
+
+    id_por_nome = dict(zip(sozinhos['Nome'], sozinhos['ID_Aluno']))
+    for nome, id_aluno in zip(com_novato['Nome'], com_novato['ID_Aluno']):
+        if nome in id_por_nome:
+            assert id_aluno == id_por_nome[nome]
+
+
+def test_aplicar_correcoes_remove_checkins_repetidos_dos_alunos_unidos():
+    df = resolver_identidades(_com_telefone([
+        ('Joao Silva', '2025-03-04 19:05', None),
+        ('João Silva', '2025-03-04 19:00', None),
+        ('João Silva', '2025-03-11 19:00', None),
+    ]))
+
+    corrigido = aplicar_correcoes(df, [{'de': 'Joao Silva', 'para': 'João Silva'}])
+
+    assert corrigido['ID_Aluno'].nunique() == 1
+    assert len(corrigido) == 2
+    assert corrigido['Data/hora'].min() == pd.Timestamp('2025-03-04 19:00')
+
+
+def _em_grupos(linhas):
+    """Check-ins a partir de (nome, 'AAAA-MM-DD HH:MM', arquivo)"""
+    df = _com_telefone([(nome, data_hora, None) for nome, data_hora, _ in linhas])
+    df['Arquivo'] = [arquivo for _, _, arquivo in linhas]
+    df['Data'] = df['Data/hora'].dt.date
+    return df
+
+
+def test_deduplicar_por_arquivo_mantem_o_aluno_em_cada_grupo():
+    df = _em_grupos([
+        ('Ana Souza', '2024-03-04 19:00', 'a.csv'),
+        ('Ana Souza', '2024-03-04 19:20', 'a.csv'),
+        ('Ana Souza', '2024-03-04 20:30', 'b.csv'),
+    ])
+
+    resultado, removidos = deduplicar_checkins(df, por_arquivo=True)
+
+    assert removidos == 1
+    assert list(resultado['Arquivo']) == ['a.csv', 'b.csv']
+    assert deduplicar_checkins(df)[1] == 2
+
+
+def test_preparar_grupos_reaplica_correcoes_sobre_todas_as_linhas():
+    df, df_duplicatas, _ = preparar_dataset(_em_grupos([
+        ('Joao Silva', '2024-03-04 19:00', 'a.csv'),
+        ('João Silva', '2024-03-04 19:10', 'a.csv'),
+        ('João Silva', '2024-03-04 20:30', 'b.csv'),
+        ('Maria Lima', '2024-03-04 19:00', 'b.csv'),
+    ]))
+
+    sem_correcao = preparar_grupos(df, df_duplicatas, [])
+    grupos = preparar_grupos(df, df_duplicatas, [{'de': 'Joao Silva', 'para': 'João Silva'}])
+
+    assert len(df) == 3 and len(sem_correcao) == 4
+    assert sorted(zip(grupos['Arquivo'], grupos['Nome'])) == [
+        ('a.csv', 'João Silva'), ('b.csv', 'João Silva'), ('b.csv', 'Maria Lima')
+    ]
+    assert grupos.loc[grupos['Arquivo'] == 'a.csv', 'Data/hora'].iat[0] == pd.Timestamp('2024-03-04 19:00')
+
+
+def test_filtrar_checkins_combina_os_filtros():
+    df = resolver_identidades(_em_grupos([
+        ('Ana Souza', '2024-03-04 19:00', 'a.csv'),
+        ('Ana Souza', '2024-03-11 19:00', 'b.csv'),
+        ('Bruno Lima', '2024-03-11 19:00', 'b.csv'),
+    ]))
+    id_ana = df['ID_Aluno'].iat[0]
+
+    assert len(filtrar_checkins(df)) == 3
+    assert list(filtrar_checkins(df, pd.Timestamp('2024-03-10').date(), None, ['b.csv'])['Nome']) == [
+        'Ana Souza', 'Bruno Lima'
+    ]
+    assert list(filtrar_checkins(df, alunos=[id_ana]).index) == [0, 1]
+
+
+def test_limpar_nomes_segue_as_regras_de_limpar_nome():
+    nomes = pd.Series([
+        '  joão  da silva', 'MARIA DOS SANTOS', 'ana De souza ', 'x Da Da y',
+        'érica\tdo  carmo', '', '   ', 123, np.nan, None,
+    ], dtype=object)
+
+    resultado = limpar_nomes(nomes)
+
+    esperado = nomes.apply(limpar_nome)
+    assert resultado.isna().equals(esperado.isna())
+    assert resultado.dropna().tolist() == esperado.dropna().tolist()
+    assert resultado.iat[0] == 'João da Silva'
+
+
+def test_converter_datas_le_dia_antes_do_mes():
+    valores = pd.Series(['04/03/2025 19:00:00', '04/03/2025 19:00', '2025-03-04 19:00:00', 'lixo', None])
+
+    datas = converter_datas(valores)
+
+    assert list(datas.iloc[:3].dt.strftime('%Y-%m-%d')) == ['2025-03-04'] * 3
+    assert datas.iloc[3:].isna().all()
+
+
+def test_carregar_arquivos_junta_arquivos_e_separa_erros():
+    dashboard_cache.limpar_cache()
+    arquivos = [
+        ('a.csv', (CABECALHO_CSV + '04/03/2025 19:00:00,ana souza,Instagram,SIM,11987654321\n').encode()),
+        ('b.csv', (CABECALHO_CSV + 'data ruim,Bruno Lima,Amigo,NÃO,\n'
+                   '11/03/2025 19:10:00,Bruno Lima,Amigo,NÃO,\n').encode()),
+        ('c.csv', b'Nome\nSem colunas\n'),
+    ]
+
+    df, chave_dataset, avisos, erros, descartadas = carregar_arquivos(arquivos)
+
+    assert list(df['Nome']) == ['Ana Souza', 'Bruno Lima']
+    assert list(df['Arquivo']) == ['a.csv', 'b.csv']
+    assert [nome for nome, _ in chave_dataset] == ['a.csv', 'b.csv']
+    assert list(erros) == ['c.csv']
+    assert avisos == {}
+    assert list(descartadas['Data/hora']) == ['data ruim']
+
+    # Conteúdo já visto vem do cache de processo
+    assert dashboard_cache.obter(('arquivo',) + chave_dataset[0]) is not None
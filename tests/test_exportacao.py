@@ -0,0 +1,73 @@
+"""
+Testes da exportação dos dados corrigidos (dashboard_exportacao)
+"""
+
+import gzip
+from io import BytesIO
+
+import pandas as pd
+
+import dashboard_cache
+import dashboard_exportacao
+from dashboard_dados import carregar_arquivos
+from dashboard_exportacao import exportar_dados, exportar_dados_cache
+
+
+def _corrigidos():
+    """Dados corrigidos com uma coluna derivada"""
+    return pd.DataFrame({
+        'Nome': ['Ana Souza', 'Bruno Lima', 'Carla Reis'],
+        'Data/hora': pd.to_datetime(['2025-03-04 19:00', '2025-03-04 19:05', '2025-03-11 19:00']),
+        'Hora': [19, 19, 19],
+    })
+
+
+def test_exportar_csv_em_blocos_sem_colunas_derivadas(monkeypatch):
+    monkeypatch.setattr(dashboard_exportacao, 'TAMANHO_BLOCO_CSV', 2)
+
+    conteudo, extensao, mime = exportar_dados(_corrigidos(), 'CSV')
+
+    assert (extensao, mime) == ('csv', 'text/csv')
+    lido = pd.read_csv(BytesIO(conteudo))
+    assert list(lido.columns) == ['Nome', 'Data/hora']
+    assert list(lido['Nome']) == ['Ana Souza', 'Bruno Lima', 'Carla Reis']
+
+
+def test_exportar_csv_compactado():
+    conteudo, extensao, _ = exportar_dados(_corrigidos(), 'CSV compactado (gzip)')
+
+    assert extensao == 'csv.gz'
+    assert gzip.decompress(conteudo) == exportar_dados(_corrigidos(), 'CSV')[0]
+
+
+def test_exportar_frame_vazio_mantem_o_cabecalho():
+    conteudo, _, _ = exportar_dados(_corrigidos().iloc[:0], 'CSV')
+    assert conteudo.decode('utf-8').strip() == 'Nome,Data/hora'
+
+
+def test_exportar_dados_cache_serializa_uma_vez_por_versao():
+    dashboard_cache.limpar_cache()
+    df = _corrigidos()
+
+    primeiro = exportar_dados_cache(df, 'CSV', (('a.csv', 'h1'),), ())
+    df.loc[0, 'Nome'] = 'Outro Nome'
+    repetido = exportar_dados_cache(df, 'CSV', (('a.csv', 'h1'),), ())
+    corrigido = exportar_dados_cache(df, 'CSV', (('a.csv', 'h1'),), (('Ana Souza', 'Outro Nome'),))
+
+    assert repetido is primeiro
+    assert b'Outro Nome' in corrigido[0]
+
+
+def test_exportar_parquet_com_telefones_de_tipos_diferentes_por_arquivo():
+    cabecalho = 'Data/hora,Nome,COMO CONHECEU O GRUPO?,PRIMEIRA VEZ NO GRUPO?,DDD+TELEFONE (SEM ESPAÇO)\n'
+    arquivos = [
+        ('numeros.csv', (cabecalho + '04/03/2025 19:00:00,Ana Souza,Amigo,SIM,11987654321\n').encode('utf-8')),
+        ('formatados.csv', (cabecalho + '11/03/2025 19:00:00,Bruno Lima,Amigo,NÃO,(11) 98765-4320\n').encode('utf-8')),
+    ]
+    df = carregar_arquivos(arquivos)[0]
+
+    conteudo, extensao, _ = exportar_dados(df, 'Parquet')
+
+    assert extensao == 'parquet'
+    lido = pd.read_parquet(BytesIO(conteudo))
+    assert list(lido['DDD+TELEFONE (SEM ESPAÇO)']) == ['11987654321', '(11) 98765-4320']
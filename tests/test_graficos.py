@@ -0,0 +1,73 @@
+"""
+Testes da preparação da linha do tempo (dashboard_graficos)
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from dashboard_graficos import agrupar_contagem_diaria, escolher_granularidade, reduzir_pontos_lttb, tamanho_payload
+
+
+def test_reduzir_pontos_lttb_mantem_extremos_e_picos():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 50
+    y[812] = -30
+
+    indices = reduzir_pontos_lttb(x, y, 20)
+
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 437 in indices and 812 in indices
+
+
+def test_reduzir_pontos_lttb_nao_reduz_series_curtas():
+    assert list(reduzir_pontos_lttb(np.arange(5), np.arange(5), 10)) == [0, 1, 2, 3, 4]
+    assert list(reduzir_pontos_lttb(np.arange(5), np.arange(5), 2)) == [0, 1, 2, 3, 4]
+
+
+def test_escolher_granularidade_conforme_o_periodo():
+    dias = pd.Series(pd.date_range('2024-01-01', periods=30, freq='D'))
+    assert escolher_granularidade(dias, max_pontos=40) == (None, 'dia')
+    assert escolher_granularidade(dias, max_pontos=10) == ('W', 'semana')
+    assert escolher_granularidade(dias, max_pontos=2) == ('M', 'mês')
+    assert escolher_granularidade(pd.Series([], dtype='datetime64[ns]')) == (None, 'dia')
+
+
+def test_agrupar_contagem_diaria_soma_por_semana():
+    datas = pd.date_range('2024-01-01', periods=28, freq='D').date
+    contagem = pd.Series(1, index=datas)
+
+    presencas, rotulo, reduzida = agrupar_contagem_diaria(contagem, max_pontos=10)
+
+    assert rotulo == 'semana'
+    assert not reduzida
+    assert list(presencas.columns) == ['Data', 'Presenças']
+    assert presencas['Presenças'].sum() == 28
+    assert list(presencas['Presenças']) == [7, 7, 7, 7]
+
+
+def test_agrupar_contagem_diaria_reduz_quando_excede_o_orcamento():
+    datas = pd.date_range('2024-01-01', periods=300, freq='D').date
+    contagem = pd.Series(np.arange(300), index=datas)
+
+    presencas, rotulo, reduzida = agrupar_contagem_diaria(contagem, max_pontos=5)
+
+    assert rotulo == 'mês'
+    assert reduzida
+    assert len(presencas) == 5
+
+
+def test_tamanho_payload_estima_sem_serializar_a_figura():
+    df = pd.DataFrame({
+        'Data': pd.date_range('2024-01-01', periods=300, freq='D'),
+        'Presenças': np.arange(300),
+        'Nome': [f'Aluno {i}' for i in range(300)],
+    })
+
+    for fig in (px.line(df, x='Data', y='Presenças'), px.bar(df, x='Nome', y='Presenças'),
+                px.pie(df.head(5), values='Presenças', names='Nome')):
+        real = len(fig.to_json().encode('utf-8'))
+        assert abs(tamanho_payload(fig) - real) <= 0.2 * real
@@ -0,0 +1,143 @@
+"""
+Testes do modo ao vivo (dashboard_monitor)
+"""
+
+import os
+from datetime import date
+
+import pytest
+
+from dashboard_monitor import (
+    atualizar_monitor,
+    chave_monitor,
+    contar_chegadas,
+    criar_monitor,
+    frame_monitor,
+    iniciar_contagem,
+    listar_arquivos_monitor,
+    presencas_por_dia_ao_vivo,
+    resolver_caminho_monitor,
+    resumir_base
+)
+
+CABECALHO_CSV = b'Data/hora,Nome,COMO CONHECEU O GRUPO?,PRIMEIRA VEZ NO GRUPO?,DDD+TELEFONE (SEM ESPA\xc3\x87O)\n'
+
+
+def _linha(data_hora, nome):
+    return f'{data_hora},{nome},Amigo,NÃO,\n'.encode('utf-8')
+
+
+def test_listar_arquivos_monitor_so_csv_da_pasta(tmp_path):
+    (tmp_path / 'b.csv').write_bytes(CABECALHO_CSV)
+    (tmp_path / 'a.CSV').write_bytes(CABECALHO_CSV)
+    (tmp_path / 'notas.txt').write_text('x')
+    (tmp_path / 'sub.csv').mkdir()
+
+    assert listar_arquivos_monitor(str(tmp_path)) == ['a.CSV', 'b.csv']
+    assert listar_arquivos_monitor(str(tmp_path / 'nao_existe')) == []
+
+
+def test_resolver_caminho_monitor_recusa_arquivos_fora_da_pasta(tmp_path):
+    pasta = tmp_path / 'dados'
+    pasta.mkdir()
+    (pasta / 'frequencia.csv').write_bytes(CABECALHO_CSV)
+    (tmp_path / 'segredo.csv').write_bytes(CABECALHO_CSV)
+    os.symlink(tmp_path / 'segredo.csv', pasta / 'atalho.csv')
+
+    assert resolver_caminho_monitor('frequencia.csv', str(pasta)) == os.path.realpath(pasta / 'frequencia.csv')
+    for nome in ('../segredo.csv', str(tmp_path / 'segredo.csv'), 'atalho.csv'):
+        with pytest.raises(ValueError):
+            resolver_caminho_monitor(nome, str(pasta))
+
+
+def test_atualizar_monitor_le_so_linhas_completas_novas(tmp_path):
+    caminho = tmp_path / 'frequencia.csv'
+    caminho.write_bytes(CABECALHO_CSV + _linha('04/03/2025 19:00:00', 'Ana Souza') + b'04/03/2025 19:0')
+    estado = criar_monitor(str(caminho))
+
+    assert atualizar_monitor(estado) == 1
+    assert atualizar_monitor(estado) == 0
+
+    with open(caminho, 'ab') as arquivo:
+        arquivo.write(b'5:00,Bruno Lima,Amigo,N\xc3\x83O,\n' + _linha('11/03/2025 19:00:00', 'Ana Souza'))
+
+    assert atualizar_monitor(estado) == 2
+    assert list(frame_monitor(estado)['Nome']) == ['Ana Souza', 'Bruno Lima', 'Ana Souza']
+    assert chave_monitor(estado) == ('frequencia.csv', f'ao_vivo:{caminho.stat().st_size}')
+
+
+def test_atualizar_monitor_recomeca_se_o_arquivo_encolher(tmp_path):
+    caminho = tmp_path / 'frequencia.csv'
+    caminho.write_bytes(CABECALHO_CSV + _linha('04/03/2025 19:00:00', 'Ana Souza') * 3)
+    estado = criar_monitor(str(caminho))
+    atualizar_monitor(estado)
+
+    caminho.write_bytes(CABECALHO_CSV + _linha('11/03/2025 19:00:00', 'Bruno Lima'))
+
+    assert atualizar_monitor(estado) == 1
+    assert list(frame_monitor(estado)['Nome']) == ['Bruno Lima']
+
+
+def test_atualizar_monitor_registra_erro_de_leitura(tmp_path):
+    estado = criar_monitor(str(tmp_path / 'sumiu.csv'))
+
+    assert atualizar_monitor(estado) == 0
+    assert 'sumiu.csv' in estado['erro']
+    assert str(tmp_path) not in estado['erro']
+
+
+def _monitor_com_base(tmp_path, linhas):
+    """Monitor cujas linhas já lidas formam a base da contagem ao vivo"""
+    caminho = tmp_path / 'frequencia.csv'
+    caminho.write_bytes(CABECALHO_CSV + b''.join(linhas))
+    estado = criar_monitor(str(caminho))
+    atualizar_monitor(estado)
+    return caminho, estado, resumir_base(frame_monitor(estado))
+
+
+def test_contar_chegadas_so_soma_checkins_ainda_nao_vistos(tmp_path):
+    caminho, estado, base = _monitor_com_base(tmp_path, [_linha('04/03/2025 19:00:00', 'Ana Souza')])
+    iniciar_contagem(estado, base)
+
+    with open(caminho, 'ab') as arquivo:
+        arquivo.write(
+            _linha('04/03/2025 19:05:00', 'ana souza')
+            + _linha('04/03/2025 19:06:00', 'Bruno Lima')
+            + _linha('04/03/2025 19:07:00', 'Bruno Lima')
+        )
+    atualizar_monitor(estado)
+    contagem = contar_chegadas(estado)
+    assert contagem['presencas'] == 1
+    assert len(contagem['novos_alunos']) == 1
+
+    # Só o bloco novo é lido; o que já foi contado não conta de novo
+    with open(caminho, 'ab') as arquivo:
+        arquivo.write(_linha('11/03/2025 19:00:00', 'Ana Souza') + _linha('11/03/2025 19:01:00', 'Bruno Lima'))
+    atualizar_monitor(estado)
+    contagem = contar_chegadas(estado)
+
+    assert contagem['presencas'] == 3
+    assert len(contagem['novos_alunos']) == 1
+    assert presencas_por_dia_ao_vivo(contagem).to_dict() == {date(2025, 3, 4): 2, date(2025, 3, 11): 2}
+
+
+def test_contar_chegadas_respeita_correcoes_e_filtros(tmp_path):
+    caminho, estado, base = _monitor_com_base(tmp_path, [_linha('04/03/2025 19:00:00', 'Ana Souza')])
+    iniciar_contagem(
+        estado, base, [('Ana Sousa', 'Ana Souza')],
+        fim=date(2025, 3, 11), so_alunos_da_base=True
+    )
+
+    with open(caminho, 'ab') as arquivo:
+        arquivo.write(
+            _linha('04/03/2025 19:05:00', 'Ana Sousa')
+            + _linha('11/03/2025 19:00:00', 'Ana Sousa')
+            + _linha('11/03/2025 19:01:00', 'Bruno Lima')
+            + _linha('18/03/2025 19:00:00', 'Ana Souza')
+        )
+    atualizar_monitor(estado)
+    contagem = contar_chegadas(estado)
+
+    assert contagem['presencas'] == 1
+    assert contagem['novos_alunos'] == set()
+    assert contagem['por_dia'] == {date(2025, 3, 11): 1}
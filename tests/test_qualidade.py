@@ -0,0 +1,98 @@
+"""
+Testes do perfil de qualidade dos dados (dashboard_qualidade)
+"""
+
+from difflib import SequenceMatcher
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from dashboard_qualidade import pares_acima, pares_similares, perfilar_qualidade
+
+NOMES_PARES = ['Ana Souza', 'ana souza', 'Ana Sousa', 'Anna Souza', 'Bruno Lima', 'Bruno Lim', 'Carla Reis', 'Zé']
+
+
+def _dados(linhas):
+    """Monta dados em uso a partir de (nome, 'AAAA-MM-DD HH:MM', telefone)"""
+    df = pd.DataFrame({
+        'Nome': [nome for nome, _, _ in linhas],
+        'Data/hora': pd.to_datetime([data_hora for _, data_hora, _ in linhas]),
+        'DDD+TELEFONE (SEM ESPAÇO)': [telefone for _, _, telefone in linhas],
+    })
+    df['Nome_Original'] = df['Nome']
+    df['ID_Aluno'] = np.where(df['Nome'].notna(), np.arange(len(df)), -1)
+    df['Arquivo'] = 'a.csv'
+    return df
+
+
+def test_perfilar_qualidade_marca_nomes_vazios_e_telefones_invalidos():
+    df = _dados([
+        ('Ana Souza', '2025-03-04 19:00', '11987654321'),
+        (np.nan, '2025-03-04 19:05', '123'),
+        ('', '2025-03-04 19:10', None),
+        ('Bruno Lima', '2025-03-04 19:15', '  '),
+        ('Carla Reis', '2099-01-01 19:00', 'abc'),
+    ])
+    duplicatas = _dados([('Ana Souza', '2025-03-04 19:30', '11987654321')])
+    descartadas = pd.DataFrame({'Nome': ['Davi Rocha'], 'Data/hora': ['ontem'],
+                                'DDD+TELEFONE (SEM ESPAÇO)': [None], 'Arquivo': ['a.csv']})
+
+    perfil = perfilar_qualidade(df, descartadas, duplicatas, agora=pd.Timestamp('2025-06-01'))
+
+    assert perfil['contagens'] == {
+        'data_invalida': 1,
+        'data_futura': 1,
+        'telefone_invalido': 2,
+        'nome_vazio': 2,
+        'duplicada': 1,
+    }
+    assert perfil['total_linhas'] == 7
+    assert list(perfil['linhas_problema']['Problemas']) == [
+        'Telefone inválido; Nome vazio',
+        'Nome vazio',
+        'Data futura; Telefone inválido',
+        'Check-in duplicado',
+        'Data inválida',
+    ]
+
+
+def test_perfilar_qualidade_sem_problemas():
+    df = _dados([('Ana Souza', '2025-03-04 19:00', '11987654321')])
+
+    perfil = perfilar_qualidade(df, agora=pd.Timestamp('2025-06-01'))
+
+    assert perfil['linhas_problema'].empty
+    assert perfil['alunos_identificados'] == 1
+    assert perfil['nomes_uma_presenca'] == 1
+
+
+def test_pares_similares_igual_a_comparacao_direta():
+    pares = pares_similares(NOMES_PARES, minimo=0.5)
+
+    esperado = {}
+    for nome1, nome2 in combinations(NOMES_PARES, 2):
+        similaridade = SequenceMatcher(None, nome1.lower(), nome2.lower()).ratio()
+        if 0.5 <= similaridade < 1.0:
+            esperado[(nome1, nome2)] = similaridade
+
+    assert dict(zip(zip(pares['Nome 1'], pares['Nome 2']), pares['Similaridade'])) == esperado
+    assert pares['Similaridade'].is_monotonic_decreasing
+    assert ('Ana Souza', 'ana souza') not in esperado
+
+
+def test_pares_similares_sem_nomes():
+    pares = pares_similares([])
+
+    assert pares.empty
+    assert list(pares.columns) == ['Nome 1', 'Nome 2', 'Similaridade']
+    assert pares_acima(pares, 0.8).empty
+
+
+def test_pares_acima_recorta_o_prefixo_inclusive_no_limite():
+    pares = pares_similares(NOMES_PARES, minimo=0.5)
+    limite = pares['Similaridade'].iloc[3]
+
+    for corte in (limite, 0.85, 0.5, 0.99):
+        pd.testing.assert_frame_equal(pares_acima(pares, corte), pares[pares['Similaridade'] >= corte])
+    assert len(pares_acima(pares, limite)) >= 4
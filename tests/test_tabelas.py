@@ -0,0 +1,58 @@
+"""
+Testes da paginação no servidor (dashboard_tabelas)
+"""
+
+import pandas as pd
+
+from dashboard_tabelas import paginar
+
+
+def _alunos():
+    """Dez alunos com presenças decrescentes"""
+    return pd.DataFrame({
+        'Nome': [f'Aluno {i}' for i in range(10)],
+        'Presenças': list(range(10, 0, -1)),
+    })
+
+
+def test_paginar_recorta_a_pagina_pedida():
+    pagina, total_linhas, total_paginas = paginar(_alunos(), 2, 4)
+
+    assert (total_linhas, total_paginas) == (10, 3)
+    assert list(pagina['Nome']) == ['Aluno 4', 'Aluno 5', 'Aluno 6', 'Aluno 7']
+
+
+def test_paginar_limita_a_pagina_ao_total():
+    pagina, _, total_paginas = paginar(_alunos(), 99, 4)
+    assert total_paginas == 3
+    assert list(pagina['Nome']) == ['Aluno 8', 'Aluno 9']
+
+    pagina, _, _ = paginar(_alunos(), 0, 4)
+    assert pagina['Nome'].iloc[0] == 'Aluno 0'
+
+
+def test_paginar_filtra_antes_de_ordenar():
+    pagina, total_linhas, total_paginas = paginar(
+        _alunos(), 1, 25, coluna_ordem='Presenças', crescente=True, filtro='ALUNO 1', coluna_filtro='Nome'
+    )
+
+    assert (total_linhas, total_paginas) == (1, 1)
+    assert list(pagina['Nome']) == ['Aluno 1']
+
+    pagina, _, _ = paginar(_alunos(), 1, 3, coluna_ordem='Presenças', crescente=True)
+    assert list(pagina['Presenças']) == [1, 2, 3]
+
+
+def test_paginar_trata_filtro_como_texto_literal():
+    df = pd.DataFrame({'Nome': ['Ana (1)', 'Ana 1']})
+
+    pagina, total_linhas, _ = paginar(df, 1, 25, filtro='(1)', coluna_filtro='Nome')
+
+    assert total_linhas == 1
+    assert pagina['Nome'].iloc[0] == 'Ana (1)'
+
+
+def test_paginar_frame_vazio_tem_uma_pagina():
+    pagina, total_linhas, total_paginas = paginar(_alunos().iloc[:0], 3, 25)
+    assert pagina.empty
+    assert (total_linhas, total_paginas) == (0, 1)
@@ -0,0 +1,79 @@
+"""
+Testes do pool de processos (dashboard_tarefas)
+"""
+
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+import dashboard_tarefas
+from dashboard_tarefas import TarefaInterrompida, estado_tarefas, executar_em_processo
+
+
+@pytest.fixture
+def script_como_main(tmp_path, monkeypatch):
+    """__main__ como o Streamlit deixa: o script do dashboard, que não pode ser reexecutado"""
+    script = tmp_path / 'script.py'
+    script.write_text("raise RuntimeError('script reexecutado no worker')\n")
+    principal = types.ModuleType('__main__')
+    principal.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, '__main__', principal)
+    return principal
+
+
+def test_workers_nao_reexecutam_o_script(script_como_main, monkeypatch):
+    monkeypatch.setattr(dashboard_tarefas, 'MAX_PROCESSOS', 1)
+
+    assert executar_em_processo('sessao', os.getpid) != os.getpid()
+    assert sys.modules['__main__'] is script_como_main
+    assert estado_tarefas('sessao')['da_sessao'] == 0
+
+
+def test_pool_sobrevive_a_recarga_do_modulo(monkeypatch):
+    monkeypatch.setattr(dashboard_tarefas, 'MAX_PROCESSOS', 1)
+    executar_em_processo('sessao', os.getpid)
+    pool = dashboard_tarefas._estado['pool']
+    assert pool is not None
+
+    # Como o Streamlit recarrega um arquivo alterado: apaga o módulo e importa de novo
+    monkeypatch.delitem(sys.modules, 'dashboard_tarefas')
+    recarregado = importlib.import_module('dashboard_tarefas')
+
+    assert recarregado is not dashboard_tarefas
+    assert recarregado._estado['pool'] is pool
+
+
+class _PoolQuebrado:
+    """Pool cujo submit falha como um pool com worker encerrado"""
+
+    def __init__(self):
+        self.encerrado = False
+
+    def submit(self, *args, **kwargs):
+        raise dashboard_tarefas.BrokenProcessPool('worker encerrado')
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        assert not cancel_futures
+        self.encerrado = True
+
+
+def test_pool_quebrado_informa_a_falha_sem_executar_na_thread(monkeypatch):
+    quebrado = _PoolQuebrado()
+    estado = dashboard_tarefas._estado
+    monkeypatch.setattr(dashboard_tarefas, 'MAX_PROCESSOS', 1)
+    monkeypatch.setitem(estado, 'pool', quebrado)
+    antes = estado_tarefas()
+    chamadas = []
+
+    with pytest.raises(TarefaInterrompida):
+        executar_em_processo('sessao', chamadas.append, 1)
+
+    depois = estado_tarefas()
+    assert chamadas == []
+    assert quebrado.encerrado
+    assert estado['pool'] is None
+    assert depois['em_execucao'] == 0 and depois['na_fila'] == 0
+    assert depois['falhas'] == antes['falhas'] + 1